@@ -0,0 +1,90 @@
+"""Compare resolving videos one by one with :func:`pytube.batch.resolve`.
+
+Replays recorded responses (a watch page, its player response and
+``tests/mocks/base.js-2022-02-04.gz``) with a simulated network latency,
+and reports how many videos per second each approach resolves, and how many
+times the player js is parsed into a :class:`pytube.cipher.Cipher`. The
+on-disk player cache is disabled and each run gets its own player registry,
+so each run starts cold.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_batch
+"""
+import contextlib
+import gzip
+import os
+import time
+from unittest import mock
+
+from pytube import YouTube, batch, cipher, cipher_registry, player_cache
+from tests.conftest import load_playback_file
+
+VIDEOS = 48
+WORKERS = 8
+LATENCY = 0.02  # seconds per request
+MOCKS = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "mocks")
+
+
+def load_responses():
+    pb = load_playback_file("yt-video-2lAe1cqCOXo-html.json.gz")
+    with gzip.open(os.path.join(MOCKS, "base.js-2022-02-04.gz"), "rb") as fh:
+        pb["js"] = fh.read().decode("utf-8")
+    return pb
+
+
+def replay(pb):
+    def get(url):
+        time.sleep(LATENCY)
+        return pb["js"] if url.endswith("base.js") else pb["watch_html"]
+
+    def player(self, video_id):
+        time.sleep(LATENCY)
+        return pb["vid_info"]
+
+    return get, player
+
+
+def serial(video_ids):
+    for video_id in video_ids:
+        yt = YouTube.from_id(video_id)
+        yt.streams
+
+
+def batched(video_ids):
+    for _video_id, result in batch.resolve(video_ids, workers=WORKERS):
+        if isinstance(result, Exception):
+            raise result
+
+
+def main():
+    pb = load_responses()
+    get, player = replay(pb)
+    video_ids = [f"video{n:06d}" for n in range(VIDEOS)]
+
+    print(f"{VIDEOS} videos, {LATENCY * 1000:.0f} ms per request")
+    for name, run in (("serial", serial), (f"batch x{WORKERS}", batched)):
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(mock.patch("pytube.request.get", get))
+            stack.enter_context(mock.patch("pytube.innertube.InnerTube.player", player))
+            stack.enter_context(mock.patch.object(
+                player_cache, "default_cache", player_cache.PlayerCache(None)
+            ))
+            stack.enter_context(mock.patch.object(
+                cipher_registry, "default_registry", cipher_registry.CipherRegistry()
+            ))
+            init = stack.enter_context(mock.patch.object(
+                cipher.Cipher, "__init__", autospec=True,
+                side_effect=cipher.Cipher.__init__
+            ))
+            start = time.perf_counter()
+            run(video_ids)
+            elapsed = time.perf_counter() - start
+        print(
+            f"{name:>9}: {VIDEOS / elapsed:7.1f} videos/s, "
+            f"{init.call_count:3d} ciphers built"
+        )
+
+
+if __name__ == "__main__":
+    main()
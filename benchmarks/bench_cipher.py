@@ -0,0 +1,71 @@
+"""Compare walking the signature transform plan with its compiled permutation.
+
+For each ``tests/mocks/base.js-*.gz`` player, deciphers a batch of
+signatures the way :meth:`pytube.cipher.Cipher.get_signature` used to (one
+transform function at a time, formatting a debug message after each), and
+with the compiled permutation used now.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_cipher
+"""
+import glob
+import gzip
+import logging
+import os
+import time
+
+from pytube.cipher import Cipher
+
+SIGNATURES = 2000
+SIGNATURE_LENGTH = 105
+MOCKS = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "mocks")
+
+logger = logging.getLogger("pytube.cipher")
+
+
+def walk_transform_plan(cipher, ciphered_signature):
+    signature = list(ciphered_signature)
+    for js_func in cipher.transform_plan:
+        name, argument = cipher.parse_function(js_func)
+        signature = cipher.transform_map[name](signature, argument)
+        logger.debug(
+            "applied transform function\noutput: %s", "".join(signature)
+        )
+    return "".join(signature)
+
+
+def run(decipher, signatures):
+    start = time.perf_counter()
+    results = [decipher(s) for s in signatures]
+    return results, time.perf_counter() - start
+
+
+def main():
+    signatures = [
+        "".join(chr(48 + (i * 31 + j * 7) % 75) for j in range(SIGNATURE_LENGTH))
+        for i in range(SIGNATURES)
+    ]
+    print(f"{SIGNATURES} signatures of {SIGNATURE_LENGTH} characters")
+    for path in sorted(glob.glob(os.path.join(MOCKS, "base.js-*.gz"))):
+        name = os.path.basename(path)
+        with gzip.open(path, "rb") as fh:
+            cipher = Cipher(js=fh.read().decode("utf-8"))
+        try:
+            walked, walk_time = run(
+                lambda s: walk_transform_plan(cipher, s), signatures
+            )
+        except KeyError as e:
+            print(f"{name}: transform function {e} is missing, skipped")
+            continue
+        compiled, compiled_time = run(cipher.get_signature, signatures)
+        assert compiled == walked
+        print(
+            f"{name}: walked {walk_time / SIGNATURES * 1e6:6.2f} us/signature, "
+            f"compiled {compiled_time / SIGNATURES * 1e6:6.2f} us/signature "
+            f"({walk_time / compiled_time:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Compare the peak memory of downloads reading whole ranges and chunks.
+
+Serves a file from a local stand-in server and downloads it several times
+concurrently, in a fresh process for each measurement, either the way
+:meth:`pytube.Stream.download` used to (``response.read()`` of each whole
+range, written from the network thread) or with the current
+``readinto``-based streaming and write-behind sink. Reports the increase in
+peak RSS per concurrent download.
+
+Run from the repository root (Unix only, as it uses :mod:`resource`)::
+
+    python -m benchmarks.bench_memory
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+
+from pytube import Stream, request, retry
+from pytube.monostate import Monostate
+from tests.server import StandInServer
+
+FILE_SIZE = 32 * 1024 * 1024
+CONCURRENCY = (1, 4, 8)
+
+
+def legacy_download(url, path):
+    with open(path, "wb") as fh:
+        downloaded = 0
+        while downloaded < FILE_SIZE:
+            stop_pos = min(downloaded + request.default_range_size, FILE_SIZE) - 1
+            response = request._execute_range_request(
+                url, downloaded, stop_pos, timeout=None,
+                retry_policy=retry.RetryPolicy(max_retries=0)
+            )
+            while True:
+                chunk = response.read()
+                if not chunk:
+                    break
+                downloaded += len(chunk)
+                fh.write(chunk)
+
+
+def chunked_download(url, path):
+    stream = Stream(
+        {
+            "url": url,
+            "itag": 18,
+            "mimeType": 'video/mp4; codecs="avc1.42001E, mp4a.40.2"',
+            "is_otf": False,
+            "bitrate": None,
+            "contentLength": str(FILE_SIZE),
+        },
+        Monostate(on_progress=None, on_complete=None),
+    )
+    stream.download(
+        output_path=os.path.dirname(path), filename=os.path.basename(path)
+    )
+
+
+def peak_rss_kb():
+    # ru_maxrss carries over the peak of the parent process on Linux, the
+    #  high water mark in /proc does not
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure(mode, downloads, url):
+    """Run concurrent downloads, and print the increase in peak RSS."""
+    download = {"read": legacy_download, "readinto": chunked_download}[mode]
+    with tempfile.TemporaryDirectory() as directory:
+        baseline = peak_rss_kb()
+        threads = [
+            threading.Thread(
+                target=download,
+                args=(f"{url}&n={n}", os.path.join(directory, f"{n}.mp4"))
+            )
+            for n in range(downloads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print(peak_rss_kb() - baseline)
+
+
+def main():
+    print(
+        f"{FILE_SIZE // 1024 // 1024}MB downloads, "
+        f"{request.default_range_size // 1024 // 1024}MB ranges, "
+        f"{request.default_chunk_size // 1024}KB chunks"
+    )
+    with StandInServer({"/video": os.urandom(FILE_SIZE)}) as server:
+        url = server.url("/video?itag=18")
+        for downloads in CONCURRENCY:
+            results = []
+            for mode in ("read", "readinto"):
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_memory",
+                     mode, str(downloads), url],
+                    check=True, capture_output=True, text=True,
+                ).stdout
+                results.append(int(output) / 1024 / downloads)
+            print(
+                f"{downloads} concurrent: read {results[0]:6.1f} MB/download, "
+                f"readinto {results[1]:6.1f} MB/download"
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4:
+        measure(sys.argv[1], int(sys.argv[2]), sys.argv[3])
+    else:
+        main()
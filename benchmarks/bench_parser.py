@@ -0,0 +1,139 @@
+"""Compare the offset-based object scanner with the previous implementation.
+
+Times :func:`pytube.parser.find_object_from_startpoint` on the objects pytube
+extracts in practice: ``ytInitialData``, ``ytInitialPlayerResponse`` and
+``ytcfg`` from the recorded watch pages in ``tests/mocks``, and the
+throttling function of the ``tests/mocks/base.js-*.gz`` players. The
+previous, character by character, implementation is kept below to compare
+with.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_parser
+"""
+import glob
+import gzip
+import os
+import time
+from unittest import mock
+
+from pytube import cipher, extract, parser
+from pytube.exceptions import HTMLParseError
+from tests.conftest import load_playback_file
+
+REPEAT = 5
+MOCKS = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "mocks")
+
+
+def legacy_find_object_from_startpoint(html, start_point):
+    """The character by character scan parser.find_object_from_startpoint used."""
+    html = html[start_point:]
+    if html[0] not in ['{','[']:
+        raise HTMLParseError(f'Invalid start point. Start of HTML:\n{html[:20]}')
+
+    # First letter MUST be a open brace, so we put that in the stack,
+    # and skip the first character.
+    last_char = '{'
+    curr_char = None
+    stack = [html[0]]
+    i = 1
+
+    context_closers = {
+        '{': '}',
+        '[': ']',
+        '"': '"',
+        '/': '/'  # javascript regex
+    }
+
+    while i < len(html):
+        if len(stack) == 0:
+            break
+        if curr_char not in [' ', '\n']:
+            last_char = curr_char
+        curr_char = html[i]
+        curr_context = stack[-1]
+
+        # If we've reached a context closer, we can remove an element off the stack
+        if curr_char == context_closers[curr_context]:
+            stack.pop()
+            i += 1
+            continue
+
+        # Strings and regex expressions require special context handling
+        #  because they can contain context openers *and* closers
+        if curr_context in ['"', '/']:
+            # If there's a backslash in a string or regex expression, we skip a character
+            if curr_char == '\\':
+                i += 2
+                continue
+        else:
+            # Non-string contexts are when we need to look for context openers.
+            if curr_char in context_closers.keys():
+                # Slash starts a regular expression depending on context
+                if not (curr_char == '/' and last_char not in [
+                    '(', ',', '=', ':', '[', '!', '&', '|', '?', '{', '}', ';'
+                ]):
+                    stack.append(curr_char)
+
+        i += 1
+
+    full_obj = html[:i]
+    return full_obj  # noqa: R504
+
+
+def recorded_calls():
+    """Record the scans pytube makes on the mock watch pages and players."""
+    calls = []
+    scan = parser.find_object_from_startpoint
+
+    def record(html, start_point):
+        calls.append((html, start_point))
+        return scan(html, start_point)
+
+    with mock.patch.object(parser, "find_object_from_startpoint", record), \
+            mock.patch.object(cipher, "find_object_from_startpoint", record):
+        for path in sorted(glob.glob(os.path.join(MOCKS, "yt-video-*.json.gz"))):
+            html = load_playback_file(os.path.basename(path))["watch_html"]
+            for extractor in (
+                extract.initial_data,
+                extract.initial_player_response,
+                extract.get_ytcfg,
+            ):
+                try:
+                    extractor(html)
+                except Exception:
+                    # Not every recorded page has every object
+                    pass
+        page_calls, calls = calls, []
+        for path in sorted(glob.glob(os.path.join(MOCKS, "base.js-*.gz"))):
+            with gzip.open(path, "rb") as fh:
+                js = fh.read().decode("utf-8")
+            cipher.get_throttling_function_code(js)
+    return [("watch page objects", page_calls), ("throttling functions", calls)]
+
+
+def timed(scan, calls):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        for html, start_point in calls:
+            scan(html, start_point)
+    return (time.perf_counter() - start) / REPEAT
+
+
+def main():
+    for name, calls in recorded_calls():
+        # Leave out the scans that fail right away on an invalid start point
+        calls = [(html, start) for html, start in calls if html[start] in "{["]
+        for html, start_point in calls:
+            assert parser.find_object_from_startpoint(html, start_point) == \
+                legacy_find_object_from_startpoint(html, start_point)
+        legacy = timed(legacy_find_object_from_startpoint, calls)
+        current = timed(parser.find_object_from_startpoint, calls)
+        print(
+            f"{len(calls):3d} {name}: character scan {legacy * 1000:8.1f} ms, "
+            f"offset scan {current * 1000:8.1f} ms ({legacy / current:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Compare extracting playlist videos with and without a json round trip.
+
+Times :meth:`pytube.Playlist._extract_videos` on the ``ytInitialData`` of
+``tests/mocks/playlist_long.html.gz``, given the decoded object as
+:class:`pytube.Playlist` now does, and serialized with ``json.dumps`` first
+as it used to, which ``_extract_videos`` then had to parse again. Extracting
+from the page encoded to bytes, the way continuation responses arrive, is
+timed as well.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_playlist
+"""
+import gzip
+import json
+import os
+import time
+
+from pytube import extract, Playlist
+
+REPEAT = 50
+MOCKS = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "mocks")
+
+
+def load_initial_data():
+    with gzip.open(os.path.join(MOCKS, "playlist_long.html.gz"), "rb") as fh:
+        html = fh.read().decode("utf-8")
+    return extract.initial_data(html)
+
+
+def timed(extract_page):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        extract_page()
+    return (time.perf_counter() - start) / REPEAT
+
+
+def main():
+    initial_data = load_initial_data()
+    body = json.dumps(initial_data).encode("utf-8")
+    expected = Playlist._extract_videos(initial_data)
+    assert Playlist._extract_videos(json.dumps(initial_data)) == expected
+    assert Playlist._extract_videos(body) == expected
+
+    round_trip = timed(lambda: Playlist._extract_videos(json.dumps(initial_data)))
+    decoded = timed(lambda: Playlist._extract_videos(initial_data))
+    from_bytes = timed(lambda: Playlist._extract_videos(body))
+    print(f"{len(expected[0])} videos, {len(body) / 1024:.0f} KB of json")
+    print(f"dumps and loads: {round_trip * 1000:8.3f} ms")
+    print(
+        f"decoded object:  {decoded * 1000:8.3f} ms "
+        f"({round_trip / decoded:.0f}x)"
+    )
+    print(f"response bytes:  {from_bytes * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Compare handshakes per download with and without the connection pool.
+
+Serves a file over HTTPS from a local stand-in server (requires the openssl
+binary to create a throwaway certificate) and downloads it with
+:func:`pytube.request.stream`, once over plain urllib (a new connection per
+request) and once over :class:`pytube.pool.ConnectionPool`.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_pool
+"""
+import os
+import time
+from unittest import mock
+from urllib.request import HTTPSHandler, build_opener
+
+from pytube import request
+from pytube.pool import ConnectionPool
+from tests.server import StandInServer
+
+FILE_SIZE = 8 * 1024 * 1024
+RANGE_SIZE = 256 * 1024
+DOWNLOADS = 5
+
+
+def run(server, urlopen):
+    connections_before = server.connections
+    start = time.perf_counter()
+    # Fixed size ranges, so both runs make the same number of requests
+    with mock.patch.object(request, "urlopen", urlopen), \
+            mock.patch.object(request, "default_range_size", RANGE_SIZE), \
+            mock.patch.object(request, "default_min_range_size", RANGE_SIZE), \
+            mock.patch.object(request, "default_max_range_size", RANGE_SIZE):
+        for _ in range(DOWNLOADS):
+            for _chunk in request.stream(server.url("/video?itag=18")):
+                pass
+    elapsed = time.perf_counter() - start
+    handshakes = server.connections - connections_before
+    return handshakes / DOWNLOADS, elapsed / DOWNLOADS
+
+
+def main():
+    with StandInServer({"/video": os.urandom(FILE_SIZE)}, tls=True) as server:
+        opener = build_opener(HTTPSHandler(context=server.client_context))
+        pool = ConnectionPool(context=server.client_context)
+
+        print(f"{FILE_SIZE // RANGE_SIZE} ranges of {RANGE_SIZE} bytes per download")
+        for name, urlopen in (
+            ("urllib", opener.open),
+            ("pooled", pool.urlopen),
+        ):
+            handshakes, seconds = run(server, urlopen)
+            print(
+                f"{name:>7}: {handshakes:6.1f} handshakes/download, "
+                f"{seconds * 1000:8.1f} ms/download"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Compare reading a watch page through WatchPage with searching it again.
+
+Times what pytube reads from the watch page of a video: its playability
+status twice (``YouTube.streams`` checks availability twice), ytInitialData,
+the player js url, ytcfg, the age restriction and the publish date. They are
+read once from a single :class:`pytube.watch_page.WatchPage`, which looks for
+each marker at most once and decodes each blob at most once, and once the
+way :mod:`pytube.extract` used to, with every function searching the whole
+page again for its own patterns, kept below to compare with.
+
+The extract functions given the raw html, which now wrap it in a new
+WatchPage on each call, are timed against their previous implementation
+too.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_watch_page
+"""
+import glob
+import os
+import re
+import time
+from datetime import datetime
+
+from pytube import extract, parser
+from pytube.exceptions import HTMLParseError, RegexMatchError
+from pytube.watch_page import WatchPage
+from tests.conftest import load_playback_file
+
+REPEAT = 20
+MOCKS = os.path.join(os.path.dirname(__file__), os.pardir, "tests", "mocks")
+
+
+def legacy_parse(html, patterns, caller):
+    """Parse the object after the first of the patterns found in the html."""
+    for pattern in patterns:
+        try:
+            return parser.parse_for_object(html, pattern)
+        except HTMLParseError:
+            continue
+    raise RegexMatchError(caller=caller, pattern=patterns)
+
+
+def legacy_initial_player_response(html):
+    return legacy_parse(html, [
+        r"window\[['\"]ytInitialPlayerResponse['\"]]\s*=\s*",
+        r"ytInitialPlayerResponse\s*=\s*",
+    ], "initial_player_response")
+
+
+def legacy_initial_data(html):
+    return legacy_parse(html, [
+        r"window\[['\"]ytInitialData['\"]]\s*=\s*",
+        r"ytInitialData\s*=\s*",
+    ], "initial_data")
+
+
+def legacy_get_ytplayer_js(html):
+    match = re.search(r"(/s/player/[\w\d]+/[\w\d_/.]+/base\.js)", html)
+    if not match:
+        raise RegexMatchError(caller="get_ytplayer_js", pattern="js_url_patterns")
+    return match.group(1)
+
+
+def legacy_js_url(html):
+    try:
+        base_js = legacy_parse(html, [
+            r"ytplayer\.config\s*=\s*",
+            r"ytInitialPlayerResponse\s*=\s*",
+            r"yt\.setConfig\(.*['\"]PLAYER_CONFIG['\"]:\s*",
+        ], "get_ytplayer_config")['assets']['js']
+    except (KeyError, RegexMatchError):
+        base_js = legacy_get_ytplayer_js(html)
+    return "https://youtube.com" + base_js
+
+
+def legacy_get_ytcfg(html):
+    ytcfg = {}
+    for pattern in (r"ytcfg\s=\s", r"ytcfg\.set\("):
+        try:
+            for obj in parser.parse_for_all_objects(html, pattern):
+                ytcfg.update(obj)
+        except HTMLParseError:
+            continue
+    return ytcfg
+
+
+def legacy_is_age_restricted(html):
+    return re.search(r"og:restrictions:age", html) is not None
+
+
+def legacy_publish_date(html):
+    match = re.search(
+        r"(?<=itemprop=\"datePublished\" content=\")\d{4}-\d{2}-\d{2}", html
+    )
+    return match and datetime.strptime(match.group(0), '%Y-%m-%d')
+
+
+def legacy_read(html):
+    """Read the watch page the way pytube used to."""
+    for _ in range(2):
+        legacy_initial_player_response(html)
+    return (
+        legacy_initial_data(html),
+        legacy_js_url(html),
+        legacy_get_ytcfg(html),
+        legacy_is_age_restricted(html),
+        legacy_publish_date(html),
+    )
+
+
+def read(html):
+    """Read the watch page through one WatchPage, as YouTube does."""
+    page = WatchPage(html)
+    for _ in range(2):
+        page.initial_player_response
+    return (
+        page.initial_data,
+        extract.js_url(page),
+        page.ytcfg,
+        page.age_restricted,
+        page.publish_date,
+    )
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        func(*args)
+    return (time.perf_counter() - start) / REPEAT
+
+
+def main():
+    pages = []
+    for path in sorted(glob.glob(os.path.join(MOCKS, "yt-video-*.json.gz"))):
+        html = load_playback_file(os.path.basename(path))["watch_html"]
+        assert read(html) == legacy_read(html)
+        pages.append(html)
+    size = sum(len(html) for html in pages) / len(pages) / 1024
+    print(f"{len(pages)} watch pages, {size:.0f} KB on average")
+
+    legacy = sum(timed(legacy_read, html) for html in pages) / len(pages)
+    current = sum(timed(read, html) for html in pages) / len(pages)
+    print(
+        f"whole page: searched again {legacy * 1000:8.2f} ms, "
+        f"WatchPage {current * 1000:8.2f} ms ({legacy / current:.1f}x)"
+    )
+
+    for legacy_func, func in (
+        (legacy_is_age_restricted, extract.is_age_restricted),
+        (legacy_get_ytplayer_js, extract.get_ytplayer_js),
+        (legacy_publish_date, extract.publish_date),
+        (legacy_initial_player_response, extract.initial_player_response),
+    ):
+        legacy = sum(timed(legacy_func, html) for html in pages) / len(pages)
+        current = sum(timed(func, html) for html in pages) / len(pages)
+        print(
+            f"{func.__name__ + '(html):':32} before {legacy * 1000:8.3f} ms, "
+            f"now {current * 1000:8.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,8 +6,8 @@ Pytube: a very serious Python library for downloading YouTube Videos.
 __title__ = "pytube"
 __author__ = "Ronnie Ghose, Taylor Fox Dahlin, Nick Ficano"
 __license__ = "The Unlicense (Unlicense)"
-__js__ = None
-__js_url__ = None
+
+import warnings
 
 from pytube.version import __version__
 from pytube.streams import Stream
@@ -17,3 +17,25 @@ from pytube.__main__ import YouTube
 from pytube.contrib.playlist import Playlist
 from pytube.contrib.channel import Channel
 from pytube.contrib.search import Search
+from pytube import cipher_registry
+
+
+def __getattr__(name):
+    """Read the deprecated ``__js__`` and ``__js_url__`` globals.
+
+    They used to hold the js of the last player fetched. They now read the
+    player used last from :data:`pytube.cipher_registry.default_registry`,
+    which should be used instead.
+    """
+    if name not in ("__js__", "__js_url__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    warnings.warn(
+        f"pytube.{name} is deprecated, use pytube.cipher_registry.default_registry",
+        category=DeprecationWarning,
+        stacklevel=2,
+    )
+    player = cipher_registry.default_registry.last_used()
+    if player is None:
+        return None
+    js_url, js = player
+    return js if name == "__js__" else js_url
@@ -7,16 +7,19 @@ smaller peripheral modules and functions.
 
 """
 import logging
+import threading
 from typing import Any, Callable, Dict, List, Optional
 
 import pytube
 import pytube.exceptions as exceptions
-from pytube import extract, request
+from pytube import cipher_registry, extract, request
 from pytube import Stream, StreamQuery
+from pytube.cipher import Cipher
 from pytube.helpers import install_proxy
 from pytube.innertube import InnerTube
 from pytube.metadata import YouTubeMetadata
 from pytube.monostate import Monostate
+from pytube.watch_page import WatchPage
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +27,9 @@ logger = logging.getLogger(__name__)
 class YouTube:
     """Core developer interface for pytube."""
 
+    # Class used for the video's streams
+    _stream_class = Stream
+
     def __init__(
         self,
         url: str,
@@ -31,7 +37,8 @@ class YouTube:
         on_complete_callback: Optional[Callable[[Any, Optional[str]], None]] = None,
         proxies: Dict[str, str] = None,
         use_oauth: bool = False,
-        allow_oauth_cache: bool = True
+        allow_oauth_cache: bool = True,
+        lightweight: bool = False
     ):
         """Construct a :class:`YouTube <YouTube>`.
 
@@ -51,13 +58,23 @@ class YouTube:
         :param bool allow_oauth_cache:
             (Optional) Cache OAuth tokens locally on the machine. Defaults to True.
             These tokens are only generated if use_oauth is set to True as well.
+        :param bool lightweight:
+            (Optional) Check availability from the player response rather
+            than the watch page. Then the metadata (``title``, ``length``,
+            ``views``, ``author``, ``keywords``, ``thumbnail_url``,
+            ``caption_tracks``, ...) only needs a single request. The watch
+            page is still fetched if needed, e.g. for ``streams`` or
+            ``publish_date``.
         """
         self._js: Optional[str] = None  # js fetched by js_url
         self._js_url: Optional[str] = None  # the url to the js, parsed from watch html
 
+        self._cipher: Optional[Cipher] = None  # cipher built from js, if shared
+
         self._vid_info: Optional[Dict] = None  # content fetched from innertube/player
 
         self._watch_html: Optional[str] = None  # the html of /watch?v=<video_id>
+        self._watch_page: Optional[WatchPage] = None  # index of watch_html
         self._embed_html: Optional[str] = None
         self._player_config_args: Optional[Dict] = None  # inline js in the html containing
         self._age_restricted: Optional[bool] = None
@@ -75,8 +92,11 @@ class YouTube:
 
         # Shared between all instances of `Stream` (Borg pattern).
         self.stream_monostate = Monostate(
-            on_progress=on_progress_callback, on_complete=on_complete_callback
+            on_progress=on_progress_callback,
+            on_complete=on_complete_callback,
+            refresh_url=self._refresh_stream_url,
         )
+        self._refresh_lock = threading.Lock()
 
         if proxies:
             install_proxy(proxies)
@@ -87,6 +107,7 @@ class YouTube:
 
         self.use_oauth = use_oauth
         self.allow_oauth_cache = allow_oauth_cache
+        self.lightweight = lightweight
 
     def __repr__(self):
         return f'<pytube.__main__.YouTube object: videoId={self.video_id}>'
@@ -102,6 +123,17 @@ class YouTube:
         self._watch_html = request.get(url=self.watch_url)
         return self._watch_html
 
+    @property
+    def watch_page(self) -> WatchPage:
+        """The watch page, with the data embedded in it indexed.
+
+        :rtype: WatchPage
+        """
+        watch_html = self.watch_html
+        if self._watch_page is None or self._watch_page.html is not watch_html:
+            self._watch_page = WatchPage(watch_html)
+        return self._watch_page
+
     @property
     def embed_html(self):
         if self._embed_html:
@@ -113,7 +145,7 @@ class YouTube:
     def age_restricted(self):
         if self._age_restricted:
             return self._age_restricted
-        self._age_restricted = extract.is_age_restricted(self.watch_html)
+        self._age_restricted = self.watch_page.age_restricted
         return self._age_restricted
 
     @property
@@ -124,7 +156,7 @@ class YouTube:
         if self.age_restricted:
             self._js_url = extract.js_url(self.embed_html)
         else:
-            self._js_url = extract.js_url(self.watch_html)
+            self._js_url = extract.js_url(self.watch_page)
 
         return self._js_url
 
@@ -133,22 +165,32 @@ class YouTube:
         if self._js:
             return self._js
 
-        # If the js_url doesn't match the cached url, fetch the new js and update
-        #  the cache; otherwise, load the cache.
-        if pytube.__js_url__ != self.js_url:
-            self._js = request.get(self.js_url)
-            pytube.__js__ = self._js
-            pytube.__js_url__ = self.js_url
-        else:
-            self._js = pytube.__js__
-
+        # Shared with every other video on the same player
+        self._js = cipher_registry.default_registry.js(self.js_url)
         return self._js
 
+    @property
+    def cipher(self) -> Cipher:
+        """The cipher of the video's player.
+
+        It is shared through :data:`pytube.cipher_registry.default_registry`
+        by every video on the same player, and loaded from
+        :data:`pytube.player_cache.default_cache` when possible, which avoids
+        fetching and parsing the player's js.
+
+        :rtype: Cipher
+        """
+        if self._cipher:
+            return self._cipher
+
+        self._cipher = cipher_registry.default_registry.cipher(self.js_url)
+        return self._cipher
+
     @property
     def initial_data(self):
         if self._initial_data:
             return self._initial_data
-        self._initial_data = extract.initial_data(self.watch_html)
+        self._initial_data = self.watch_page.initial_data
         return self._initial_data
 
     @property
@@ -178,19 +220,23 @@ class YouTube:
         # If the cached js doesn't work, try fetching a new js file
         # https://github.com/pytube/pytube/issues/1054
         try:
-            extract.apply_signature(stream_manifest, self.vid_info, self.js)
+            extract.apply_signature(
+                stream_manifest, self.vid_info, self._js, cipher=self.cipher
+            )
         except exceptions.ExtractError:
             # To force an update to the js file, we clear the cache and retry
+            cipher_registry.default_registry.remove(self.js_url)
             self._js = None
             self._js_url = None
-            pytube.__js__ = None
-            pytube.__js_url__ = None
-            extract.apply_signature(stream_manifest, self.vid_info, self.js)
+            self._cipher = None
+            extract.apply_signature(
+                stream_manifest, self.vid_info, self._js, cipher=self.cipher
+            )
 
         # build instances of :class:`Stream <Stream>`
         # Initialize stream objects
         for stream in stream_manifest:
-            video = Stream(
+            video = self._stream_class(
                 stream=stream,
                 monostate=self.stream_monostate,
             )
@@ -201,13 +247,58 @@ class YouTube:
 
         return self._fmt_streams
 
+    def _refresh_stream_url(self, itag: int) -> Optional[str]:
+        """Fetch the video info again, and sign the url of one stream.
+
+        Used by :meth:`Stream.download` when the url of a stream has expired,
+        or is about to.
+
+        :param int itag:
+            The itag of the stream.
+        :rtype: str
+        :returns:
+            The new url, or None if the video no longer has the stream.
+        """
+        with self._refresh_lock:
+            # The cached or in-flight responses may hold the rejected url
+            innertube = InnerTube(
+                use_oauth=self.use_oauth,
+                allow_cache=self.allow_oauth_cache,
+                fresh=True
+            )
+            self._vid_info = innertube.player(self.video_id)
+            if 'streamingData' not in self._vid_info:
+                self.bypass_age_gate(fresh=True)
+            return self._signed_stream_url(itag)
+
+    def _signed_stream_url(self, itag: int) -> Optional[str]:
+        """Sign the url of one stream of the current video info.
+
+        :rtype: str
+        """
+        stream_manifest = [
+            stream for stream in extract.apply_descrambler(self.streaming_data)
+            if int(stream["itag"]) == itag
+        ]
+        if not stream_manifest:
+            return None
+        extract.apply_signature(
+            stream_manifest, self.vid_info, self._js, cipher=self.cipher
+        )
+        return stream_manifest[0]["url"]
+
     def check_availability(self):
         """Check whether the video is available.
 
         Raises different exceptions based on why the video is unavailable,
         otherwise does nothing.
         """
-        status, messages = extract.playability_status(self.watch_html)
+        if self.lightweight:
+            status, messages = extract.player_response_playability_status(
+                self.vid_info
+            )
+        else:
+            status, messages = extract.playability_status(self.watch_page)
 
         for reason in messages:
             if status == 'UNPLAYABLE':
@@ -247,12 +338,17 @@ class YouTube:
         self._vid_info = innertube_response
         return self._vid_info
 
-    def bypass_age_gate(self):
-        """Attempt to update the vid_info by bypassing the age gate."""
+    def bypass_age_gate(self, fresh: bool = False):
+        """Attempt to update the vid_info by bypassing the age gate.
+
+        :param bool fresh:
+            (Optional) Skip the innertube response cache.
+        """
         innertube = InnerTube(
             client='ANDROID_EMBED',
             use_oauth=self.use_oauth,
-            allow_cache=self.allow_oauth_cache
+            allow_cache=self.allow_oauth_cache,
+            fresh=fresh
         )
         innertube_response = innertube.player(self.video_id)
 
@@ -320,7 +416,7 @@ class YouTube:
         """
         if self._publish_date:
             return self._publish_date
-        self._publish_date = extract.publish_date(self.watch_html)
+        self._publish_date = self.watch_page.publish_date
         return self._publish_date
 
     @publish_date.setter
@@ -448,7 +544,8 @@ class YouTube:
 
         :param callable func:
             A callback function that takes ``stream``, ``chunk``,
-             and ``bytes_remaining`` as parameters.
+             and ``bytes_remaining`` as parameters. ``chunk`` may be a
+             memoryview of a reused buffer, only valid during the call.
 
         :rtype: None
 
@@ -467,13 +564,15 @@ class YouTube:
         self.stream_monostate.on_complete = func
 
     @staticmethod
-    def from_id(video_id: str) -> "YouTube":
+    def from_id(video_id: str, **kwargs) -> "YouTube":
         """Construct a :class:`YouTube <YouTube>` object from a video id.
 
         :param str video_id:
             The video id of the YouTube video.
+        :param kwargs:
+            (Optional) Other arguments of :class:`YouTube <YouTube>`.
 
         :rtype: :class:`YouTube <YouTube>`
         
         """
-        return YouTube(f"https://www.youtube.com/watch?v={video_id}")
+        return YouTube(f"https://www.youtube.com/watch?v={video_id}", **kwargs)
@@ -0,0 +1,15 @@
+# flake8: noqa: F401
+# noreorder
+"""
+asyncio interface to pytube.
+
+Mirrors :class:`pytube.YouTube`, :class:`pytube.Stream`,
+:class:`pytube.Playlist` and :class:`pytube.Search` with coroutine methods,
+on top of a pluggable asynchronous HTTP transport.
+"""
+from pytube.aio.transport import Response, StreamsTransport, Transport
+from pytube.aio.streams import AsyncStream
+from pytube.aio.innertube import AsyncInnerTube
+from pytube.aio.youtube import AsyncYouTube
+from pytube.aio.playlist import AsyncPlaylist
+from pytube.aio.search import AsyncSearch
@@ -0,0 +1,74 @@
+"""Asynchronous counterpart of :mod:`pytube.innertube`."""
+import asyncio
+import json
+
+from pytube.aio import request
+from pytube.innertube import InnerTube
+
+
+class AsyncInnerTube(InnerTube):
+    """Object for interacting with the innertube API without blocking.
+
+    The endpoint methods return coroutines. OAuth token refreshes, which are
+    rare, still happen over the blocking transport, in an executor.
+    """
+
+    async def _call_api(self, endpoint, query, data):
+        """Make a request to a given endpoint with the provided query parameters and data."""
+        cache, key = self._response_cache(endpoint, query, data)
+        if cache is not None:
+            body = cache.get(key)
+            if body is not None:
+                return json.loads(body)
+
+        if self.use_oauth:
+            loop = asyncio.get_event_loop()
+            endpoint_url, headers = await loop.run_in_executor(
+                None, self._prepare_call, endpoint, query
+            )
+        else:
+            endpoint_url, headers = self._prepare_call(endpoint, query)
+        # Retried as pytube.retry.default_policy allows
+        body = await request._fetch(
+            endpoint_url,
+            'POST',
+            headers=headers,
+            data=data,
+            shared=not self.fresh
+        )
+        return self._decode_response(body, cache, key)
+
+    async def player(self, video_id):
+        """Make a request to the player endpoint.
+
+        :param str video_id:
+            The video id to get player info for.
+        :rtype: dict
+        :returns:
+            Raw player info results.
+        """
+        return await super().player(video_id)
+
+    async def search(self, search_query, continuation=None):
+        """Make a request to the search endpoint.
+
+        :param str search_query:
+            The query to search.
+        :rtype: dict
+        :returns:
+            Raw search query results.
+        """
+        return await super().search(search_query, continuation)
+
+    async def verify_age(self, video_id):
+        """Make a request to the age_verify endpoint.
+
+        :param str video_id:
+            The video id to get player info for.
+        :rtype: dict
+        """
+        return await super().verify_age(video_id)
+
+    async def get_transcript(self, video_id):
+        """Make a request to the get_transcript endpoint."""
+        return await super().get_transcript(video_id)
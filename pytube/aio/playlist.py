@@ -0,0 +1,131 @@
+"""Asynchronous counterpart of :class:`pytube.Playlist`."""
+import logging
+from typing import AsyncIterator, List, Optional
+
+from pytube.aio import request
+from pytube.aio.youtube import AsyncYouTube
+from pytube.contrib.playlist import Playlist
+from pytube.exceptions import NotFetchedError
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncPlaylist(Playlist):
+    """Load a YouTube playlist with URL, for use with asyncio.
+
+    Pages of the playlist are fetched as they are iterated over::
+
+        async for url in AsyncPlaylist(url).url_generator():
+            ...
+
+    Once :meth:`fetch_video_urls` has been awaited the playlist also works
+    as a sequence of urls, like :class:`pytube.Playlist`.
+    """
+
+    def __init__(self, url: str):
+        super().__init__(url)
+        self._video_urls: Optional[List[str]] = None
+
+    async def prefetch(self) -> "AsyncPlaylist":
+        """Fetch the playlist page, needed by the metadata properties.
+
+        :rtype: AsyncPlaylist
+        """
+        if self._html is None:
+            self._html = await request.get(self.playlist_url)
+        return self
+
+    @property
+    def html(self):
+        """Get the playlist page html.
+
+        :rtype: str
+        """
+        if self._html is None:
+            raise NotFetchedError("html", "prefetch")
+        return self._html
+
+    async def _paginate(
+        self, until_watch_id: Optional[str] = None
+    ) -> AsyncIterator[List[str]]:
+        """Parse the video links from the page source, yields the /watch?v=
+        part from video link
+
+        :param until_watch_id Optional[str]: YouTube Video watch id until
+            which the playlist should be read.
+
+        :rtype: AsyncIterator[List[str]]
+        :returns: Iterable of lists of YouTube watch ids
+        """
+        await self.prefetch()
+        page = self.initial_data
+        while True:
+            videos_urls, continuation = self._extract_videos(page)
+            if until_watch_id:
+                try:
+                    trim_index = videos_urls.index(f"/watch?v={until_watch_id}")
+                    yield videos_urls[:trim_index]
+                    return
+                except ValueError:
+                    pass
+            yield videos_urls
+
+            if not continuation:
+                return
+            load_more_url, headers, data = self._build_continuation_url(continuation)
+            logger.debug("load more url: %s", load_more_url)
+            page = await request.post(
+                load_more_url, extra_headers=headers, data=data
+            )
+
+    async def trimmed(self, video_id: str) -> AsyncIterator[str]:
+        """Retrieve YouTube video URLs trimmed at the given video ID
+
+        :type video_id: str
+            video ID to trim the returned list of playlist URLs at
+        :rtype: AsyncIterator[str]
+        """
+        async for page in self._paginate(until_watch_id=video_id):
+            for watch_path in page:
+                yield self._video_url(watch_path)
+
+    async def url_generator(self) -> AsyncIterator[str]:
+        """Generator that yields video URLs.
+
+        :Yields: Video URLs
+        """
+        async for page in self._paginate():
+            for video in page:
+                yield self._video_url(video)
+
+    async def fetch_video_urls(self) -> List[str]:
+        """Fetch the complete links of all the videos in playlist
+
+        :rtype: List[str]
+        :returns: List of video URLs
+        """
+        if self._video_urls is None:
+            self._video_urls = [url async for url in self.url_generator()]
+        return self._video_urls
+
+    @property
+    def video_urls(self) -> List[str]:
+        """Complete links of all the videos in playlist
+
+        :rtype: List[str]
+        """
+        if self._video_urls is None:
+            raise NotFetchedError("video_urls", "fetch_video_urls")
+        return self._video_urls
+
+    async def videos_generator(self) -> AsyncIterator[AsyncYouTube]:
+        async for url in self.url_generator():
+            yield AsyncYouTube(url)
+
+    @property
+    def videos(self) -> List[AsyncYouTube]:
+        """AsyncYouTube objects of the videos in this playlist
+
+        :rtype: List[AsyncYouTube]
+        """
+        return [AsyncYouTube(url) for url in self.video_urls]
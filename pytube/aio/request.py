@@ -0,0 +1,423 @@
+"""Asynchronous counterpart of :mod:`pytube.request`.
+
+Requests go through :data:`default_transport`, which can be replaced with any
+:class:`pytube.aio.transport.Transport`. Parsing helpers are shared with the
+blocking module, so both behave the same way.
+"""
+import asyncio
+import http.client
+import json
+import logging
+import socket
+import time
+from typing import AsyncIterator, Dict, Tuple
+from urllib.error import HTTPError
+
+from pytube import bandwidth, coalesce, retry
+from pytube import request as sync_request
+from pytube.aio.transport import Response, StreamsTransport, Transport
+from pytube.exceptions import MaxRetriesExceeded, RegexMatchError
+
+logger = logging.getLogger(__name__)
+
+# Shared by every request pytube.aio makes. Replace it to use another
+# transport, pool size or SSL context.
+default_transport: Transport = StreamsTransport()
+
+# Errors while reading a range that are worth resuming after
+_range_errors = (http.client.IncompleteRead, ConnectionError, asyncio.TimeoutError)
+
+
+async def _execute_request(
+    url,
+    method=None,
+    headers=None,
+    data=None,
+    timeout=None
+) -> Response:
+    base_headers = {"User-Agent": "Mozilla/5.0", "accept-language": "en-US,en"}
+    if headers:
+        base_headers.update(headers)
+    if data:
+        # encode data for request
+        if not isinstance(data, bytes):
+            data = bytes(json.dumps(data), encoding="utf-8")
+    if not url.lower().startswith("http"):
+        raise ValueError("Invalid URL")
+    if timeout is socket._GLOBAL_DEFAULT_TIMEOUT:
+        timeout = None
+    return await default_transport.request(
+        method or ("POST" if data else "GET"),
+        url,
+        headers=base_headers,
+        data=data,
+        timeout=timeout,
+    )
+
+
+async def _fetch(
+    url,
+    method=None,
+    headers=None,
+    data=None,
+    timeout=None,
+    retry_policy=None,
+    shared=True
+) -> bytes:
+    """Send a request and read the whole response, retrying on failure.
+
+    Identical GET and POST requests made in the same event loop while this
+    one is in flight share its response, through
+    :data:`pytube.coalesce.default_coalescer`.
+
+    :param RetryPolicy retry_policy:
+        (Optional) How to retry. Defaults to
+        :data:`pytube.retry.default_policy`.
+    :param bool shared:
+        (Optional) Whether the response may be shared with identical requests.
+    :rtype: bytes
+    """
+    async def fetch():
+        response = await _execute_request(
+            url, method=method, headers=headers, data=data, timeout=timeout
+        )
+        return await response.read()
+    policy = retry.get_policy(retry_policy)
+    coalescer = coalesce.default_coalescer
+    key = coalesce.request_key(url, method, headers, data)
+    if coalescer is None or key is None or not shared:
+        return await policy.call_async(fetch)
+    return await coalescer.call_async(key, policy.call_async, fetch)
+
+
+async def get(url, extra_headers=None, timeout=None, retry_policy=None) -> str:
+    """Send an http GET request.
+
+    :param str url:
+        The URL to perform the GET request for.
+    :param dict extra_headers:
+        Extra headers to add to the request
+    :param RetryPolicy retry_policy:
+        (Optional) How to retry failed requests. Defaults to
+        :data:`pytube.retry.default_policy`.
+    :rtype: str
+    :returns:
+        UTF-8 encoded string of response
+    """
+    return (await _fetch(
+        url, headers=extra_headers, timeout=timeout, retry_policy=retry_policy
+    )).decode("utf-8")
+
+
+async def post(
+    url, extra_headers=None, data=None, timeout=None, retry_policy=None
+) -> str:
+    """Send an http POST request.
+
+    :param str url:
+        The URL to perform the POST request for.
+    :param dict extra_headers:
+        Extra headers to add to the request
+    :param dict data:
+        The data to send on the POST request
+    :param RetryPolicy retry_policy:
+        (Optional) How to retry failed requests. Defaults to
+        :data:`pytube.retry.default_policy`.
+    :rtype: str
+    :returns:
+        UTF-8 encoded string of response
+    """
+    headers = dict(extra_headers or {})
+    # required because the youtube servers are strict on content type
+    # raises HTTPError [400]: Bad Request otherwise
+    headers["Content-Type"] = "application/json"
+    return (await _fetch(
+        url,
+        method="POST",
+        headers=headers,
+        data=data if data is not None else {},
+        timeout=timeout,
+        retry_policy=retry_policy
+    )).decode("utf-8")
+
+
+async def head(url, retry_policy=None) -> Dict[str, str]:
+    """Fetch headers returned http GET request.
+
+    :param str url:
+        The URL to perform the GET request for.
+    :param RetryPolicy retry_policy:
+        (Optional) How to retry failed requests. Defaults to
+        :data:`pytube.retry.default_policy`.
+    :rtype: dict
+    :returns:
+        dictionary of lowercase headers
+    """
+    response = await retry.get_policy(retry_policy).call_async(
+        _execute_request, url, method="HEAD"
+    )
+    response.close()
+    return {k.lower(): v for k, v in response.info().items()}
+
+
+async def filesize(url, retry_policy=None) -> int:
+    """Fetch size in bytes of file at given URL
+
+    :param str url: The URL to get the size of
+    :param RetryPolicy retry_policy:
+        (Optional) How to retry failed requests. Defaults to
+        :data:`pytube.retry.default_policy`.
+    :returns: int: size in bytes of remote file
+    """
+    return int((await head(url, retry_policy=retry_policy))["content-length"])
+
+
+async def stream(
+    url,
+    timeout=None,
+    max_retries=0,
+    filesize=None,
+    start=0,
+    flow=None,
+    range_sizer=None,
+    retry_policy=None
+) -> AsyncIterator[bytes]:
+    """Read the response in chunks.
+
+    A range interrupted by a timeout or a dropped connection is resumed from
+    the bytes already received, as many times as the retry policy allows.
+
+    :param str url: The URL to perform the GET request for.
+    :param int filesize:
+        (Optional) Size of the file, if already known. Otherwise it is worked
+        out from the first response.
+    :param int start:
+        (Optional) Position of the first byte to read.
+    :param flow:
+        (Optional) The :class:`pytube.bandwidth.Flow` the download takes its
+        bandwidth from. Defaults to a new flow of the default scheduler.
+    :param range_sizer:
+        (Optional) The :class:`pytube.request.RangeSizer` sizing the ranges
+        requested. Defaults to one with the default bounds.
+    :param RetryPolicy retry_policy:
+        (Optional) How to retry failed requests. Defaults to
+        :data:`pytube.retry.default_policy`, with ``max_retries`` retries.
+    :rtype: AsyncIterator[bytes]
+    """
+    flow = flow or bandwidth.default_scheduler.flow()
+    range_sizer = range_sizer or sync_request.RangeSizer()
+    policy = retry.get_policy(retry_policy, max_retries)
+    file_size = filesize or None
+    downloaded = start
+    failures = 0
+    failing_since = None
+    while file_size is None or downloaded < file_size:
+        stop_pos = downloaded + range_sizer.size - 1
+        if file_size is not None:
+            stop_pos = min(stop_pos, file_size - 1)
+        started = time.monotonic()
+        response = await _execute_range_request(
+            url, downloaded, stop_pos, timeout=timeout, retry_policy=policy
+        )
+        if downloaded == start or file_size is None:
+            file_size = sync_request._total_size(
+                response, downloaded, stop_pos
+            ) or file_size
+
+        range_start = downloaded
+        try:
+            async for chunk in response.iter_chunks():
+                await flow.acquire_async(len(chunk))
+                downloaded += len(chunk)
+                yield chunk
+        except _range_errors as e:
+            range_sizer.failed(
+                downloaded - range_start, time.monotonic() - started
+            )
+            failures += 1
+            failing_since = failing_since or started
+            delay = policy.retry_delay(
+                e, failures, time.monotonic() - failing_since
+            )
+            if delay is None:
+                raise
+            # Carry on from the bytes already received
+            logger.debug(
+                "resuming %s at byte %s in %.2fs after %r", url, downloaded, delay, e
+            )
+            await asyncio.sleep(delay)
+            continue
+        finally:
+            response.close()
+        range_sizer.succeeded(downloaded - range_start, time.monotonic() - started)
+        failures = 0
+        failing_since = None
+        if downloaded == range_start:
+            # Nothing left to read past the end of the file.
+            break
+
+
+async def _execute_range_request(url, start, stop, timeout, retry_policy):
+    """Request the bytes between start and stop, retrying as the policy allows.
+
+    :raises MaxRetriesExceeded:
+        If the request still times out, or its connection drops, once out
+        of retries. Error statuses are raised as they are.
+    """
+    try:
+        return await retry_policy.call_async(
+            _execute_request,
+            url + f"&range={start}-{stop}",
+            method="GET",
+            timeout=timeout
+        )
+    except Exception as e:
+        if isinstance(e, HTTPError) or not retry_policy.is_retryable(e):
+            raise
+        raise MaxRetriesExceeded() from e
+
+
+async def seq_stream(
+    url, timeout=None, max_retries=0, flow=None, retry_policy=None
+) -> AsyncIterator[bytes]:
+    """Read the response in sequence.
+
+    :param str url: The URL to perform the GET request for.
+    :param flow:
+        (Optional) The :class:`pytube.bandwidth.Flow` the download takes its
+        bandwidth from. Defaults to a new flow of the default scheduler.
+    :param RetryPolicy retry_policy:
+        (Optional) How to retry failed requests. Defaults to
+        :data:`pytube.retry.default_policy`, with ``max_retries`` retries.
+    :rtype: AsyncIterator[bytes]
+    """
+    async for _, chunk in seq_stream_segments(
+        url,
+        timeout=timeout,
+        max_retries=max_retries,
+        flow=flow,
+        retry_policy=retry_policy
+    ):
+        yield chunk
+
+
+async def seq_stream_segments(
+    url,
+    timeout=None,
+    max_retries=0,
+    start_segment=0,
+    flow=None,
+    retry_policy=None
+) -> AsyncIterator[Tuple[int, bytes]]:
+    """Read the response in sequence, along with each chunk's segment number.
+
+    Up to :data:`pytube.request.default_segment_window` segments are fetched
+    concurrently, but they are always yielded in sequence order.
+
+    :param str url: The URL to perform the GET request for.
+    :param int start_segment:
+        The first segment to yield. The header segment (0) is always
+        requested, since it says how many segments there are, but it is only
+        yielded when starting from 0.
+    :param flow:
+        (Optional) The :class:`pytube.bandwidth.Flow` the download takes its
+        bandwidth from, shared by all the segments.
+    :param RetryPolicy retry_policy:
+        (Optional) How to retry failed requests. Defaults to
+        :data:`pytube.retry.default_policy`, with ``max_retries`` retries.
+    :rtype: AsyncIterator[Tuple[int, bytes]]
+    """
+    flow = flow or bandwidth.default_scheduler.flow()
+    policy = retry.get_policy(retry_policy, max_retries)
+    # The 0th sequential request provides the file headers, which tell us
+    #  information about how the file is segmented.
+    header_chunks = []
+    async for chunk in stream(
+        sync_request._sequence_url(url, 0),
+        timeout=timeout,
+        flow=flow,
+        retry_policy=policy
+    ):
+        if start_segment == 0:
+            yield 0, chunk
+        header_chunks.append(chunk)
+
+    segment_count = sync_request._segment_count(b"".join(header_chunks))
+    segments = iter(range(max(start_segment, 1), segment_count + 1))
+    window = max(1, sync_request.default_segment_window)
+
+    def submit(seq_num):
+        task = asyncio.ensure_future(_fetch_segment(
+            sync_request._sequence_url(url, seq_num), timeout, policy, flow
+        ))
+        return seq_num, task
+
+    pending = [submit(seq_num) for _, seq_num in zip(range(window), segments)]
+    try:
+        while pending:
+            seq_num, task = pending.pop(0)
+            data = await task
+            next_num = next(segments, None)
+            if next_num is not None:
+                pending.append(submit(next_num))
+            yield seq_num, data
+    finally:
+        for _, task in pending:
+            task.cancel()
+
+
+async def _fetch_segment(url, timeout, retry_policy, flow=None) -> bytes:
+    """Download a whole segment.
+
+    :func:`stream` retries the request, and resumes an interrupted read, as
+    the policy allows.
+    """
+    return b"".join([
+        chunk async for chunk in stream(
+            url, timeout=timeout, flow=flow, retry_policy=retry_policy
+        )
+    ])
+
+
+async def seq_filesize(
+    url, estimate=False, sample_size=10, retry_policy=None
+) -> int:
+    """Fetch size in bytes of file at given URL from sequential requests
+
+    :param str url: The URL to get the size of
+    :param bool estimate:
+        (Optional) Extrapolate the size from a sample of the segments instead
+        of requesting every one of them.
+    :param int sample_size:
+        (Optional) Number of segments to sample when estimating.
+    :param RetryPolicy retry_policy:
+        (Optional) How to retry failed requests. Defaults to
+        :data:`pytube.retry.default_policy`.
+    :returns: int: size in bytes of remote file
+    """
+    response_value = await _fetch(
+        sync_request._sequence_url(url, 0), method="GET", retry_policy=retry_policy
+    )
+    # The file header must be added to the total filesize
+    total_filesize = len(response_value)
+
+    segment_count = sync_request._segment_count(response_value)
+    if segment_count == 0:
+        raise RegexMatchError(
+            "seq_filesize", sync_request._segment_count_pattern.pattern
+        )
+
+    segments = sync_request._probed_segments(segment_count, estimate, sample_size)
+    semaphore = asyncio.Semaphore(max(1, sync_request.default_segment_window))
+
+    async def segment_size(seq_num):
+        async with semaphore:
+            headers = await head(
+                sync_request._sequence_url(url, seq_num), retry_policy=retry_policy
+            )
+        return int(headers["content-length"])
+
+    sizes = await asyncio.gather(*(segment_size(s) for s in segments))
+    return total_filesize + sync_request._total_segment_size(
+        dict(zip(segments, sizes)), segment_count
+    )
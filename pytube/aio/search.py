@@ -0,0 +1,92 @@
+"""Asynchronous counterpart of :class:`pytube.Search`."""
+from pytube.aio.innertube import AsyncInnerTube
+from pytube.aio.youtube import AsyncYouTube
+from pytube.contrib.search import Search
+from pytube.exceptions import NotFetchedError
+
+
+class AsyncSearch(Search):
+    """YouTube search, for use with asyncio.
+
+    Usage::
+
+        search = AsyncSearch(query)
+        results = await search.fetch_results()
+        await search.get_next_results()
+    """
+
+    _video_class = AsyncYouTube
+
+    def __init__(self, query):
+        """Initialize AsyncSearch object.
+
+        :param str query:
+            Search query provided by the user.
+        """
+        super().__init__(query)
+        self._innertube_client = AsyncInnerTube(client='WEB')
+
+    @property
+    def results(self):
+        """Return search results fetched so far.
+
+        :rtype: list
+        :returns:
+            A list of AsyncYouTube objects.
+        """
+        if self._results is None:
+            raise NotFetchedError("results", "fetch_results")
+        return self._results
+
+    async def fetch_results(self):
+        """Fetch the first set of results, if not already fetched.
+
+        :rtype: list
+        :returns:
+            A list of AsyncYouTube objects.
+        """
+        if self._results is None:
+            videos, continuation = await self.fetch_and_parse()
+            self._results = videos
+            self._current_continuation = continuation
+        return self._results
+
+    async def get_next_results(self):
+        """Use the stored continuation string to fetch the next set of results.
+
+        This method does not return the results, but instead updates the results property.
+        """
+        if self._current_continuation:
+            videos, continuation = await self.fetch_and_parse(
+                self._current_continuation
+            )
+            self._results.extend(videos)
+            self._current_continuation = continuation
+        else:
+            raise IndexError
+
+    async def fetch_and_parse(self, continuation=None):
+        """Fetch from the innertube API and parse the results.
+
+        :param str continuation:
+            Continuation string for fetching results.
+        :rtype: tuple
+        :returns:
+            A tuple of a list of AsyncYouTube objects and a continuation string.
+        """
+        raw_results = await self.fetch_query(continuation)
+        return self._parse_results(raw_results)
+
+    async def fetch_query(self, continuation=None):
+        """Fetch raw results from the innertube API.
+
+        :param str continuation:
+            Continuation string for fetching results.
+        :rtype: dict
+        :returns:
+            The raw json object returned by the innertube API.
+        """
+        query_results = await self._innertube_client.search(self.query, continuation)
+        if not self._initial_results:
+            self._initial_results = query_results
+        return query_results  # noqa:R504
@@ -0,0 +1,290 @@
+"""Asynchronous counterpart of :mod:`pytube.streams`.
+
+Disk writes, which may block, are made from the default executor of the
+event loop rather than from the loop itself. Downloaded chunks are queued
+for a :class:`pytube.sink.WriteBehindSink` from the loop, and only from the
+executor when the sink has to wait for the disk.
+"""
+import asyncio
+import functools
+import logging
+import os
+from typing import BinaryIO, Callable, Optional, TypeVar
+from urllib.error import HTTPError
+
+from pytube import bandwidth
+from pytube import request as sync_request
+from pytube.aio import request
+from pytube.bandwidth import Flow
+from pytube.exceptions import NotFetchedError
+from pytube.journal import DownloadJournal, fingerprint
+from pytube.sink import WriteBehindSink, preallocate
+from pytube.streams import Stream
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+async def _in_executor(func: Callable[..., T], *args, **kwargs) -> T:
+    """Run a function that may block on disk I/O outside the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+async def _write(sink: WriteBehindSink, data: bytes, offset: int, **kwargs) -> None:
+    """Queue data to be written by a sink, without blocking the event loop."""
+    if sink.would_block(len(data)):
+        await _in_executor(sink.write, data, offset, **kwargs)
+    else:
+        sink.write(data, offset, **kwargs)
+
+
+class AsyncStream(Stream):
+    """Container for stream manifest data, downloaded without blocking."""
+
+    @property
+    def filesize(self) -> int:
+        """File size of the media stream in bytes.
+
+        Streams without a known size need ``await stream.fetch_filesize()``
+        first.
+
+        :rtype: int
+        """
+        if self._filesize == 0:
+            raise NotFetchedError("filesize", "fetch_filesize")
+        return self._filesize
+
+    async def fetch_filesize(self) -> int:
+        """Fetch the file size of the media stream, if not already known.
+
+        :rtype: int
+        :returns:
+            Filesize (in bytes) of the stream.
+        """
+        if self._filesize == 0:
+            try:
+                self._filesize = await request.filesize(self.url)
+            except HTTPError as e:
+                if e.code != 404:
+                    raise
+                self._filesize = await request.seq_filesize(self.url)
+        return self._filesize
+
+    async def download(
+        self,
+        output_path: Optional[str] = None,
+        filename: Optional[str] = None,
+        filename_prefix: Optional[str] = None,
+        skip_existing: bool = True,
+        timeout: Optional[int] = None,
+        max_retries: Optional[int] = 0,
+        priority: int = 0,
+        weight: float = 1,
+        range_sizer: Optional[sync_request.RangeSizer] = None
+    ) -> str:
+        """Write the media stream to disk.
+
+        Takes the same arguments as :meth:`Stream.download`, and also
+        downloads to a ``.part`` file that can be resumed, but ranges are
+        always fetched one after another.
+
+        :returns:
+            Path to the saved video
+        :rtype: str
+        """
+        file_path = self.get_file_path(
+            filename=filename,
+            output_path=output_path,
+            filename_prefix=filename_prefix,
+        )
+        if self.expires_within(self.url_refresh_margin):
+            await self.refresh_url()
+        await self.fetch_filesize()
+
+        if skip_existing and self.exists_at_path(file_path):
+            logger.debug(f'file {file_path} already exists, skipping')
+            self.on_complete(file_path)
+            return file_path
+
+        logger.debug(f'downloading ({self.filesize} total bytes) file to {file_path}')
+
+        part_path = f"{file_path}.part"
+        journal = DownloadJournal.load(
+            f"{part_path}.json",
+            fingerprint=fingerprint(self.url),
+            itag=self.itag,
+            filesize=self.filesize,
+        )
+        if not os.path.isfile(part_path):
+            journal.reset()
+        flow = bandwidth.default_scheduler.flow(weight=weight, priority=priority)
+        range_sizer = range_sizer or sync_request.RangeSizer()
+
+        with open(part_path, "r+b" if journal.ranges else "wb") as fh:
+            try:
+                try:
+                    await self._download_missing(
+                        fh, journal, flow, range_sizer,
+                        timeout=timeout, max_retries=max_retries
+                    )
+                except HTTPError as e:
+                    if e.code != 403 or not await self.refresh_url():
+                        raise
+                    await self._download_missing(
+                        fh, journal, flow, range_sizer,
+                        timeout=timeout, max_retries=max_retries
+                    )
+            except BaseException:
+                await _in_executor(journal.save, flush=fh.flush)
+                raise
+
+        os.replace(part_path, file_path)
+        journal.remove()
+        self.on_complete(file_path)
+        return file_path
+
+    async def refresh_url(self) -> bool:
+        """Replace the stream url with a newly signed one.
+
+        :rtype: bool
+        :returns:
+            Whether a new url was obtained.
+        """
+        refresh = self._monostate.refresh_url
+        url = await refresh(self.itag) if refresh else None
+        if url is None:
+            return False
+        logger.debug(f'refreshed the url of itag {self.itag}')
+        self.url = url
+        return True
+
+    async def _download_missing(
+        self,
+        file_handler: BinaryIO,
+        journal: DownloadJournal,
+        flow: Flow,
+        range_sizer: sync_request.RangeSizer,
+        timeout: Optional[int],
+        max_retries: Optional[int]
+    ) -> None:
+        """Download the parts of the stream the journal has not recorded."""
+        if journal.segment is None:
+            try:
+                await self._download_sequentially(
+                    file_handler, journal, flow, range_sizer,
+                    timeout=timeout, max_retries=max_retries
+                )
+                return
+            except HTTPError as e:
+                if e.code != 404:
+                    raise
+                # Discard anything written by the failed attempt
+                file_handler.seek(0)
+                file_handler.truncate()
+                journal.reset()
+
+        # Some adaptive streams need to be requested with sequence numbers
+        await self._download_segments(
+            file_handler, journal, flow,
+            timeout=timeout, max_retries=max_retries
+        )
+
+    async def _download_sequentially(
+        self,
+        file_handler: BinaryIO,
+        journal: DownloadJournal,
+        flow: Flow,
+        range_sizer: sync_request.RangeSizer,
+        timeout: Optional[int],
+        max_retries: Optional[int]
+    ) -> None:
+        """Download the stream in order, after the bytes already written."""
+        offset = journal.contiguous_bytes
+        # Anything written after a gap is downloaded again
+        journal.reset()
+        if offset:
+            journal.record(0, offset - 1)
+        file_handler.seek(offset)
+        file_handler.truncate()
+
+        bytes_remaining = self.filesize - offset
+        fd = file_handler.fileno()
+        await _in_executor(preallocate, fd, self.filesize)
+        sink = WriteBehindSink(fd)
+        try:
+            async for chunk in request.stream(
+                self.url,
+                timeout=timeout,
+                max_retries=max_retries,
+                filesize=self._filesize,
+                start=offset,
+                flow=flow,
+                range_sizer=range_sizer
+            ):
+                await _write(sink, chunk, offset, on_written=journal.record)
+                offset += len(chunk)
+                # reduce the (bytes) remainder by the length of the chunk.
+                bytes_remaining -= len(chunk)
+                self._notify_progress(chunk, bytes_remaining)
+        except BaseException:
+            # Don't hide the error that stopped the download
+            await _in_executor(sink.close, raise_error=False)
+            raise
+        await _in_executor(sink.close)
+        # Drop any preallocated space the stream turned out not to need
+        await _in_executor(os.ftruncate, fd, offset)
+
+    async def _download_segments(
+        self,
+        file_handler: BinaryIO,
+        journal: DownloadJournal,
+        flow: Flow,
+        timeout: Optional[int],
+        max_retries: Optional[int]
+    ) -> None:
+        """Download a segmented (OTF) stream, after its last completed segment."""
+        offset = journal.contiguous_bytes
+        # Drop any partially written segment
+        file_handler.seek(offset)
+        file_handler.truncate()
+        bytes_remaining = self.filesize - offset
+
+        segment = 0 if journal.segment is None else journal.segment + 1
+        sink = WriteBehindSink(file_handler.fileno())
+        try:
+            async for seq_num, chunk in request.seq_stream_segments(
+                self.url,
+                timeout=timeout,
+                max_retries=max_retries,
+                start_segment=segment,
+                flow=flow
+            ):
+                if seq_num != segment:
+                    # Everything up to the previous segment is now on disk
+                    await _in_executor(sink.flush)
+                    await _in_executor(journal.record_segment, segment, offset)
+                    segment = seq_num
+                await _write(sink, chunk, offset)
+                offset += len(chunk)
+                # reduce the (bytes) remainder by the length of the chunk.
+                bytes_remaining -= len(chunk)
+                self._notify_progress(chunk, bytes_remaining)
+        except BaseException:
+            await _in_executor(sink.close, raise_error=False)
+            raise
+        await _in_executor(sink.close)
+
+    async def stream_to_buffer(self, buffer: BinaryIO) -> None:
+        """Write the media stream to buffer
+
+        :rtype: io.BytesIO buffer
+        """
+        bytes_remaining = await self.fetch_filesize()
+        async for chunk in request.stream(self.url, filesize=self._filesize):
+            # reduce the (bytes) remainder by the length of the chunk.
+            bytes_remaining -= len(chunk)
+            # send to the on_progress callback.
+            self.on_progress(chunk, buffer, bytes_remaining)
+        self.on_complete(None)
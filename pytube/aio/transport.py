@@ -0,0 +1,373 @@
+"""Pluggable asynchronous HTTP transport for :mod:`pytube.aio`.
+
+:class:`Transport` is the interface the rest of :mod:`pytube.aio` talks to.
+The default :class:`StreamsTransport` speaks HTTP/1.1 over stdlib asyncio
+streams, keeping connections alive and reusing them per host, like
+:class:`pytube.pool.ConnectionPool` does for the blocking API. Another
+transport (e.g. one built on aiohttp or httpx, or one that goes through a
+proxy) can be used by replacing :data:`pytube.aio.request.default_transport`.
+"""
+import abc
+import asyncio
+import http.client
+import io
+import logging
+import ssl
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib import parse
+from urllib.error import HTTPError, URLError
+
+from pytube.pool import default_pool_size
+
+logger = logging.getLogger(__name__)
+
+default_chunk_size = 64 * 1024  # 64KB
+max_redirects = 10
+
+# Errors raised by a kept-alive connection that the server has since closed.
+_stale_connection_errors = (
+    asyncio.IncompleteReadError,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class Response:
+    """Response to a request made through a :class:`Transport`."""
+
+    def __init__(
+        self,
+        url: str,
+        status: int,
+        reason: str,
+        headers: http.client.HTTPMessage,
+        body: AsyncIterator[bytes],
+        close=None,
+    ):
+        """Construct a :class:`Response <Response>`.
+
+        :param str url:
+            The url of the response, after any redirects.
+        :param int status:
+            HTTP status code.
+        :param str reason:
+            HTTP reason phrase.
+        :param headers:
+            The response headers.
+        :param body:
+            Asynchronous iterator over the chunks of the response body.
+        :param func close:
+            (Optional) Called if the response is closed before its body has
+            been read.
+        """
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self._body = body
+        self._close = close
+
+    def info(self) -> http.client.HTTPMessage:
+        """Return the response headers, like :meth:`http.client.HTTPResponse.info`."""
+        return self.headers
+
+    async def read(self) -> bytes:
+        """Read the whole remaining response body.
+
+        :rtype: bytes
+        """
+        return b"".join([chunk async for chunk in self._body])
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        """Iterate over the response body as it arrives.
+
+        :rtype: AsyncIterator[bytes]
+        """
+        async for chunk in self._body:
+            yield chunk
+
+    def close(self) -> None:
+        """Discard the rest of the response body."""
+        close, self._close = self._close, None
+        if close:
+            close()
+
+
+class Transport(abc.ABC):
+    """Interface of the asynchronous HTTP transport used by :mod:`pytube.aio`."""
+
+    @abc.abstractmethod
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        data: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+    ) -> Response:
+        """Send a request and return its response once the headers arrive.
+
+        Redirects are followed. Error statuses raise
+        :class:`urllib.error.HTTPError`, so callers can handle errors the same
+        way as with the blocking API.
+
+        :param str method:
+            HTTP method.
+        :param str url:
+            Absolute http or https url.
+        :param dict headers:
+            (Optional) Request headers.
+        :param bytes data:
+            (Optional) Request body.
+        :param float timeout:
+            (Optional) Seconds to wait for each network operation.
+        :rtype: Response
+        """
+
+    async def close(self) -> None:
+        """Release any resources (e.g. idle connections) held by the transport."""
+
+
+class _Connection:
+    """An open HTTP/1.1 connection."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.loop = asyncio.get_running_loop()
+
+    def usable(self) -> bool:
+        """Whether the connection can carry another request."""
+        return (
+            self.loop is asyncio.get_running_loop()
+            and not self.reader.at_eof()
+        )
+
+    def close(self) -> None:
+        try:
+            self.writer.close()
+        except RuntimeError:
+            # The event loop it belonged to has already been closed
+            pass
+
+
+class StreamsTransport(Transport):
+    """HTTP/1.1 transport on asyncio streams, with keep-alive connections."""
+
+    def __init__(
+        self,
+        maxsize: int = default_pool_size,
+        context: Optional[ssl.SSLContext] = None,
+    ):
+        """Construct a :class:`StreamsTransport <StreamsTransport>`.
+
+        :param int maxsize:
+            Maximum number of idle connections kept open per host.
+        :param ssl.SSLContext context:
+            (Optional) SSL context used for HTTPS connections.
+        """
+        self.maxsize = maxsize
+        self.context = context
+        self.connections_created = 0
+        self.connections_reused = 0
+        self._idle: Dict[Tuple[str, str, int], List[_Connection]] = {}
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        data: Optional[bytes] = None,
+        timeout: Optional[float] = None,
+    ) -> Response:
+        for _ in range(max_redirects + 1):
+            response = await self._send(method, url, headers or {}, data, timeout)
+            location = response.headers.get("Location")
+            if response.status in (301, 302, 303, 307, 308) and location:
+                response.close()
+                url = parse.urljoin(url, location)
+                if response.status == 303 or (
+                    response.status in (301, 302) and method == "POST"
+                ):
+                    method, data = "GET", None
+                continue
+            if response.status >= 400:
+                body = await response.read()
+                raise HTTPError(
+                    url, response.status, response.reason, response.headers,
+                    io.BytesIO(body)
+                )
+            return response
+        raise URLError(f"too many redirects for {url}")
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+    async def _send(self, method, url, headers, data, timeout) -> Response:
+        split = parse.urlsplit(url)
+        if split.scheme not in ("http", "https") or not split.hostname:
+            raise ValueError("Invalid URL")
+        https = split.scheme == "https"
+        port = split.port or (443 if https else 80)
+        key = (split.scheme, split.hostname, port)
+        target = split.path or "/"
+        if split.query:
+            target += "?" + split.query
+
+        request_headers = {
+            "Host": split.netloc,
+            "Connection": "keep-alive",
+            "Content-Length": str(len(data or b"")),
+        }
+        if not data and method in ("GET", "HEAD"):
+            del request_headers["Content-Length"]
+        request_headers.update(headers)
+        head = f"{method} {target} HTTP/1.1\r\n" + "".join(
+            f"{name}: {value}\r\n" for name, value in request_headers.items()
+        ) + "\r\n"
+
+        while True:
+            conn, reused = await self._checkout(key, https, timeout)
+            try:
+                conn.writer.write(head.encode("latin-1") + (data or b""))
+                await _wait(conn.writer.drain(), timeout)
+                status, reason, response_headers = await self._read_head(
+                    conn, timeout
+                )
+            except _stale_connection_errors:
+                conn.close()
+                if not reused:
+                    raise
+                # The server closed the idle connection, retry on a new one.
+                logger.debug("discarding stale connection to %s", key[1])
+                continue
+            except BaseException:
+                conn.close()
+                raise
+            break
+
+        state = {"done": False}
+
+        def release(reusable: bool) -> None:
+            state["done"] = True
+            self._release(key, conn, reusable)
+
+        if _bodiless(method, status):
+            # Nothing more to read, the connection is free right away
+            release(response_headers.get("Connection", "").lower() != "close")
+
+        def close() -> None:
+            if not state["done"]:
+                state["done"] = True
+                conn.close()
+
+        body = self._read_body(
+            conn, method, status, response_headers, timeout, release
+        )
+        return Response(url, status, reason, response_headers, body, close)
+
+    async def _checkout(self, key, https, timeout) -> Tuple[_Connection, bool]:
+        idle = self._idle.get(key)
+        while idle:
+            conn = idle.pop()
+            if conn.usable():
+                self.connections_reused += 1
+                return conn, True
+            conn.close()
+
+        self.connections_created += 1
+        context = None
+        if https:
+            context = self.context or ssl.create_default_context()
+        try:
+            reader, writer = await _wait(
+                asyncio.open_connection(key[1], key[2], ssl=context), timeout
+            )
+        except OSError as err:
+            raise URLError(err)
+        return _Connection(reader, writer), False
+
+    def _release(self, key, conn: _Connection, reusable: bool) -> None:
+        if reusable:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.maxsize:
+                idle.append(conn)
+                return
+        conn.close()
+
+    @staticmethod
+    async def _read_head(conn: _Connection, timeout):
+        status_line = await _wait(conn.reader.readuntil(b"\r\n"), timeout)
+        while True:
+            version, status, reason = (
+                status_line.decode("latin-1").rstrip("\r\n").split(" ", 2) + [""]
+            )[:3]
+            header_block = await _wait(conn.reader.readuntil(b"\r\n\r\n"), timeout)
+            if status != "100":
+                break
+            # Skip interim "100 Continue" responses
+            status_line = await _wait(conn.reader.readuntil(b"\r\n"), timeout)
+        if not version.startswith("HTTP/"):
+            raise http.client.BadStatusLine(status_line)
+        headers = http.client.parse_headers(io.BytesIO(header_block))
+        return int(status), reason, headers
+
+    @staticmethod
+    async def _read_body(conn, method, status, headers, timeout, release):
+        reader = conn.reader
+        keep_alive = headers.get("Connection", "").lower() != "close"
+
+        if _bodiless(method, status):
+            # Released as soon as the headers were read
+            return
+
+        if headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while True:
+                size_line = await _wait(reader.readuntil(b"\r\n"), timeout)
+                size = int(size_line.split(b";", 1)[0], 16)
+                if size == 0:
+                    # Skip any trailers
+                    while await _wait(reader.readuntil(b"\r\n"), timeout) != b"\r\n":
+                        pass
+                    break
+                yield await _wait(reader.readexactly(size), timeout)
+                await _wait(reader.readexactly(2), timeout)
+            release(keep_alive)
+            return
+
+        length = headers.get("Content-Length")
+        if length is None:
+            # The body ends when the server closes the connection
+            while True:
+                chunk = await _wait(reader.read(default_chunk_size), timeout)
+                if not chunk:
+                    break
+                yield chunk
+            release(False)
+            return
+
+        remaining = int(length)
+        while remaining:
+            chunk = await _wait(
+                reader.read(min(remaining, default_chunk_size)), timeout
+            )
+            if not chunk:
+                raise http.client.IncompleteRead(b"", remaining)
+            remaining -= len(chunk)
+            yield chunk
+        release(keep_alive)
+
+
+def _bodiless(method: str, status: int) -> bool:
+    """Whether a response has no body, whatever its headers say."""
+    return method == "HEAD" or status in (204, 304) or 100 <= status < 200
+
+
+async def _wait(awaitable, timeout):
+    """Await with a timeout, if there is one."""
+    if timeout is None:
+        return await awaitable
+    return await asyncio.wait_for(awaitable, timeout)
@@ -0,0 +1,180 @@
+"""Asynchronous counterpart of :class:`pytube.YouTube`.
+
+An :class:`AsyncYouTube` fetches everything it needs up front, in coroutines,
+and from then on serves the familiar :class:`pytube.YouTube` properties from
+what it fetched. Properties whose data has not been fetched raise
+:class:`pytube.exceptions.NotFetchedError` instead of blocking the event loop.
+"""
+import logging
+from typing import Optional
+
+import pytube.exceptions as exceptions
+from pytube import cipher_registry
+from pytube.__main__ import YouTube
+from pytube.aio import request
+from pytube.aio.innertube import AsyncInnerTube
+from pytube.aio.streams import AsyncStream
+from pytube.query import StreamQuery
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncYouTube(YouTube):
+    """Core developer interface for pytube, for use with asyncio.
+
+    Usage::
+
+        yt = AsyncYouTube(url)
+        streams = await yt.fetch_streams()
+        await streams.get_highest_resolution().download()
+    """
+
+    _stream_class = AsyncStream
+
+    def __repr__(self):
+        return f'<pytube.aio.AsyncYouTube object: videoId={self.video_id}>'
+
+    async def prefetch(self) -> "AsyncYouTube":
+        """Fetch the watch page and player response of the video.
+
+        This is enough for the metadata properties (``title``, ``author``,
+        ``length``, ...) to work. Lightweight objects only fetch the player
+        response.
+
+        :rtype: AsyncYouTube
+        """
+        if self._watch_html is None and not self.lightweight:
+            self._watch_html = await request.get(url=self.watch_url)
+        if self._vid_info is None:
+            innertube = AsyncInnerTube(
+                use_oauth=self.use_oauth, allow_cache=self.allow_oauth_cache
+            )
+            self._vid_info = await innertube.player(self.video_id)
+        return self
+
+    async def fetch_streams(self) -> StreamQuery:
+        """Fetch everything needed to build the video's streams.
+
+        :rtype: :class:`StreamQuery <StreamQuery>`.
+        """
+        await self.prefetch()
+        self.check_availability()
+        if self._watch_html is None:
+            # Lightweight objects need the watch page for the player js
+            self._watch_html = await request.get(url=self.watch_url)
+        if 'streamingData' not in self._vid_info:
+            await self.bypass_age_gate()
+        if self.age_restricted and self._embed_html is None:
+            self._embed_html = await request.get(url=self.embed_url)
+        await self._fetch_player()
+
+        try:
+            return self.streams
+        except exceptions.NotFetchedError:
+            # The cached js didn't work and has been cleared, fetch it again
+            await self._fetch_player()
+            return self.streams
+
+    async def _fetch_player(self) -> None:
+        """Fetch the js of the video's player, and build its cipher.
+
+        Both are shared with every other video on the same player. The cipher
+        is built outside the event loop.
+        """
+        registry = cipher_registry.default_registry
+        if not self._js:
+            self._js = await registry.js_async(self.js_url, request.get)
+        if not self._cipher:
+            js = self._js
+            self._cipher = await registry.cipher_async(self.js_url, get_js=lambda: js)
+
+    async def bypass_age_gate(self, fresh: bool = False) -> None:
+        """Attempt to update the vid_info by bypassing the age gate.
+
+        :param bool fresh:
+            (Optional) Skip the innertube response cache.
+        """
+        innertube = AsyncInnerTube(
+            client='ANDROID_EMBED',
+            use_oauth=self.use_oauth,
+            allow_cache=self.allow_oauth_cache,
+            fresh=fresh
+        )
+        innertube_response = await innertube.player(self.video_id)
+
+        playability_status = innertube_response['playabilityStatus'].get('status', None)
+
+        # If we still can't access the video, raise an exception
+        # (tier 3 age restriction)
+        if playability_status == 'UNPLAYABLE':
+            raise exceptions.AgeRestrictedError(self.video_id)
+
+        self._vid_info = innertube_response
+
+    async def _refresh_stream_url(self, itag: int) -> Optional[str]:
+        """Fetch the player response again, and sign the url of one stream.
+
+        Coroutine counterpart of :meth:`YouTube._refresh_stream_url`.
+
+        :rtype: str
+        """
+        # The cached or in-flight responses may hold the rejected url
+        innertube = AsyncInnerTube(
+            use_oauth=self.use_oauth,
+            allow_cache=self.allow_oauth_cache,
+            fresh=True
+        )
+        self._vid_info = await innertube.player(self.video_id)
+        if 'streamingData' not in self._vid_info:
+            await self.bypass_age_gate(fresh=True)
+        return self._signed_stream_url(itag)
+
+    @property
+    def watch_html(self):
+        if self._watch_html is None:
+            raise exceptions.NotFetchedError("watch_html", "prefetch")
+        return self._watch_html
+
+    @property
+    def embed_html(self):
+        if self._embed_html is None:
+            raise exceptions.NotFetchedError("embed_html", "fetch_streams")
+        return self._embed_html
+
+    @property
+    def js(self):
+        if not self._js:
+            raise exceptions.NotFetchedError("js", "fetch_streams")
+        return self._js
+
+    @property
+    def cipher(self):
+        if not self._cipher:
+            raise exceptions.NotFetchedError("cipher", "fetch_streams")
+        return self._cipher
+
+    @property
+    def vid_info(self):
+        if self._vid_info is None:
+            raise exceptions.NotFetchedError("vid_info", "prefetch")
+        return self._vid_info
+
+    @property
+    def streaming_data(self):
+        """Return streamingData from video info."""
+        if 'streamingData' not in self.vid_info:
+            raise exceptions.NotFetchedError("streaming_data", "fetch_streams")
+        return self.vid_info['streamingData']
+
+    @staticmethod
+    def from_id(video_id: str, **kwargs) -> "AsyncYouTube":
+        """Construct an :class:`AsyncYouTube <AsyncYouTube>` object from a video id.
+
+        :param str video_id:
+            The video id of the YouTube video.
+        :param kwargs:
+            (Optional) Other arguments of :class:`AsyncYouTube <AsyncYouTube>`.
+
+        :rtype: :class:`AsyncYouTube <AsyncYouTube>`
+        """
+        return AsyncYouTube(f"https://www.youtube.com/watch?v={video_id}", **kwargs)
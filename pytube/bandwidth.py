@@ -0,0 +1,211 @@
+"""Sharing a bandwidth cap between concurrent downloads.
+
+:class:`BandwidthScheduler` is a token bucket: downloads take tokens for the
+bytes they receive, and the bucket is refilled at the configured rate. When
+downloads have to wait, the bytes are handed out by priority first, then in
+proportion to the weight of each download (weighted fair queueing), so a
+batch job with a low priority or weight doesn't starve interactive
+downloads.
+
+Each download takes its tokens through a :class:`Flow`, from a thread with
+:meth:`Flow.acquire`, or from a coroutine with :meth:`Flow.acquire_async`.
+Every download pytube makes goes through :data:`default_scheduler`, which is
+unlimited until configured::
+
+    from pytube import bandwidth
+    bandwidth.default_scheduler.configure(rate=2 * 1024 * 1024)  # 2MB/s
+"""
+import asyncio
+import itertools
+import threading
+import time
+from typing import List, Optional
+
+# Seconds between checks of an asynchronous download waiting its turn
+_poll_interval = 0.05
+
+
+class BandwidthScheduler:
+    """Token bucket shared by downloads, with priorities and weights."""
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[float] = None):
+        """Construct a :class:`BandwidthScheduler <BandwidthScheduler>`.
+
+        :param float rate:
+            (Optional) Bytes per second for all the downloads together. If
+            None, downloads are not limited.
+        :param float burst:
+            (Optional) Bytes that may be received at once after an idle
+            period. Defaults to a second's worth of ``rate``.
+        """
+        self._condition = threading.Condition()
+        self._waiters: List["_Waiter"] = []
+        self._sequence = itertools.count()
+        # Start tag of the last bytes handed out, in the fair queueing order
+        self._virtual_time = 0.0
+        self.rate: Optional[float] = None
+        self.burst = 0.0
+        self._tokens = 0.0
+        self._updated = time.monotonic()
+        self.configure(rate=rate, burst=burst)
+
+    def configure(
+        self, rate: Optional[float] = None, burst: Optional[float] = None
+    ) -> None:
+        """Change the cap, including for downloads in progress.
+
+        :param float rate:
+            (Optional) Bytes per second for all the downloads together. If
+            None, downloads are not limited.
+        :param float burst:
+            (Optional) Bytes that may be received at once after an idle
+            period. Defaults to a second's worth of ``rate``.
+        """
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive")
+        with self._condition:
+            self._refill()
+            self.rate = rate
+            self.burst = burst or rate or 0.0
+            self._tokens = min(self._tokens, self.burst) if rate else self.burst
+            self._condition.notify_all()
+
+    def flow(self, weight: float = 1, priority: int = 0) -> "Flow":
+        """Create the flow of a new download.
+
+        :param float weight:
+            (Optional) Share of the bandwidth relative to the other downloads
+            of the same priority.
+        :param int priority:
+            (Optional) Downloads of a higher priority are served first.
+        :rtype: Flow
+        """
+        return Flow(self, weight=weight, priority=priority)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if self.rate:
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+        self._updated = now
+
+    def _enqueue(self, flow: "Flow", size: int) -> "_Waiter":
+        start = max(self._virtual_time, flow._finish)
+        flow._finish = start + size / flow.weight
+        waiter = _Waiter(
+            key=(-flow.priority, flow._finish, next(self._sequence)),
+            start=start,
+            size=size,
+        )
+        self._waiters.append(waiter)
+        return waiter
+
+    def _remove(self, waiter: "_Waiter") -> None:
+        self._waiters.remove(waiter)
+        self._condition.notify_all()
+
+    def _try_grant(self, waiter: "_Waiter") -> Optional[float]:
+        """Hand out the waiter's bytes if it is its turn and there are tokens.
+
+        :rtype: float
+        :returns:
+            None if the bytes were handed out, otherwise how long to wait
+            before trying again, or 0 to wait until another waiter is served.
+        """
+        self._refill()
+        if self.rate is None:
+            self._remove(waiter)
+            return None
+        head = min(self._waiters, key=lambda w: w.key)
+        if head is not waiter:
+            return 0
+        if self._tokens > 0:
+            # Large chunks put the bucket in debt, paid back before the next
+            self._tokens -= waiter.size
+            self._virtual_time = max(self._virtual_time, waiter.start)
+            self._remove(waiter)
+            return None
+        # Wait for the debt to be paid back, and a token more
+        return (1 - self._tokens) / self.rate
+
+
+class Flow:
+    """The share of a :class:`BandwidthScheduler` used by one download."""
+
+    def __init__(self, scheduler: BandwidthScheduler, weight: float = 1, priority: int = 0):
+        """Construct a :class:`Flow <Flow>`.
+
+        :param BandwidthScheduler scheduler:
+            The scheduler the download takes its bandwidth from.
+        :param float weight:
+            (Optional) Share of the bandwidth relative to the other downloads
+            of the same priority.
+        :param int priority:
+            (Optional) Downloads of a higher priority are served first.
+        """
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        self.scheduler = scheduler
+        self.weight = weight
+        self.priority = priority
+        # Finish tag of the last bytes requested, in the fair queueing order
+        self._finish = 0.0
+
+    def acquire(self, size: int) -> None:
+        """Wait until ``size`` bytes may be received, blocking the thread.
+
+        :param int size:
+            Number of bytes.
+        """
+        scheduler = self.scheduler
+        if scheduler.rate is None:
+            return
+        with scheduler._condition:
+            waiter = scheduler._enqueue(self, size)
+            try:
+                while True:
+                    delay = scheduler._try_grant(waiter)
+                    if delay is None:
+                        return
+                    scheduler._condition.wait(delay or None)
+            except BaseException:
+                if waiter in scheduler._waiters:
+                    scheduler._remove(waiter)
+                raise
+
+    async def acquire_async(self, size: int) -> None:
+        """Wait until ``size`` bytes may be received, without blocking.
+
+        :param int size:
+            Number of bytes.
+        """
+        scheduler = self.scheduler
+        if scheduler.rate is None:
+            return
+        with scheduler._condition:
+            waiter = scheduler._enqueue(self, size)
+        try:
+            while True:
+                with scheduler._condition:
+                    delay = scheduler._try_grant(waiter)
+                if delay is None:
+                    return
+                await asyncio.sleep(delay or _poll_interval)
+        except BaseException:
+            with scheduler._condition:
+                if waiter in scheduler._waiters:
+                    scheduler._remove(waiter)
+            raise
+
+
+class _Waiter:
+    __slots__ = ("key", "start", "size")
+
+    def __init__(self, key, start: float, size: int):
+        self.key = key
+        self.start = start
+        self.size = size
+
+
+default_scheduler = BandwidthScheduler()
@@ -0,0 +1,105 @@
+"""Resolve many videos at once.
+
+:func:`resolve` fetches the pages and player responses of many videos over a
+bounded pool of worker threads. Each player's :class:`Cipher` is built only
+once, however many of the videos use it, by
+:data:`pytube.cipher_registry.default_registry`.
+"""
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, Tuple, Union
+
+from pytube.__main__ import YouTube
+
+logger = logging.getLogger(__name__)
+
+default_workers = 8
+
+
+def _warm_up(yt: YouTube, *properties: str) -> None:
+    """Evaluate lazy properties of a video, so that they are cached on it.
+
+    :param YouTube yt:
+        The video.
+    :param str properties:
+        The names of the properties, evaluated in the given order.
+    """
+    for name in properties:
+        getattr(yt, name)
+
+
+def _resolve_one(video_id: str, streams: bool) -> YouTube:
+    # Without streams, everything comes from the player response
+    yt = YouTube.from_id(video_id, lightweight=not streams)
+    yt.check_availability()
+    _warm_up(yt, "vid_info")
+    if streams:
+        # The cipher comes from the process-wide registry, built once per player
+        _warm_up(yt, "cipher", "fmt_streams")
+    return yt
+
+
+def resolve(
+    video_ids: Iterable[str],
+    workers: int = default_workers,
+    streams: bool = True,
+) -> Iterator[Tuple[str, Union[YouTube, Exception]]]:
+    """Resolve videos concurrently, yielding each one as soon as it is ready.
+
+    Usage::
+
+        for video_id, result in batch.resolve(video_ids, workers=8):
+            if isinstance(result, Exception):
+                print(f"{video_id} failed: {result}")
+            else:
+                print(result.title, result.streams.get_highest_resolution())
+
+    :param video_ids:
+        The ids of the videos to resolve. Only a bounded number of them is
+        read ahead, so this can be a lazy iterable.
+    :param int workers:
+        (Optional) Number of videos fetched at the same time.
+    :param bool streams:
+        (Optional) Whether to also fetch the player js and decipher the
+        streams of each video, so that ``streams`` is ready to use. Defaults
+        to True; when False, only the player response is fetched, and the
+        results are lightweight :class:`YouTube <YouTube>` objects.
+    :rtype: Iterator[Tuple[str, Union[YouTube, Exception]]]
+    :returns:
+        ``(video_id, result)`` pairs, in order of completion, where result is
+        a :class:`YouTube <YouTube>` object, or the exception raised while
+        resolving that video.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    ids = iter(video_ids)
+    window = workers * 2
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+
+        def submit() -> bool:
+            for video_id in ids:
+                future = executor.submit(_resolve_one, video_id, streams)
+                pending[future] = video_id
+                return True
+            return False
+
+        try:
+            while len(pending) < window and submit():
+                pass
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    video_id = pending.pop(future)
+                    submit()
+                    error = future.exception()
+                    if error is not None:
+                        logger.debug("failed to resolve %s: %r", video_id, error)
+                        yield video_id, error
+                    else:
+                        yield video_id, future.result()
+        finally:
+            # When the caller stops early, don't resolve the videos queued
+            #  for nothing; the executor then waits for those in progress.
+            for future in pending:
+                future.cancel()
@@ -14,7 +14,10 @@ signature and decoding it.
 """
 import logging
 import re
+import threading
+from collections import OrderedDict
 from itertools import chain
+from operator import itemgetter
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from pytube.exceptions import ExtractError, RegexMatchError
@@ -25,6 +28,14 @@ logger = logging.getLogger(__name__)
 
 
 class Cipher:
+    # Number of calculated n values remembered by each cipher
+    n_cache_size = 256
+
+    js_func_patterns = [
+        r"\w+\.(\w+)\(\w,(\d+)\)",
+        r"\w+\[(\"\w+\")\]\(\w,(\d+)\)"
+    ]
+
     def __init__(self, js: str):
         self.transform_plan: List[str] = get_transform_plan(js)
         var_regex = re.compile(r"^\w+\W")
@@ -35,43 +46,127 @@ class Cipher:
             )
         var = var_match.group(0)[:-1]
         self.transform_map = get_transform_map(js, var)
-        self.js_func_patterns = [
-            r"\w+\.(\w+)\(\w,(\d+)\)",
-            r"\w+\[(\"\w+\")\]\(\w,(\d+)\)"
-        ]
 
         self.throttling_plan = get_throttling_plan(js)
         self.throttling_array = get_throttling_function_array(js)
 
-        self.calculated_n = None
+        self._init_caches()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Describe the parsed cipher with JSON serializable values.
+
+        The description holds everything extracted from base.js, so
+        :meth:`from_dict` can rebuild the cipher without parsing it again.
+
+        :rtype: dict
+        """
+        throttling_array = []
+        for el in self.throttling_array:
+            if el is self.throttling_array:
+                throttling_array.append({"array": "self"})
+            elif callable(el):
+                throttling_array.append({"function": el.__name__})
+            else:
+                throttling_array.append(el)
+        return {
+            "transform_plan": self.transform_plan,
+            "transform_map": {
+                name: fn.__name__ for name, fn in self.transform_map.items()
+            },
+            "throttling_plan": [list(step) for step in self.throttling_plan],
+            "throttling_array": throttling_array,
+        }
+
+    @classmethod
+    def from_dict(cls, description: Dict[str, Any]) -> "Cipher":
+        """Rebuild a cipher from the output of :meth:`to_dict`.
+
+        :param dict description:
+            A description returned by :meth:`to_dict`.
+        :rtype: Cipher
+        :raises ValueError:
+            If the description is malformed or names an unknown function.
+        """
+        try:
+            transform_map = {
+                name: _functions[fn]
+                for name, fn in description["transform_map"].items()
+            }
+            throttling_array: List[Any] = []
+            for el in description["throttling_array"]:
+                if isinstance(el, dict):
+                    if el.get("array") == "self":
+                        el = throttling_array
+                    else:
+                        el = _functions[el["function"]]
+                throttling_array.append(el)
+            cipher = cls.__new__(cls)
+            cipher.transform_plan = list(description["transform_plan"])
+            cipher.transform_map = transform_map
+            cipher.throttling_plan = [
+                tuple(step) for step in description["throttling_plan"]
+            ]
+            cipher.throttling_array = throttling_array
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"invalid cipher description: {e!r}") from e
+        cipher._init_caches()
+        return cipher
+
+    def _init_caches(self) -> None:
+        # Calculated n values by n, most recently used last. Every stream of
+        #  a video shares the same n, so most lookups are hits.
+        self._n_cache: OrderedDict = OrderedDict()
+        self._n_cache_lock = threading.Lock()
+        # Compiled transform plans, and functions applying them, by signature
+        #  length
+        self._permutations: Dict[int, List[int]] = {}
+        self._gathers: Dict[int, Callable[[str], Any]] = {}
 
     def calculate_n(self, initial_n: list):
-        """Converts n to the correct value to prevent throttling."""
-        if self.calculated_n:
-            return self.calculated_n
+        """Converts n to the correct value to prevent throttling.
 
-        # First, update all instances of 'b' with the list(initial_n)
-        for i in range(len(self.throttling_array)):
-            if self.throttling_array[i] == 'b':
-                self.throttling_array[i] = initial_n
+        The result only depends on n, and the last :attr:`n_cache_size`
+        results are remembered. It is safe to call from several threads.
+        """
+        n = ''.join(initial_n)
+        with self._n_cache_lock:
+            calculated_n = self._n_cache.get(n)
+            if calculated_n is not None:
+                self._n_cache.move_to_end(n)
+                return calculated_n
+
+        # The throttling functions modify their arguments in place, so work
+        #  on a fresh copy of the array (and of n) each time. This keeps the
+        #  cipher reusable for other videos, which have a different n.
+        initial_n = list(initial_n)
+        throttling_array = list(self.throttling_array)
+        for i, el in enumerate(throttling_array):
+            if el is self.throttling_array:
+                throttling_array[i] = throttling_array
+            elif el == 'b':
+                throttling_array[i] = initial_n
 
         for step in self.throttling_plan:
-            curr_func = self.throttling_array[int(step[0])]
+            curr_func = throttling_array[int(step[0])]
             if not callable(curr_func):
                 logger.debug(f'{curr_func} is not callable.')
-                logger.debug(f'Throttling array:\n{self.throttling_array}\n')
+                logger.debug(f'Throttling array:\n{throttling_array}\n')
                 raise ExtractError(f'{curr_func} is not callable.')
 
-            first_arg = self.throttling_array[int(step[1])]
+            first_arg = throttling_array[int(step[1])]
 
             if len(step) == 2:
                 curr_func(first_arg)
             elif len(step) == 3:
-                second_arg = self.throttling_array[int(step[2])]
+                second_arg = throttling_array[int(step[2])]
                 curr_func(first_arg, second_arg)
 
-        self.calculated_n = ''.join(initial_n)
-        return self.calculated_n
+        calculated_n = ''.join(initial_n)
+        with self._n_cache_lock:
+            self._n_cache[n] = calculated_n
+            while len(self._n_cache) > self.n_cache_size:
+                self._n_cache.popitem(last=False)
+        return calculated_n
 
     def get_signature(self, ciphered_signature: str) -> str:
         """Decipher the signature.
@@ -84,24 +179,52 @@ class Cipher:
         :returns:
             Decrypted signature required to download the media content.
         """
-        signature = list(ciphered_signature)
+        gather = self._gathers.get(len(ciphered_signature))
+        if gather is None:
+            permutation = self.get_permutation(len(ciphered_signature))
+            gather = itemgetter(*permutation) if permutation else lambda s: ""
+            self._gathers[len(ciphered_signature)] = gather
+        return "".join(gather(ciphered_signature))
+
+    def get_signatures(self, ciphered_signatures: List[str]) -> List[str]:
+        """Decipher several signatures.
+
+        :param list ciphered_signatures:
+            The ciphered signatures sent in the ``player_config``.
+        :rtype: List[str]
+        :returns:
+            Decrypted signatures, in the same order.
+        """
+        return [self.get_signature(s) for s in ciphered_signatures]
+
+    def get_permutation(self, length: int) -> List[int]:
+        """Compile the transform plan for signatures of a given length.
+
+        The transform functions only rearrange (and drop) characters, so
+        applying them to the positions of a signature, rather than its
+        characters, gives which position of the ciphered signature ends up at
+        each position of the deciphered one.
 
+        :param int length:
+            Length of the ciphered signatures.
+        :rtype: List[int]
+        """
+        permutation = self._permutations.get(length)
+        if permutation is not None:
+            return permutation
+
+        permutation = list(range(length))
         for js_func in self.transform_plan:
             name, argument = self.parse_function(js_func)  # type: ignore
-            signature = self.transform_map[name](signature, argument)
-            logger.debug(
-                "applied transform function\n"
-                "output: %s\n"
-                "js_function: %s\n"
-                "argument: %d\n"
-                "function: %s",
-                "".join(signature),
-                name,
-                argument,
-                self.transform_map[name],
-            )
-
-        return "".join(signature)
+            permutation = self.transform_map[name](permutation, argument)
+        logger.debug(
+            "compiled transform plan for signatures of length %d: %s",
+            length,
+            permutation,
+        )
+        # Races only compute the same permutation twice
+        self._permutations[length] = permutation
+        return permutation
 
     @cache
     def parse_function(self, js_func: str) -> Tuple[str, int]:
@@ -695,3 +818,21 @@ def map_functions(js_func: str) -> Callable:
         if re.search(pattern, js_func):
             return fn
     raise RegexMatchError(caller="map_functions", pattern="multiple")
+
+
+# Functions a cipher can refer to, by name, in the output of Cipher.to_dict
+_functions: Dict[str, Callable] = {
+    fn.__name__: fn for fn in (
+        reverse,
+        splice,
+        swap,
+        throttling_reverse,
+        throttling_push,
+        throttling_unshift,
+        throttling_cipher_function,
+        throttling_nested_splice,
+        throttling_prepend,
+        throttling_swap,
+        js_splice,
+    )
+}
@@ -0,0 +1,219 @@
+"""Process-wide registry of player base.js files and their ciphers.
+
+Every :class:`pytube.YouTube` object in a process gets the js and the
+:class:`pytube.cipher.Cipher` of its player from :data:`default_registry`,
+which keeps the most recently used player versions in memory, keyed by the
+url of their base.js. Threads asking for a player that is being fetched or
+parsed wait for that work to finish rather than repeating it, and videos on
+different player versions don't evict each other's player.
+
+Players missing from the registry are loaded from
+:data:`pytube.player_cache.default_cache` when possible.
+
+The registry replaces the ``pytube.__js__`` and ``pytube.__js_url__``
+globals, which still read the player used last but are deprecated.
+"""
+import asyncio
+import functools
+import logging
+import threading
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional, Tuple
+
+from pytube import player_cache, request
+from pytube.cipher import Cipher
+
+logger = logging.getLogger(__name__)
+
+default_maxsize = 8
+
+
+class _Player:
+    """The js and cipher of one player version, as far as they are known."""
+
+    __slots__ = ("js", "cipher", "lock", "fetching")
+
+    def __init__(self):
+        self.js: Optional[str] = None
+        self.cipher: Optional[Cipher] = None
+        # Held by the thread loading the js or building the cipher
+        self.lock = threading.Lock()
+        # Future of the coroutine fetching the js, and its event loop
+        self.fetching = None
+
+
+class CipherRegistry:
+    """Bounded LRU registry of player js and ciphers, safe to share by threads."""
+
+    def __init__(self, maxsize: int = default_maxsize):
+        """Construct a :class:`CipherRegistry <CipherRegistry>`.
+
+        :param int maxsize:
+            (Optional) Number of player versions kept in memory.
+        """
+        self.maxsize = maxsize
+        self._players: "OrderedDict[str, _Player]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def __contains__(self, js_url: str) -> bool:
+        return js_url in self._players
+
+    def js(self, js_url: str) -> str:
+        """Return the js of a player, fetching it if needed.
+
+        :param str js_url:
+            Url of the player's base.js.
+        :rtype: str
+        """
+        player = self._player(js_url)
+        if player.js is None:
+            with player.lock:
+                self._load_js(js_url, player)
+        return player.js
+
+    async def js_async(
+        self, js_url: str, fetch: Callable[[str], Awaitable[str]]
+    ) -> str:
+        """Return the js of a player, fetching it with a coroutine if needed.
+
+        Coroutines of the same event loop asking for the same player while it
+        is being fetched wait for that fetch. The on-disk player cache is read
+        and written from the default executor of the loop.
+
+        :param str js_url:
+            Url of the player's base.js.
+        :param fetch:
+            Coroutine function fetching the body of a url, e.g.
+            :func:`pytube.aio.request.get`.
+        :rtype: str
+        """
+        player = self._player(js_url)
+        loop = asyncio.get_running_loop()
+        cache = player_cache.default_cache
+        while player.js is None:
+            js = await loop.run_in_executor(None, cache.js, js_url)
+            if player.js is None:
+                player.js = js
+            if player.js is not None:
+                break
+            fetching = player.fetching
+            if fetching is not None and fetching[0] is loop:
+                await asyncio.shield(fetching[1])
+                continue
+            future = loop.create_future()
+            player.fetching = (loop, future)
+            try:
+                js = await fetch(js_url)
+                await loop.run_in_executor(None, cache.store, js_url, js)
+                player.js = js
+            finally:
+                player.fetching = None
+                future.set_result(None)
+        return player.js
+
+    def cipher(
+        self, js_url: str, get_js: Optional[Callable[[], str]] = None
+    ) -> Cipher:
+        """Return the cipher of a player, building it if needed.
+
+        :param str js_url:
+            Url of the player's base.js.
+        :param get_js:
+            (Optional) Called for the js of the player when it is needed and
+            not known yet, instead of fetching it. Used by callers that must
+            not block, and fetch the js beforehand.
+        :rtype: Cipher
+        """
+        player = self._player(js_url)
+        if player.cipher is None:
+            with player.lock:
+                if player.cipher is None:
+                    cache = player_cache.default_cache
+                    cipher = cache.cipher(js_url)
+                    if cipher is None:
+                        if player.js is None and get_js is not None:
+                            player.js = get_js()
+                        self._load_js(js_url, player)
+                        logger.debug("building cipher for %s", js_url)
+                        cipher = Cipher(js=player.js)
+                        cache.store(js_url, player.js, cipher)
+                    player.cipher = cipher
+        return player.cipher
+
+    async def cipher_async(
+        self, js_url: str, get_js: Optional[Callable[[], str]] = None
+    ) -> Cipher:
+        """Return the cipher of a player, building it outside the event loop.
+
+        Takes the same arguments as :meth:`cipher`, which is called from the
+        default executor of the running loop unless the cipher is already in
+        memory, since loading it from the on-disk cache or parsing the js
+        takes a while.
+
+        :rtype: Cipher
+        """
+        player = self._player(js_url)
+        if player.cipher is not None:
+            return player.cipher
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(self.cipher, js_url, get_js=get_js)
+        )
+
+    def remove(self, js_url: str) -> None:
+        """Forget a player, here and in the on-disk cache.
+
+        Used when its cipher stopped working, so the next use fetches the js
+        again.
+
+        :param str js_url:
+            Url of the player's base.js.
+        """
+        with self._lock:
+            self._players.pop(js_url, None)
+        player_cache.default_cache.remove(js_url)
+
+    def last_used(self) -> Optional[Tuple[str, str]]:
+        """Return the url and js of the player used last, if any js is loaded.
+
+        :rtype: Optional[Tuple[str, str]]
+        """
+        with self._lock:
+            for js_url, player in reversed(self._players.items()):
+                if player.js is not None:
+                    return js_url, player.js
+        return None
+
+    def clear(self) -> None:
+        """Forget every player kept in memory."""
+        with self._lock:
+            self._players.clear()
+
+    def _player(self, js_url: str) -> _Player:
+        with self._lock:
+            player = self._players.get(js_url)
+            if player is None:
+                player = self._players[js_url] = _Player()
+                while len(self._players) > max(1, self.maxsize):
+                    self._players.popitem(last=False)
+            else:
+                self._players.move_to_end(js_url)
+            return player
+
+    @staticmethod
+    def _load_js(js_url: str, player: _Player) -> None:
+        """Load the js of a player, with its lock held."""
+        if player.js is not None:
+            return
+        js = player_cache.default_cache.js(js_url)
+        if js is None:
+            logger.debug("fetching player %s", js_url)
+            js = request.get(js_url)
+            player_cache.default_cache.store(js_url, js)
+        player.js = js
+
+
+default_registry = CipherRegistry()
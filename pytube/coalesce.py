@@ -0,0 +1,172 @@
+"""Sharing one round trip between identical requests made at the same time.
+
+When several threads (or coroutines) ask for the same page while it is
+already being fetched, e.g. many :class:`pytube.YouTube` objects built at
+once for the same video, the first caller makes the request and the others
+wait for it and get the same result, or the same error.
+
+:func:`pytube.request.get`, :func:`pytube.request.post`, their
+:mod:`pytube.aio.request` counterparts and the innertube clients go through
+:data:`default_coalescer`. Set it to None to send every request::
+
+    from pytube import coalesce
+    coalesce.default_coalescer = None
+"""
+import asyncio
+import json
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Methods whose identical requests may share a response
+coalesced_methods = frozenset({"GET", "POST"})
+
+# Result of a call given up by its cancelled task
+_abandoned = object()
+
+
+class _Call:
+    """A request in flight, and its outcome once it is known."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class Coalescer:
+    """Runs at most one call per key at a time, sharing its outcome."""
+
+    def __init__(self):
+        """Construct a :class:`Coalescer <Coalescer>`."""
+        self.calls = 0
+        self.coalesced = 0
+        self._calls: Dict[Hashable, _Call] = {}
+        self._futures: Dict[Tuple[Any, Hashable], asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    def call(self, key: Hashable, func: Callable[..., T], *args, **kwargs) -> T:
+        """Call a function, unless a call with the same key is in flight.
+
+        :param key:
+            Identifies calls that can share their result.
+        :rtype: The return type of ``func``.
+        :returns:
+            The result of ``func``, or of the call in flight.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            logger.debug("waiting for request in flight: %s", key)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def call_async(
+        self, key: Hashable, func: Callable[..., Awaitable[T]], *args, **kwargs
+    ) -> T:
+        """Await a coroutine function, unless a call with the same key is in
+        flight in the running event loop.
+
+        If the task making the call is cancelled, one of the tasks waiting
+        for it makes the call again.
+
+        :param key:
+            Identifies calls that can share their result.
+        :rtype: The return type of ``func``.
+        """
+        loop = asyncio.get_running_loop()
+        key = (loop, key)
+        waited = False
+        while True:
+            with self._lock:
+                future = self._futures.get(key)
+                leader = future is None
+                if leader:
+                    future = self._futures[key] = loop.create_future()
+                    self.calls += 1
+                elif not waited:
+                    self.coalesced += 1
+            if leader:
+                break
+            waited = True
+            logger.debug("waiting for request in flight: %s", key[1])
+            result = await asyncio.shield(future)
+            if result is not _abandoned:
+                return result
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            # Only this task was cancelled, not those waiting for it
+            future.set_result(_abandoned)
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Marked as retrieved, or asyncio logs it when nobody waited
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._futures[key]
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Number of calls made, and of calls that waited for another one.
+
+        :rtype: dict
+        """
+        return {"calls": self.calls, "coalesced": self.coalesced}
+
+
+def request_key(
+    url: str, method: Optional[str] = None, headers=None, data=None
+) -> Optional[Hashable]:
+    """Key of a request, under which identical requests are coalesced.
+
+    :param str url:
+        Url of the request.
+    :param str method:
+        (Optional) Method of the request, worked out from the data if None.
+    :param dict headers:
+        (Optional) Headers of the request.
+    :param data:
+        (Optional) Body of the request, as bytes or json-serializable.
+    :rtype: tuple
+    :returns:
+        The key, or None if the request shouldn't be coalesced.
+    """
+    method = (method or ("POST" if data else "GET")).upper()
+    if method not in coalesced_methods:
+        return None
+    if data and not isinstance(data, bytes):
+        data = json.dumps(data, sort_keys=True)
+    return method, url, tuple(sorted((headers or {}).items())), data or None
+
+
+default_coalescer: Optional[Coalescer] = Coalescer()
@@ -2,7 +2,7 @@
 """Module for interacting with a user's youtube channel."""
 import json
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 from pytube import extract, Playlist, request
 from pytube.helpers import uniqueify
@@ -11,15 +11,23 @@ logger = logging.getLogger(__name__)
 
 
 class Channel(Playlist):
-    def __init__(self, url: str, proxies: Optional[Dict[str, str]] = None):
+    def __init__(
+        self,
+        url: str,
+        proxies: Optional[Dict[str, str]] = None,
+        prefetch_pages: int = 0,
+    ):
         """Construct a :class:`Channel <Channel>`.
 
         :param str url:
             A valid YouTube channel URL.
         :param proxies:
             (Optional) A dictionary of proxies to use for web requests.
+        :param int prefetch_pages:
+            (Optional) Number of pages of videos requested in the background
+            ahead of the page being iterated over.
         """
-        super().__init__(url, proxies)
+        super().__init__(url, proxies, prefetch_pages)
 
         self.channel_uri = extract.channel_name(url)
 
@@ -135,16 +143,21 @@ class Channel(Playlist):
             return self._about_html
 
     @staticmethod
-    def _extract_videos(raw_json: str) -> Tuple[List[str], Optional[str]]:
-        """Extracts videos from a raw json page
+    def _extract_videos(
+        raw_json: Union[str, bytes, dict, list]
+    ) -> Tuple[List[str], Optional[str]]:
+        """Extracts videos from a json page
 
-        :param str raw_json: Input json extracted from the page or the last
-            server response
+        :param raw_json: Input json extracted from the page or the last
+            server response, either decoded already or as str or bytes
         :rtype: Tuple[List[str], Optional[str]]
         :returns: Tuple containing a list of up to 100 video watch ids and
             a continuation token, if more videos are available
         """
-        initial_data = json.loads(raw_json)
+        if isinstance(raw_json, (str, bytes, bytearray)):
+            initial_data = json.loads(raw_json)
+        else:
+            initial_data = raw_json
         # this is the json tree structure, if the json was extracted from
         # html
         try:
@@ -3,10 +3,12 @@ import json
 import logging
 from collections.abc import Sequence
 from datetime import date, datetime
-from typing import Dict, Iterable, List, Optional, Tuple, Union
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from pytube import extract, request, YouTube
-from pytube.helpers import cache, DeferredGeneratorList, install_proxy, uniqueify
+from pytube.helpers import (
+    cache, DeferredGeneratorList, install_proxy, read_ahead, uniqueify
+)
 
 logger = logging.getLogger(__name__)
 
@@ -14,11 +16,29 @@ logger = logging.getLogger(__name__)
 class Playlist(Sequence):
     """Load a YouTube playlist with URL"""
 
-    def __init__(self, url: str, proxies: Optional[Dict[str, str]] = None):
+    def __init__(
+        self,
+        url: str,
+        proxies: Optional[Dict[str, str]] = None,
+        prefetch_pages: int = 0,
+    ):
+        """Construct a :class:`Playlist <Playlist>`.
+
+        :param str url:
+            A valid YouTube playlist URL.
+        :param proxies:
+            (Optional) A dictionary of proxies to use for web requests.
+        :param int prefetch_pages:
+            (Optional) Number of pages of videos requested in the background
+            ahead of the page being iterated over, so that doing work for
+            each video doesn't wait on the next page every 100 videos. Pages
+            are requested when needed if 0.
+        """
         if proxies:
             install_proxy(proxies)
 
         self._input_url = url
+        self.prefetch_pages = prefetch_pages
 
         # These need to be initialized as None for the properties.
         self._html = None
@@ -108,34 +128,44 @@ class Playlist(Sequence):
         """Parse the video links from the page source, yields the /watch?v=
         part from video link
 
+        Pages are requested ahead of time when :attr:`prefetch_pages` is set.
+
         :param until_watch_id Optional[str]: YouTube Video watch id until
             which the playlist should be read.
 
         :rtype: Iterable[List[str]]
         :returns: Iterable of lists of YouTube watch ids
         """
-        videos_urls, continuation = self._extract_videos(
-            json.dumps(extract.initial_data(self.html))
-        )
-        if until_watch_id:
-            try:
-                trim_index = videos_urls.index(f"/watch?v={until_watch_id}")
-                yield videos_urls[:trim_index]
-                return
-            except ValueError:
-                pass
+        pages = read_ahead(self._pages(), self.prefetch_pages)
+        try:
+            for videos_urls in pages:
+                if until_watch_id:
+                    try:
+                        trim_index = videos_urls.index(f"/watch?v={until_watch_id}")
+                        yield videos_urls[:trim_index]
+                        return
+                    except ValueError:
+                        pass
+                yield videos_urls
+        finally:
+            # Stops requesting pages ahead once trimmed or abandoned
+            pages.close()
+
+    def _pages(self) -> Iterator[List[str]]:
+        """Yield the watch paths of each page of videos, requesting the next
+        page once the previous one is consumed.
+
+        :rtype: Iterator[List[str]]
+        """
+        videos_urls, continuation = self._extract_videos(self.initial_data)
         yield videos_urls
 
         # Extraction from a playlist only returns 100 videos at a time
         # if self._extract_videos returns a continuation there are more
         # than 100 songs inside a playlist, so we need to add further requests
         # to gather all of them
-        if continuation:
+        while continuation:
             load_more_url, headers, data = self._build_continuation_url(continuation)
-        else:
-            load_more_url, headers, data = None, None, None
-
-        while load_more_url and headers and data:  # there is an url found
             logger.debug("load more url: %s", load_more_url)
             # requesting the next page of videos with the url generated from the
             # previous page, needs to be a post
@@ -143,22 +173,8 @@ class Playlist(Sequence):
             # extract up to 100 songs from the page loaded
             # returns another continuation if more videos are available
             videos_urls, continuation = self._extract_videos(req)
-            if until_watch_id:
-                try:
-                    trim_index = videos_urls.index(f"/watch?v={until_watch_id}")
-                    yield videos_urls[:trim_index]
-                    return
-                except ValueError:
-                    pass
             yield videos_urls
 
-            if continuation:
-                load_more_url, headers, data = self._build_continuation_url(
-                    continuation
-                )
-            else:
-                load_more_url, headers, data = None, None, None
-
     def _build_continuation_url(self, continuation: str) -> Tuple[str, dict, dict]:
         """Helper method to build the url and headers required to request
         the next page of videos
@@ -193,16 +209,21 @@ class Playlist(Sequence):
         )
 
     @staticmethod
-    def _extract_videos(raw_json: str) -> Tuple[List[str], Optional[str]]:
-        """Extracts videos from a raw json page
+    def _extract_videos(
+        raw_json: Union[str, bytes, dict, list]
+    ) -> Tuple[List[str], Optional[str]]:
+        """Extracts videos from a json page
 
-        :param str raw_json: Input json extracted from the page or the last
-            server response
+        :param raw_json: Input json extracted from the page or the last
+            server response, either decoded already or as str or bytes
         :rtype: Tuple[List[str], Optional[str]]
         :returns: Tuple containing a list of up to 100 video watch ids and
             a continuation token, if more videos are available
         """
-        initial_data = json.loads(raw_json)
+        if isinstance(raw_json, (str, bytes, bytearray)):
+            initial_data = json.loads(raw_json)
+        else:
+            initial_data = raw_json
         try:
             # this is the json tree structure, if the json was extracted from
             # html
@@ -11,6 +11,9 @@ logger = logging.getLogger(__name__)
 
 
 class Search:
+    # Class used for the videos in the results
+    _video_class = YouTube
+
     def __init__(self, query):
         """Initialize Search object.
 
@@ -88,7 +91,17 @@ class Search:
         # Begin by executing the query and identifying the relevant sections
         #  of the results
         raw_results = self.fetch_query(continuation)
+        return self._parse_results(raw_results)
+
+    def _parse_results(self, raw_results):
+        """Parse the videos and continuation out of raw innertube results.
 
+        :param dict raw_results:
+            The raw json object returned by the innertube API.
+        :rtype: tuple
+        :returns:
+            A tuple of a list of YouTube objects and a continuation string.
+        """
         # Initial result is handled by try block, continuations by except block
         try:
             sections = raw_results['contents']['twoColumnSearchResultsRenderer'][
@@ -201,7 +214,7 @@ class Search:
                 }
 
                 # Construct YouTube object from metadata and append to results
-                vid = YouTube(vid_metadata['url'])
+                vid = self._video_class(vid_metadata['url'])
                 vid.author = vid_metadata['channel_name']
                 vid.title = vid_metadata['title']
                 videos.append(vid)
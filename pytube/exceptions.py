@@ -15,6 +15,23 @@ class MaxRetriesExceeded(PytubeError):
     """Maximum number of retries exceeded."""
 
 
+class NotFetchedError(PytubeError):
+    """Data an asyncio object needs has not been fetched yet."""
+
+    def __init__(self, name: str, fetch_method: str):
+        """
+        :param str name:
+            Name of the missing data
+        :param str fetch_method:
+            Name of the coroutine method that fetches it
+        """
+        super().__init__(
+            f"{name} has not been fetched yet, await {fetch_method}() first"
+        )
+        self.name = name
+        self.fetch_method = fetch_method
+
+
 class HTMLParseError(PytubeError):
     """HTML could not be parsed"""
 
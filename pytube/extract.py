@@ -3,20 +3,29 @@ import logging
 import urllib.parse
 import re
 from collections import OrderedDict
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 from urllib.parse import parse_qs, quote, urlencode, urlparse
 
 from pytube.cipher import Cipher
-from pytube.exceptions import HTMLParseError, LiveStreamError, RegexMatchError
+from pytube.exceptions import LiveStreamError, RegexMatchError
 from pytube.helpers import regex_search
 from pytube.metadata import YouTubeMetadata
-from pytube.parser import parse_for_object, parse_for_all_objects
+from pytube.watch_page import WatchPage
 
 
 logger = logging.getLogger(__name__)
 
 
+def _watch_page(html: Union[str, WatchPage]) -> WatchPage:
+    """Wrap the html of a page in a :class:`WatchPage`, unless it already is.
+
+    Wrapping is cheap: the page is only searched for what is then asked for.
+    """
+    if isinstance(html, WatchPage):
+        return html
+    return WatchPage(html)
+
+
 def publish_date(watch_html: str):
     """Extract publish date
     :param str watch_html:
@@ -25,14 +34,7 @@ def publish_date(watch_html: str):
     :returns:
         Publish date of the video.
     """
-    try:
-        result = regex_search(
-            r"(?<=itemprop=\"datePublished\" content=\")\d{4}-\d{2}-\d{2}",
-            watch_html, group=0
-        )
-    except RegexMatchError:
-        return None
-    return datetime.strptime(result, '%Y-%m-%d')
+    return _watch_page(watch_html).publish_date
 
 
 def recording_available(watch_html):
@@ -82,11 +84,7 @@ def is_age_restricted(watch_html: str) -> bool:
     :returns:
         Whether or not the content is age restricted.
     """
-    try:
-        regex_search(r"og:restrictions:age", watch_html, group=0)
-    except RegexMatchError:
-        return False
-    return True
+    return _watch_page(watch_html).age_restricted
 
 
 def playability_status(watch_html: str) -> (str, str):
@@ -103,7 +101,19 @@ def playability_status(watch_html: str) -> (str, str):
     :returns:
         Playability status and reason of the video.
     """
-    player_response = initial_player_response(watch_html)
+    return player_response_playability_status(initial_player_response(watch_html))
+
+
+def player_response_playability_status(player_response: Dict) -> (str, str):
+    """Return the playability status and status explanation from a player response.
+
+    :param dict player_response:
+        A player response, e.g. ytInitialPlayerResponse or the response of the
+        innertube player endpoint.
+    :rtype: tuple
+    :returns:
+        Playability status and reason of the video.
+    """
     status_dict = player_response.get('playabilityStatus', {})
     if 'liveStreamability' in status_dict:
         return 'LIVE_STREAM', 'Video is a live stream.'
@@ -258,10 +268,11 @@ def js_url(html: str) -> str:
     :param str html:
         The html contents of the watch page.
     """
+    page = _watch_page(html)
     try:
-        base_js = get_ytplayer_config(html)['assets']['js']
+        base_js = page.ytplayer_config['assets']['js']
     except (KeyError, RegexMatchError):
-        base_js = get_ytplayer_js(html)
+        base_js = page.ytplayer_js
     return "https://youtube.com" + base_js
 
 
@@ -301,20 +312,7 @@ def get_ytplayer_js(html: str) -> Any:
     :returns:
         Path to YouTube's base.js file.
     """
-    js_url_patterns = [
-        r"(/s/player/[\w\d]+/[\w\d_/.]+/base\.js)"
-    ]
-    for pattern in js_url_patterns:
-        regex = re.compile(pattern)
-        function_match = regex.search(html)
-        if function_match:
-            logger.debug("finished regex search, matched: %s", pattern)
-            yt_player_js = function_match.group(1)
-            return yt_player_js
-
-    raise RegexMatchError(
-        caller="get_ytplayer_js", pattern="js_url_patterns"
-    )
+    return _watch_page(html).ytplayer_js
 
 
 def get_ytplayer_config(html: str) -> Any:
@@ -330,37 +328,7 @@ def get_ytplayer_config(html: str) -> Any:
     :returns:
         Substring of the html containing the encoded manifest data.
     """
-    logger.debug("finding initial function name")
-    config_patterns = [
-        r"ytplayer\.config\s*=\s*",
-        r"ytInitialPlayerResponse\s*=\s*"
-    ]
-    for pattern in config_patterns:
-        # Try each pattern consecutively if they don't find a match
-        try:
-            return parse_for_object(html, pattern)
-        except HTMLParseError as e:
-            logger.debug(f'Pattern failed: {pattern}')
-            logger.debug(e)
-            continue
-
-    # setConfig() needs to be handled a little differently.
-    # We want to parse the entire argument to setConfig()
-    #  and use then load that as json to find PLAYER_CONFIG
-    #  inside of it.
-    setconfig_patterns = [
-        r"yt\.setConfig\(.*['\"]PLAYER_CONFIG['\"]:\s*"
-    ]
-    for pattern in setconfig_patterns:
-        # Try each pattern consecutively if they don't find a match
-        try:
-            return parse_for_object(html, pattern)
-        except HTMLParseError:
-            continue
-
-    raise RegexMatchError(
-        caller="get_ytplayer_config", pattern="config_patterns, setconfig_patterns"
-    )
+    return _watch_page(html).ytplayer_config
 
 
 def get_ytcfg(html: str) -> str:
@@ -375,39 +343,32 @@ def get_ytcfg(html: str) -> str:
     :returns:
         Substring of the html containing the encoded manifest data.
     """
-    ytcfg = {}
-    ytcfg_patterns = [
-        r"ytcfg\s=\s",
-        r"ytcfg\.set\("
-    ]
-    for pattern in ytcfg_patterns:
-        # Try each pattern consecutively and try to build a cohesive object
-        try:
-            found_objects = parse_for_all_objects(html, pattern)
-            for obj in found_objects:
-                ytcfg.update(obj)
-        except HTMLParseError:
-            continue
+    return _watch_page(html).ytcfg
 
-    if len(ytcfg) > 0:
-        return ytcfg
-
-    raise RegexMatchError(
-        caller="get_ytcfg", pattern="ytcfg_pattenrs"
-    )
 
-
-def apply_signature(stream_manifest: Dict, vid_info: Dict, js: str) -> None:
+def apply_signature(
+    stream_manifest: Dict,
+    vid_info: Dict,
+    js: Optional[str],
+    cipher: Optional[Cipher] = None
+) -> None:
     """Apply the decrypted signature to the stream manifest.
 
     :param dict stream_manifest:
         Details of the media streams available.
     :param str js:
-        The contents of the base.js asset file.
+        The contents of the base.js asset file. Only used if ``cipher`` is
+        not given.
+    :param Cipher cipher:
+        (Optional) A cipher already built from the base.js asset file, to
+        skip parsing it again.
 
     """
-    cipher = Cipher(js=js)
+    if cipher is None:
+        cipher = Cipher(js=js)
 
+    # Find the streams that need deciphering, to decipher them in one go
+    ciphered = []
     for i, stream in enumerate(stream_manifest):
         try:
             url: str = stream["url"]
@@ -427,11 +388,13 @@ def apply_signature(stream_manifest: Dict, vid_info: Dict, js: str) -> None:
             # the whole signature descrambling entirely.
             logger.debug("signature found, skip decipher")
             continue
+        ciphered.append((i, url, stream["s"]))
 
-        signature = cipher.get_signature(ciphered_signature=stream["s"])
+    signatures = cipher.get_signatures([s for _, _, s in ciphered])
 
+    for (i, url, _), signature in zip(ciphered, signatures):
         logger.debug(
-            "finished descrambling signature for itag=%s", stream["itag"]
+            "finished descrambling signature for itag=%s", stream_manifest[i]["itag"]
         )
         parsed_url = urlparse(url)
 
@@ -504,17 +467,7 @@ def initial_data(watch_html: str) -> str:
     @param watch_html: Html of the watch page
     @return:
     """
-    patterns = [
-        r"window\[['\"]ytInitialData['\"]]\s*=\s*",
-        r"ytInitialData\s*=\s*"
-    ]
-    for pattern in patterns:
-        try:
-            return parse_for_object(watch_html, pattern)
-        except HTMLParseError:
-            pass
-
-    raise RegexMatchError(caller='initial_data', pattern='initial_data_pattern')
+    return _watch_page(watch_html).initial_data
 
 
 def initial_player_response(watch_html: str) -> str:
@@ -526,20 +479,7 @@ def initial_player_response(watch_html: str) -> str:
     @param watch_html: Html of the watch page
     @return:
     """
-    patterns = [
-        r"window\[['\"]ytInitialPlayerResponse['\"]]\s*=\s*",
-        r"ytInitialPlayerResponse\s*=\s*"
-    ]
-    for pattern in patterns:
-        try:
-            return parse_for_object(watch_html, pattern)
-        except HTMLParseError:
-            pass
-
-    raise RegexMatchError(
-        caller='initial_player_response',
-        pattern='initial_player_response_pattern'
-    )
+    return _watch_page(watch_html).initial_player_response
 
 
 def metadata(initial_data) -> Optional[YouTubeMetadata]:
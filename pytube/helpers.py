@@ -4,9 +4,11 @@ import gzip
 import json
 import logging
 import os
+import queue
 import re
+import threading
 import warnings
-from typing import Any, Callable, Dict, List, Optional, TypeVar
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
 from urllib import request
 
 from pytube.exceptions import RegexMatchError
@@ -256,9 +258,13 @@ def target_directory(output_path: Optional[str] = None) -> str:
 
 
 def install_proxy(proxy_handler: Dict[str, str]) -> None:
+    # Imported here to avoid a circular import, pytube.request uses helpers.
+    from pytube.request import default_pool
+
     proxy_support = request.ProxyHandler(proxy_handler)
     opener = request.build_opener(proxy_support)
     request.install_opener(opener)
+    default_pool.set_proxies(proxy_handler)
 
 
 def uniqueify(duped_list: List) -> List:
@@ -280,6 +286,60 @@ def uniqueify(duped_list: List) -> List:
     return result
 
 
+def read_ahead(iterable: Iterable[GenericType], lookahead: int) -> Iterator[GenericType]:
+    """Iterate in a background thread, ahead of the consumer.
+
+    Items are yielded in order, and an error raised by the iterable is raised
+    where the item would have been. At most ``lookahead`` items are produced
+    and not yet consumed; closing the generator stops the thread once the
+    item it is producing is done.
+
+    :param iterable:
+        The items, slow to produce, e.g. pages requested one after the other.
+    :param int lookahead:
+        Number of items produced ahead of the consumer. Iterates in the
+        calling thread if less than 1.
+    """
+    if lookahead < 1:
+        yield from iterable
+        return
+    produced: queue.Queue = queue.Queue()
+    slots = threading.Semaphore(lookahead)
+    stopped = threading.Event()
+
+    def produce():
+        try:
+            iterator = iter(iterable)
+            while True:
+                # Wait for the consumer to take an item if enough are waiting
+                slots.acquire()
+                if stopped.is_set():
+                    return
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    produced.put((False, None))
+                    return
+                produced.put((True, item))
+        except BaseException as e:
+            produced.put((False, e))
+
+    thread = threading.Thread(target=produce, name="pytube-read-ahead", daemon=True)
+    thread.start()
+    try:
+        while True:
+            is_item, value = produced.get()
+            if not is_item:
+                if value is not None:
+                    raise value
+                return
+            slots.release()
+            yield value
+    finally:
+        stopped.set()
+        slots.release()
+
+
 def generate_all_html_json_mocks():
     """Regenerate the video mock json files for all current test videos.
 
@@ -12,7 +12,7 @@ import time
 from urllib import parse
 
 # Local imports
-from pytube import request
+from pytube import request, response_cache
 
 # YouTube on TV client secrets
 _client_id = '861556708454-d6dlm3lh05idd8npek18k6be8ba3oc68.apps.googleusercontent.com'
@@ -220,7 +220,9 @@ _token_file = os.path.join(_cache_dir, 'tokens.json')
 
 class InnerTube:
     """Object for interacting with the innertube API."""
-    def __init__(self, client='ANDROID_MUSIC', use_oauth=False, allow_cache=True):
+    def __init__(
+        self, client='ANDROID_MUSIC', use_oauth=False, allow_cache=True, fresh=False
+    ):
         """Initialize an InnerTube object.
 
         :param str client:
@@ -230,6 +232,10 @@ class InnerTube:
             Whether or not to authenticate to YouTube.
         :param bool allow_cache:
             Allows caching of oauth tokens on the machine.
+        :param bool fresh:
+            (Optional) Skip the response cache and don't share responses with
+            identical calls in flight, e.g. to get new stream urls after the
+            previous ones were rejected.
         """
         self.context = _default_clients[client]['context']
         self.header = _default_clients[client]['header']
@@ -238,6 +244,7 @@ class InnerTube:
         self.refresh_token = None
         self.use_oauth = use_oauth
         self.allow_cache = allow_cache
+        self.fresh = fresh
 
         # Stored as epoch time
         self.expires = None
@@ -368,6 +375,60 @@ class InnerTube:
 
     def _call_api(self, endpoint, query, data):
         """Make a request to a given endpoint with the provided query parameters and data."""
+        cache, key = self._response_cache(endpoint, query, data)
+        if cache is not None:
+            body = cache.get(key)
+            if body is not None:
+                return json.loads(body)
+
+        endpoint_url, headers = self._prepare_call(endpoint, query)
+        # Retried as pytube.retry.default_policy allows
+        body = request._fetch(
+            endpoint_url,
+            'POST',
+            headers=headers,
+            data=data,
+            shared=not self.fresh
+        )
+        return self._decode_response(body, cache, key)
+
+    def _response_cache(self, endpoint, query, data):
+        """Return the cache for a call to the given endpoint and its key.
+
+        Fresh calls, calls made with oauth, and calls to endpoints other than
+        those in :data:`pytube.response_cache.cached_endpoints`, are not
+        cached.
+
+        :rtype: Tuple[ResponseCache, str]
+        """
+        cache = response_cache.default_cache
+        if (
+            cache is None
+            or self.fresh
+            or self.use_oauth
+            or endpoint.rsplit('/', 1)[-1] not in response_cache.cached_endpoints
+        ):
+            return None, None
+        return cache, response_cache.cache_key(endpoint, query, data)
+
+    @staticmethod
+    def _decode_response(body, cache, key):
+        """Decode the body of a response, caching it if a cache is given.
+
+        :rtype: dict
+        """
+        if isinstance(body, bytes):
+            body = body.decode('utf-8')
+        result = json.loads(body)
+        if cache is not None:
+            cache.set(key, body, response_cache.response_ttl(result, cache.ttl))
+        return result
+
+    def _prepare_call(self, endpoint, query):
+        """Build the url and headers for a call to the given endpoint.
+
+        :rtype: Tuple[str, dict]
+        """
         # Remove the API key if oauth is being used.
         if self.use_oauth:
             del query['key']
@@ -386,14 +447,7 @@ class InnerTube:
                 headers['Authorization'] = f'Bearer {self.access_token}'
 
         headers.update(self.header)
-
-        response = request._execute_request(
-            endpoint_url,
-            'POST',
-            headers=headers,
-            data=data
-        )
-        return json.loads(response.read())
+        return endpoint_url, headers
 
     def browse(self):
         """Make a request to the browse endpoint.
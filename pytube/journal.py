@@ -0,0 +1,202 @@
+"""Bookkeeping that lets an interrupted download pick up where it left off.
+
+While a stream downloads, its bytes go to a ``.part`` file next to the target
+and a small JSON journal beside it records which byte ranges have been
+written (or, for segmented OTF streams, the last completed segment). When a
+later download of the same stream finds a matching journal, it only fetches
+what is missing.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that identify the media file itself, rather than the
+# session it is being fetched with (signatures, expiry, client ip, ...).
+_fingerprint_params = ("id", "itag", "clen", "lmt", "mime")
+
+
+def fingerprint(url: str) -> str:
+    """Return an identifier for the file a stream url points at.
+
+    Signed urls change every time a video is loaded, so only the parameters
+    that describe the file are used.
+
+    :param str url:
+        The signed stream url.
+    :rtype: str
+    """
+    split_url = urlsplit(url)
+    query = parse_qs(split_url.query)
+    parts = [split_url.netloc.split(".", 1)[-1], split_url.path]
+    parts.extend(f"{k}={query[k][0]}" for k in _fingerprint_params if k in query)
+    return hashlib.sha1("&".join(parts).encode("utf-8")).hexdigest()
+
+
+class DownloadJournal:
+    """Record of the parts of a ``.part`` file that have been written."""
+
+    # Seconds between writes of the journal to disk.
+    save_interval = 1.0
+
+    def __init__(self, path: str, fingerprint: str, itag: int, filesize: int):
+        """Construct a :class:`DownloadJournal <DownloadJournal>`.
+
+        :param str path:
+            Where the journal is stored.
+        :param str fingerprint:
+            Identifier of the file being downloaded, see :func:`fingerprint`.
+        :param int itag:
+            The itag of the stream being downloaded.
+        :param int filesize:
+            Expected size of the complete file, in bytes.
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+        self.itag = itag
+        self.filesize = filesize
+        # Sorted, non-overlapping [start, stop] byte ranges (inclusive)
+        self.ranges: List[List[int]] = []
+        # Last completed segment number, for segmented (OTF) streams
+        self.segment: Optional[int] = None
+        self._lock = threading.Lock()
+        self._last_save = 0.0
+
+    @classmethod
+    def load(
+        cls, path: str, fingerprint: str, itag: int, filesize: int
+    ) -> "DownloadJournal":
+        """Load the journal at ``path``, if it belongs to the same file.
+
+        A journal left by a different stream, or one that can't be read, is
+        ignored and an empty journal is returned in its place.
+        """
+        journal = cls(path, fingerprint, itag, filesize)
+        try:
+            with open(path) as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return journal
+
+        if (
+            data.get("fingerprint") == fingerprint
+            and data.get("itag") == itag
+            and data.get("filesize") == filesize
+        ):
+            journal.ranges = [list(r) for r in data.get("ranges", [])]
+            journal.segment = data.get("segment")
+        else:
+            logger.debug("ignoring journal %s for a different file", path)
+        return journal
+
+    @property
+    def bytes_completed(self) -> int:
+        """Number of bytes already written to the ``.part`` file."""
+        return sum(stop - start + 1 for start, stop in self.ranges)
+
+    @property
+    def contiguous_bytes(self) -> int:
+        """Number of bytes written from the start of the file without a gap."""
+        if self.ranges and self.ranges[0][0] == 0:
+            return self.ranges[0][1] + 1
+        return 0
+
+    def missing_ranges(self) -> List[Tuple[int, int]]:
+        """List the (start, stop) byte ranges that still need downloading."""
+        missing = []
+        position = 0
+        for start, stop in self.ranges:
+            if start > position:
+                missing.append((position, start - 1))
+            position = max(position, stop + 1)
+        if position < self.filesize:
+            missing.append((position, self.filesize - 1))
+        return missing
+
+    def record(
+        self, start: int, stop: int, flush: Optional[Callable[[], None]] = None
+    ) -> None:
+        """Mark the bytes between start and stop (inclusive) as written.
+
+        :param int start:
+            Position of the first byte written.
+        :param int stop:
+            Position of the last byte written.
+        :param func flush:
+            (Optional) Called before the journal is saved, to make sure
+            buffered data has reached the ``.part`` file.
+        """
+        with self._lock:
+            self._merge(start, stop)
+            self._save_if_due(flush)
+
+    def record_segment(
+        self, segment: int, offset: int, flush: Optional[Callable[[], None]] = None
+    ) -> None:
+        """Mark every segment up to ``segment`` as written, ending at ``offset``.
+
+        :param int segment:
+            Sequence number of the last completely written segment.
+        :param int offset:
+            Size of the ``.part`` file once that segment has been written.
+        """
+        with self._lock:
+            self.segment = segment
+            self.ranges = [[0, offset - 1]] if offset else []
+            self._save_if_due(flush)
+
+    def reset(self) -> None:
+        """Forget everything recorded so far."""
+        with self._lock:
+            self.ranges = []
+            self.segment = None
+
+    def save(self, flush: Optional[Callable[[], None]] = None) -> None:
+        """Write the journal to disk, replacing any previous version."""
+        with self._lock:
+            self._save(flush)
+
+    def remove(self) -> None:
+        """Delete the journal from disk."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _merge(self, start: int, stop: int) -> None:
+        merged = []
+        for r_start, r_stop in self.ranges:
+            if r_stop + 1 < start or stop + 1 < r_start:
+                merged.append([r_start, r_stop])
+            else:
+                start, stop = min(start, r_start), max(stop, r_stop)
+        merged.append([start, stop])
+        self.ranges = sorted(merged)
+
+    def _save_if_due(self, flush: Optional[Callable[[], None]]) -> None:
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self._save(flush)
+
+    def _save(self, flush: Optional[Callable[[], None]]) -> None:
+        if flush:
+            flush()
+        data = {
+            "fingerprint": self.fingerprint,
+            "itag": self.itag,
+            "filesize": self.filesize,
+            "ranges": self.ranges,
+            "segment": self.segment,
+        }
+        # Write to a temporary file first, so a crash mid-write can't leave a
+        # truncated journal behind.
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as fh:
+            json.dump(data, fh)
+        os.replace(temp_path, self.path)
+        self._last_save = time.monotonic()
@@ -8,8 +8,11 @@ class Monostate:
         on_complete: Optional[Callable[[Any, Optional[str]], None]],
         title: Optional[str] = None,
         duration: Optional[int] = None,
+        refresh_url: Optional[Callable[[int], Optional[str]]] = None,
     ):
         self.on_progress = on_progress
         self.on_complete = on_complete
         self.title = title
         self.duration = duration
+        # Returns a newly signed url for the stream with the given itag
+        self.refresh_url = refresh_url
@@ -57,6 +57,24 @@ def parse_for_object(html, preceding_regex):
     return parse_for_object_from_startpoint(html, start_index)
 
 
+# Characters that can change the context of the scan, in each context: code
+#  (inside an object or array), strings, and javascript regular expressions.
+_context_scanners = {
+    '{': re.compile(r'[{}\[\]"/]'),
+    '[': re.compile(r'[{}\[\]"/]'),
+    '"': re.compile(r'["\\]'),
+    '/': re.compile(r'[/\\]'),
+}
+_context_closers = {
+    '{': '}',
+    '[': ']',
+    '"': '"',
+    '/': '/'  # javascript regex
+}
+# A slash after any of these starts a regular expression, not a division
+_regex_preceding_chars = frozenset('(,=:[!&|?{};')
+
+
 def find_object_from_startpoint(html, start_point):
     """Parses input html to find the end of a JavaScript object.
 
@@ -68,56 +86,61 @@ def find_object_from_startpoint(html, start_point):
     :returns:
         A dict created from parsing the object.
     """
-    html = html[start_point:]
-    if html[0] not in ['{','[']:
-        raise HTMLParseError(f'Invalid start point. Start of HTML:\n{html[:20]}')
+    if html[start_point] not in ['{', '[']:
+        raise HTMLParseError(
+            f'Invalid start point. Start of HTML:\n{html[start_point:start_point + 20]}'
+        )
 
     # First letter MUST be a open brace, so we put that in the stack,
     # and skip the first character.
-    last_char = '{'
-    curr_char = None
-    stack = [html[0]]
-    i = 1
-
-    context_closers = {
-        '{': '}',
-        '[': ']',
-        '"': '"',
-        '/': '/' # javascript regex
-    }
-
-    while i < len(html):
-        if len(stack) == 0:
+    stack = [html[start_point]]
+    i = start_point + 1
+
+    # Rather than looking at every character, jump straight to the next one
+    #  that matters in the current context.
+    while stack:
+        curr_context = stack[-1]
+        match = _context_scanners[curr_context].search(html, i)
+        if not match:
+            i = len(html)
             break
-        if curr_char not in [' ', '\n']:
-            last_char = curr_char
+        i = match.start()
         curr_char = html[i]
-        curr_context = stack[-1]
 
         # If we've reached a context closer, we can remove an element off the stack
-        if curr_char == context_closers[curr_context]:
+        if curr_char == _context_closers[curr_context]:
             stack.pop()
             i += 1
             continue
 
-        # Strings and regex expressions require special context handling because they can contain
-        #  context openers *and* closers
+        # Strings and regex expressions require special context handling
+        #  because they can contain context openers *and* closers
         if curr_context in ['"', '/']:
             # If there's a backslash in a string or regex expression, we skip a character
-            if curr_char == '\\':
-                i += 2
-                continue
-        else:
-            # Non-string contexts are when we need to look for context openers.
-            if curr_char in context_closers.keys():
-                # Slash starts a regular expression depending on context
-                if not (curr_char == '/' and last_char not in ['(', ',', '=', ':', '[', '!', '&', '|', '?', '{', '}', ';']): 
-                    stack.append(curr_char)
+            i += 2
+            continue
 
+        # Non-string contexts are when we need to look for context openers.
+        if curr_char in _context_closers:
+            # Slash starts a regular expression depending on context
+            if curr_char != '/' or (
+                _last_char(html, start_point, i) in _regex_preceding_chars
+            ):
+                stack.append(curr_char)
         i += 1
 
-    full_obj = html[:i]
-    return full_obj  # noqa: R504
+    return html[start_point:i]
+
+
+def _last_char(html, start_point, i):
+    """Return the last character before i that is not a space or a newline.
+
+    Only characters after the opening brace at start_point are considered.
+    """
+    j = i - 1
+    while j > start_point and html[j] in ' \n':
+        j -= 1
+    return html[j] if j > start_point else None
 
 
 def parse_for_object_from_startpoint(html, start_point):
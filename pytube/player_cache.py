@@ -0,0 +1,140 @@
+"""On-disk cache of player base.js files and the ciphers parsed from them.
+
+Every video served by the same player shares its base.js, and parsing the
+cipher out of it takes a noticeable amount of time. :class:`PlayerCache`
+keeps both, keyed by the url of the js, so that a new process can skip
+downloading and parsing it: the cipher is rebuilt from its stored
+description with :meth:`pytube.cipher.Cipher.from_dict`.
+"""
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import tempfile
+from typing import Optional
+
+from pytube.cipher import Cipher
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the layout of stored cipher descriptions changes
+_format_version = 1
+
+default_cache_dir = pathlib.Path(__file__).parent.resolve() / '__cache__' / 'players'
+
+
+class PlayerCache:
+    """Cache of player js and cipher descriptions in a directory."""
+
+    def __init__(self, directory: Optional[str] = default_cache_dir):
+        """Construct a :class:`PlayerCache <PlayerCache>`.
+
+        :param str directory:
+            Directory the cache is kept in, created when first written to.
+            If None, nothing is cached.
+        """
+        self.directory = directory
+
+    def js(self, js_url: str) -> Optional[str]:
+        """Return the cached js of a player, if any.
+
+        :param str js_url:
+            Url of the player's base.js.
+        :rtype: str
+        """
+        path = self._path(js_url, ".js")
+        if path is None or not os.path.isfile(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as fh:
+                return fh.read()
+        except OSError:
+            return None
+
+    def cipher(self, js_url: str) -> Optional[Cipher]:
+        """Return the cipher of a player, rebuilt from the cache, if any.
+
+        :param str js_url:
+            Url of the player's base.js.
+        :rtype: Cipher
+        """
+        path = self._path(js_url, ".json")
+        if path is None or not os.path.isfile(path):
+            return None
+        try:
+            with open(path, encoding="utf-8") as fh:
+                entry = json.load(fh)
+            if entry["version"] != _format_version or entry["js_url"] != js_url:
+                return None
+            return Cipher.from_dict(entry["cipher"])
+        except OSError:
+            return None
+        except (ValueError, KeyError, TypeError) as e:
+            logger.debug("ignoring unreadable cipher cache %s: %r", path, e)
+            return None
+
+    def store(self, js_url: str, js: str, cipher: Optional[Cipher] = None) -> None:
+        """Cache the js of a player, and optionally the cipher parsed from it.
+
+        Failures to write are logged and otherwise ignored.
+
+        :param str js_url:
+            Url of the player's base.js.
+        :param str js:
+            The contents of the player's base.js.
+        :param Cipher cipher:
+            (Optional) The cipher parsed from ``js``.
+        """
+        if self.directory is None:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            js_path = self._path(js_url, ".js")
+            if not os.path.isfile(js_path):
+                self._write(js_path, js)
+            if cipher is not None:
+                entry = {
+                    "version": _format_version,
+                    "js_url": js_url,
+                    "cipher": cipher.to_dict(),
+                }
+                self._write(self._path(js_url, ".json"), json.dumps(entry))
+        except OSError as e:
+            logger.debug("could not cache player %s: %r", js_url, e)
+
+    def remove(self, js_url: str) -> None:
+        """Forget a player, e.g. because its cached cipher stopped working.
+
+        :param str js_url:
+            Url of the player's base.js.
+        """
+        for suffix in (".js", ".json"):
+            path = self._path(js_url, suffix)
+            if path is None:
+                return
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _path(self, js_url: str, suffix: str) -> Optional[str]:
+        if self.directory is None:
+            return None
+        key = hashlib.sha256(js_url.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, key + suffix)
+
+    def _write(self, path: str, content: str) -> None:
+        # Write to a temporary file first, so other processes never read a
+        #  partially written entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                fh.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+
+default_cache = PlayerCache()
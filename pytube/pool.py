@@ -0,0 +1,214 @@
+"""Keep-alive connection pooling for pytube's HTTP transport.
+
+urllib opens a brand new connection, and closes it again, for every request
+it makes. For a download that is split into many ranged requests that means
+one TCP (and TLS) handshake per range. This module provides a drop-in opener
+whose HTTP and HTTPS handlers check connections out of a per-host pool and
+return them once the response body has been fully read, so later requests to
+the same host reuse the already established connection.
+"""
+import http.client
+import logging
+import socket
+import threading
+from typing import Dict, List, Optional, Tuple
+from urllib.error import URLError
+from urllib.request import (
+    HTTPHandler, HTTPSHandler, ProxyHandler, Request, build_opener
+)
+
+logger = logging.getLogger(__name__)
+default_pool_size = 10
+
+# Errors raised by a kept-alive connection that the server has since closed.
+_stale_connection_errors = (
+    http.client.RemoteDisconnected,
+    ConnectionResetError,
+    BrokenPipeError,
+)
+
+
+class _PooledResponse(http.client.HTTPResponse):
+    """HTTP response that hands its connection back to the pool when done."""
+
+    _release = None  # set by the pool once the response has been received
+
+    def close(self):
+        # Closing before the body has been read leaves unread data on the
+        # socket, so the connection can't be used for another request.
+        if self.fp is not None and self.length != 0:
+            self.will_close = True
+        super().close()
+
+    def _close_conn(self):
+        super()._close_conn()
+        release, self._release = self._release, None
+        if release:
+            release(not self.will_close and (self.chunked or self.length == 0))
+
+
+class ConnectionPool:
+    """Thread-safe pool of kept-alive HTTP(S) connections, keyed by host."""
+
+    def __init__(
+        self,
+        maxsize: int = default_pool_size,
+        proxies: Optional[Dict[str, str]] = None,
+        context=None,
+    ):
+        """Construct a :class:`ConnectionPool <ConnectionPool>`.
+
+        :param int maxsize:
+            Maximum number of idle connections kept open per host.
+        :param dict proxies:
+            (Optional) A dict mapping protocol to proxy address. Defaults to
+            the proxies configured in the environment.
+        :param ssl.SSLContext context:
+            (Optional) SSL context used for HTTPS connections.
+        """
+        self.maxsize = maxsize
+        self.context = context
+        self.connections_created = 0
+        self.connections_reused = 0
+        self._idle: Dict[Tuple, List[http.client.HTTPConnection]] = {}
+        self._lock = threading.RLock()
+        self._opener = None
+        self.set_proxies(proxies)
+
+    def set_proxies(self, proxies: Optional[Dict[str, str]]) -> None:
+        """Route all further requests through the given proxies.
+
+        :param dict proxies:
+            A dict mapping protocol to proxy address, or None to use the
+            proxies configured in the environment.
+        """
+        self._opener = build_opener(
+            ProxyHandler(proxies),
+            _PooledHTTPHandler(self),
+            _PooledHTTPSHandler(self),
+        )
+        self.clear()
+
+    def urlopen(self, request: Request, timeout=socket._GLOBAL_DEFAULT_TIMEOUT):
+        """Open a request, reusing an idle connection to its host if possible.
+
+        Behaves like :func:`urllib.request.urlopen`, including redirect
+        handling and raising :class:`urllib.error.HTTPError` on error codes.
+        """
+        return self._opener.open(request, timeout=timeout)
+
+    def clear(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+    def do_open(self, http_class, req: Request, **http_conn_args):
+        """Send ``req`` over a pooled connection and return the response.
+
+        This mirrors :meth:`urllib.request.AbstractHTTPHandler.do_open`, but
+        asks for the connection to be kept alive instead of closing it.
+        """
+        host = req.host
+        if not host:
+            raise URLError('no host given')
+
+        headers = dict(req.unredirected_hdrs)
+        headers.update({k: v for k, v in req.headers.items() if k not in headers})
+        headers["Connection"] = "keep-alive"
+        headers = {name.title(): val for name, val in headers.items()}
+
+        tunnel_headers = {}
+        if req._tunnel_host:
+            proxy_auth_hdr = "Proxy-Authorization"
+            if proxy_auth_hdr in headers:
+                tunnel_headers[proxy_auth_hdr] = headers.pop(proxy_auth_hdr)
+
+        key = (http_class, host, req._tunnel_host, tuple(tunnel_headers.items()))
+        while True:
+            conn, reused = self._checkout(key, http_class, req, http_conn_args)
+            if req._tunnel_host and not reused:
+                conn.set_tunnel(req._tunnel_host, headers=tunnel_headers)
+            try:
+                try:
+                    conn.request(
+                        req.get_method(), req.selector, req.data, headers,
+                        encode_chunked=req.has_header('Transfer-encoding')
+                    )
+                except OSError as err:
+                    if reused and isinstance(err, _stale_connection_errors):
+                        raise
+                    raise URLError(err)
+                response = conn.getresponse()
+            except _stale_connection_errors:
+                conn.close()
+                if not reused:
+                    raise
+                # The server closed the idle connection, retry on a new one.
+                logger.debug("discarding stale connection to %s", host)
+                continue
+            except BaseException:
+                conn.close()
+                raise
+            break
+
+        response.url = req.get_full_url()
+        response.msg = response.reason
+        response._release = lambda reusable: self._release(key, conn, reusable)
+        if response.fp is None:
+            response._release(not response.will_close)
+        return response
+
+    def _checkout(self, key, http_class, req, http_conn_args):
+        timeout = req.timeout
+        if timeout is socket._GLOBAL_DEFAULT_TIMEOUT:
+            timeout = socket.getdefaulttimeout()
+
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+            if conn:
+                self.connections_reused += 1
+            else:
+                self.connections_created += 1
+
+        if conn:
+            conn.timeout = timeout
+            if conn.sock:
+                conn.sock.settimeout(timeout)
+            return conn, True
+
+        if http_class is http.client.HTTPSConnection:
+            http_conn_args.setdefault('context', self.context)
+        conn = http_class(key[1], timeout=timeout, **http_conn_args)
+        conn.response_class = _PooledResponse
+        return conn, False
+
+    def _release(self, key, conn, reusable: bool) -> None:
+        if reusable and conn.sock:
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self.maxsize:
+                    idle.append(conn)
+                    return
+        conn.close()
+
+
+class _PooledHTTPHandler(HTTPHandler):
+    def __init__(self, pool: ConnectionPool):
+        super().__init__()
+        self._pool = pool
+
+    def http_open(self, req):
+        return self._pool.do_open(http.client.HTTPConnection, req)
+
+
+class _PooledHTTPSHandler(HTTPSHandler):
+    def __init__(self, pool: ConnectionPool):
+        super().__init__()
+        self._pool = pool
+
+    def https_open(self, req):
+        return self._pool.do_open(http.client.HTTPSConnection, req)
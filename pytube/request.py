@@ -4,16 +4,44 @@ import json
 import logging
 import re
 import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
+from itertools import islice
 from urllib import parse
-from urllib.error import URLError
-from urllib.request import Request, urlopen
+from urllib.error import HTTPError
+from urllib.request import Request
 
+from pytube import bandwidth, coalesce, retry
 from pytube.exceptions import RegexMatchError, MaxRetriesExceeded
-from pytube.helpers import regex_search
+from pytube.pool import ConnectionPool
 
 logger = logging.getLogger(__name__)
+# Size of the first range of a download, adapted to the connection after that
 default_range_size = 9437184  # 9MB
+default_min_range_size = 1048576  # 1MB
+default_max_range_size = 67108864  # 64MB
+# Ranges grow until they take about this long at the observed throughput.
+range_target_seconds = 2
+default_chunk_size = 64 * 1024  # 64KB
+# Number of OTF segments fetched concurrently by seq_stream.
+default_segment_window = 8
+
+# Shared by every request pytube makes, so connections to a host are kept
+# alive and reused. Replace it to change the pool size or SSL context.
+default_pool = ConnectionPool()
+
+
+def urlopen(request, timeout=socket._GLOBAL_DEFAULT_TIMEOUT):
+    """Open a request over the keep-alive connections in ``default_pool``.
+
+    :param Request request:
+        The request to send.
+    :rtype: http.client.HTTPResponse
+    """
+    return default_pool.urlopen(request, timeout=timeout)
 
 
 def _execute_request(
@@ -37,24 +65,73 @@ def _execute_request(
     return urlopen(request, timeout=timeout)  # nosec
 
 
-def get(url, extra_headers=None, timeout=socket._GLOBAL_DEFAULT_TIMEOUT):
+def _fetch(
+    url,
+    method=None,
+    headers=None,
+    data=None,
+    timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
+    retry_policy=None,
+    shared=True
+):
+    """Send a request and read the whole response, retrying on failure.
+
+    Identical GET and POST requests made while this one is in flight share
+    its response, through :data:`pytube.coalesce.default_coalescer`.
+
+    :param RetryPolicy retry_policy:
+        (Optional) How to retry. Defaults to
+        :data:`pytube.retry.default_policy`.
+    :param bool shared:
+        (Optional) Whether the response may be shared with identical requests.
+    :rtype: bytes
+    """
+    def fetch():
+        response = _execute_request(
+            url, method=method, headers=headers, data=data, timeout=timeout
+        )
+        return response.read()
+    policy = retry.get_policy(retry_policy)
+    coalescer = coalesce.default_coalescer
+    key = coalesce.request_key(url, method, headers, data)
+    if coalescer is None or key is None or not shared:
+        return policy.call(fetch)
+    return coalescer.call(key, policy.call, fetch)
+
+
+def get(
+    url,
+    extra_headers=None,
+    timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
+    retry_policy=None
+):
     """Send an http GET request.
 
     :param str url:
         The URL to perform the GET request for.
     :param dict extra_headers:
         Extra headers to add to the request
+    :param RetryPolicy retry_policy:
+        (Optional) How to retry failed requests. Defaults to
+        :data:`pytube.retry.default_policy`.
     :rtype: str
     :returns:
         UTF-8 encoded string of response
     """
     if extra_headers is None:
         extra_headers = {}
-    response = _execute_request(url, headers=extra_headers, timeout=timeout)
-    return response.read().decode("utf-8")
+    return _fetch(
+        url, headers=extra_headers, timeout=timeout, retry_policy=retry_policy
+    ).decode("utf-8")
 
 
-def post(url, extra_headers=None, data=None, timeout=socket._GLOBAL_DEFAULT_TIMEOUT):
+def post(
+    url,
+    extra_headers=None,
+    data=None,
+    timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
+    retry_policy=None
+):
     """Send an http POST request.
 
     :param str url:
@@ -63,6 +140,9 @@ def post(url, extra_headers=None, data=None, timeout=socket._GLOBAL_DEFAULT_TIME
         Extra headers to add to the request
     :param dict data:
         The data to send on the POST request
+    :param RetryPolicy retry_policy:
+        (Optional) How to retry failed requests. Defaults to
+        :data:`pytube.retry.default_policy`.
     :rtype: str
     :returns:
         UTF-8 encoded string of response
@@ -76,194 +156,579 @@ def post(url, extra_headers=None, data=None, timeout=socket._GLOBAL_DEFAULT_TIME
     # required because the youtube servers are strict on content type
     # raises HTTPError [400]: Bad Request otherwise
     extra_headers.update({"Content-Type": "application/json"})
-    response = _execute_request(
+    return _fetch(
         url,
         headers=extra_headers,
         data=data,
-        timeout=timeout
-    )
-    return response.read().decode("utf-8")
+        timeout=timeout,
+        retry_policy=retry_policy
+    ).decode("utf-8")
 
 
 def seq_stream(
     url,
     timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
-    max_retries=0
+    max_retries=0,
+    flow=None,
+    retry_policy=None
 ):
     """Read the response in sequence.
     :param str url: The URL to perform the GET request for.
+    :param flow:
+        (Optional) The :class:`pytube.bandwidth.Flow` the download takes its
+        bandwidth from. Defaults to a new flow of the default scheduler.
+    :param RetryPolicy retry_policy:
+        (Optional) How to retry failed requests. Defaults to
+        :data:`pytube.retry.default_policy`, with ``max_retries`` retries.
     :rtype: Iterable[bytes]
     """
-    # YouTube expects a request sequence number as part of the parameters.
-    split_url = parse.urlsplit(url)
-    base_url = '%s://%s/%s?' % (split_url.scheme, split_url.netloc, split_url.path)
+    for _, chunk in seq_stream_segments(
+        url,
+        timeout=timeout,
+        max_retries=max_retries,
+        flow=flow,
+        retry_policy=retry_policy
+    ):
+        yield chunk
 
-    querys = dict(parse.parse_qsl(split_url.query))
 
+def seq_stream_segments(
+    url,
+    timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
+    max_retries=0,
+    start_segment=0,
+    flow=None,
+    retry_policy=None
+):
+    """Read the response in sequence, along with each chunk's segment number.
+
+    Up to ``default_segment_window`` segments are fetched concurrently, but
+    they are always yielded in sequence order.
+
+    :param str url: The URL to perform the GET request for.
+    :param int start_segment:
+        The first segment to yield. The header segment (0) is always
+        requested, since it says how many segments there are, but it is only
+        yielded when starting from 0.
+    :param flow:
+        (Optional) The :class:`pytube.bandwidth.Flow` the download takes its
+        bandwidth from, shared by all the segments.
+    :param RetryPolicy retry_policy:
+        (Optional) How to retry failed requests. Defaults to
+        :data:`pytube.retry.default_policy`, with ``max_retries`` retries.
+    :rtype: Iterable[Tuple[int, bytes]]
+    """
+    flow = flow or bandwidth.default_scheduler.flow()
+    policy = retry.get_policy(retry_policy, max_retries)
     # The 0th sequential request provides the file headers, which tell us
     #  information about how the file is segmented.
-    querys['sq'] = 0
-    url = base_url + parse.urlencode(querys)
-
-    segment_data = b''
-    for chunk in stream(url, timeout=timeout, max_retries=max_retries):
-        yield chunk
-        segment_data += chunk
+    header_chunks = []
+    for chunk in stream(
+        _sequence_url(url, 0), timeout=timeout, flow=flow, retry_policy=policy
+    ):
+        if start_segment == 0:
+            yield 0, chunk
+        header_chunks.append(chunk)
 
     # We can then parse the header to find the number of segments
-    stream_info = segment_data.split(b'\r\n')
-    segment_count_pattern = re.compile(b'Segment-Count: (\\d+)')
-    for line in stream_info:
-        match = segment_count_pattern.search(line)
-        if match:
-            segment_count = int(match.group(1).decode('utf-8'))
-
-    # We request these segments sequentially to build the file.
-    seq_num = 1
-    while seq_num <= segment_count:
-        # Create sequential request URL
-        querys['sq'] = seq_num
-        url = base_url + parse.urlencode(querys)
-
-        yield from stream(url, timeout=timeout, max_retries=max_retries)
-        seq_num += 1
+    segment_count = _segment_count(b''.join(header_chunks))
+
+    # We request the remaining segments concurrently, within a bounded
+    #  window, and yield them in order to build the file.
+    segments = iter(range(max(start_segment, 1), segment_count + 1))
+    window = max(1, default_segment_window)
+    executor = ThreadPoolExecutor(max_workers=window)
+
+    def submit(seq_num):
+        future = executor.submit(
+            _fetch_segment, _sequence_url(url, seq_num), timeout, policy, flow
+        )
+        return seq_num, future
+
+    pending = deque(submit(seq_num) for seq_num in islice(segments, window))
+    try:
+        while pending:
+            seq_num, future = pending.popleft()
+            data = future.result()
+            next_num = next(segments, None)
+            if next_num is not None:
+                pending.append(submit(next_num))
+            yield seq_num, data
+    finally:
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
     return  # pylint: disable=R1711
 
 
+def _fetch_segment(url, timeout, retry_policy, flow=None):
+    """Download a whole segment.
+
+    :func:`stream` retries the request, and resumes an interrupted read, as
+    the policy allows.
+
+    :rtype: bytes
+    """
+    segment = bytearray()
+    for chunk in stream(
+        url,
+        timeout=timeout,
+        reuse_buffer=True,
+        flow=flow,
+        retry_policy=retry_policy
+    ):
+        segment += chunk
+    return bytes(segment)
+
+
+class RangeSizer:
+    """Adapts the size of the ranges of one download to the connection.
+
+    Ranges grow (at most doubling) while they complete quickly, to make up
+    for the latency of each request, and are halved after a timeout or an
+    interrupted read, so less is requested again on a lossy connection.
+
+    One sizer can be shared by the threads downloading the ranges of a
+    stream over several connections.
+    """
+
+    def __init__(self, initial=None, minimum=None, maximum=None):
+        """Construct a :class:`RangeSizer <RangeSizer>`.
+
+        :param int initial:
+            (Optional) Size of the first range. Defaults to
+            ``default_range_size``.
+        :param int minimum:
+            (Optional) Smallest range size. Defaults to
+            ``default_min_range_size``.
+        :param int maximum:
+            (Optional) Largest range size. Defaults to
+            ``default_max_range_size``.
+        """
+        self.maximum = maximum or max(
+            default_max_range_size, default_range_size, minimum or 0
+        )
+        self.minimum = minimum or min(
+            default_min_range_size, default_range_size, self.maximum
+        )
+        if self.minimum > self.maximum:
+            raise ValueError("minimum range size is larger than the maximum")
+        self.size = self._bounded(initial or default_range_size)
+        # (requested, received, seconds, failed) of every range, in order
+        self.history = []
+        self._lock = threading.Lock()
+
+    def succeeded(self, received, seconds, requested=None):
+        """Record a range read to the end, and grow the next one.
+
+        :param int received:
+            Number of bytes read.
+        :param float seconds:
+            Time taken by the request and the read.
+        :param int requested:
+            (Optional) Number of bytes requested, if not the current size,
+            e.g. when several ranges are downloaded at the same time.
+        """
+        with self._lock:
+            requested = requested or self.size
+            self.history.append((requested, received, seconds, False))
+            # A short range was the end of the file, and says little about speed
+            if received >= requested:
+                goal = received / max(seconds, 1e-6) * range_target_seconds
+                self.size = max(self.size, self._bounded(min(goal, 2 * requested)))
+        logger.debug(
+            "range of %s bytes took %.2fs, next is %s bytes",
+            received, seconds, self.size
+        )
+
+    def failed(self, received, seconds, requested=None):
+        """Record a range interrupted by an error, and shrink the next one.
+
+        :param int received:
+            Number of bytes read before the error.
+        :param float seconds:
+            Time taken until the error.
+        :param int requested:
+            (Optional) Number of bytes requested, if not the current size.
+        """
+        with self._lock:
+            self.history.append((requested or self.size, received, seconds, True))
+            self.size = self._bounded(self.size // 2)
+        logger.debug(
+            "range failed after %s bytes, next is %s bytes", received, self.size
+        )
+
+    def _bounded(self, size):
+        return int(max(self.minimum, min(self.maximum, size)))
+
+
+# Errors while reading a range that are worth resuming after
+_range_errors = (http.client.IncompleteRead, ConnectionError, socket.timeout)
+
+
 def stream(
     url,
     timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
-    max_retries=0
+    max_retries=0,
+    filesize=None,
+    chunk_size=None,
+    reuse_buffer=False,
+    flow=None,
+    range_sizer=None,
+    retry_policy=None
 ):
     """Read the response in chunks.
+
+    A range interrupted by a timeout or a dropped connection is resumed from
+    the bytes already received, as many times as the retry policy allows.
+
     :param str url: The URL to perform the GET request for.
+    :param int filesize:
+        (Optional) Size of the file, if already known (e.g. from the
+        stream's ``contentLength``). Otherwise it is worked out from the
+        first response.
+    :param int chunk_size:
+        (Optional) Size of the chunks read, at most. Defaults to
+        ``default_chunk_size``.
+    :param bool reuse_buffer:
+        (Optional) Read every chunk into the same buffer, and yield views of
+        it instead of bytes. Each view is only valid until the next chunk is
+        read, so it must be consumed (or copied) before then.
+    :param flow:
+        (Optional) The :class:`pytube.bandwidth.Flow` the download takes its
+        bandwidth from. Defaults to a new flow of the default scheduler.
+    :param RangeSizer range_sizer:
+        (Optional) Sizes the ranges requested, and keeps their history.
+        Defaults to a new :class:`RangeSizer` with the default bounds.
+    :param RetryPolicy retry_policy:
+        (Optional) How to retry failed requests. Defaults to
+        :data:`pytube.retry.default_policy`, with ``max_retries`` retries.
     :rtype: Iterable[bytes]
     """
-    file_size: int = default_range_size  # fake filesize to start
+    flow = flow or bandwidth.default_scheduler.flow()
+    range_sizer = range_sizer or RangeSizer()
+    policy = retry.get_policy(retry_policy, max_retries)
+    buffer = bytearray(chunk_size or default_chunk_size)
+    file_size = filesize or None
     downloaded = 0
-    while downloaded < file_size:
-        stop_pos = min(downloaded + default_range_size, file_size) - 1
-        range_header = f"bytes={downloaded}-{stop_pos}"
-        tries = 0
-
-        # Attempt to make the request multiple times as necessary.
-        while True:
-            # If the max retries is exceeded, raise an exception
-            if tries >= 1 + max_retries:
-                raise MaxRetriesExceeded()
-
-            # Try to execute the request, ignoring socket timeouts
-            try:
-                response = _execute_request(
-                    url + f"&range={downloaded}-{stop_pos}",
-                    method="GET",
-                    timeout=timeout
-                )
-            except URLError as e:
-                # We only want to skip over timeout errors, and
-                # raise any other URLError exceptions
-                if isinstance(e.reason, socket.timeout):
-                    pass
-                else:
-                    raise
-            except http.client.IncompleteRead:
-                # Allow retries on IncompleteRead errors for unreliable connections
-                pass
-            else:
-                # On a successful request, break from loop
-                break
-            tries += 1
-
-        if file_size == default_range_size:
-            try:
-                resp = _execute_request(
-                    url + f"&range={0}-{99999999999}",
-                    method="GET",
-                    timeout=timeout
-                )
-                content_range = resp.info()["Content-Length"]
-                file_size = int(content_range)
-            except (KeyError, IndexError, ValueError) as e:
-                logger.error(e)
-        while True:
-            chunk = response.read()
-            if not chunk:
-                break
-            downloaded += len(chunk)
-            yield chunk
+    failures = 0
+    failing_since = None
+    while file_size is None or downloaded < file_size:
+        stop_pos = downloaded + range_sizer.size - 1
+        if file_size is not None:
+            stop_pos = min(stop_pos, file_size - 1)
+        started = time.monotonic()
+        response = _execute_range_request(
+            url, downloaded, stop_pos, timeout=timeout, retry_policy=policy
+        )
+        if downloaded == 0 or file_size is None:
+            file_size = _total_size(response, downloaded, stop_pos) or file_size
+
+        start = downloaded
+        try:
+            for chunk in _read_chunks(response, buffer, reuse_buffer, flow):
+                downloaded += len(chunk)
+                yield chunk
+        except _range_errors as e:
+            response.close()
+            range_sizer.failed(downloaded - start, time.monotonic() - started)
+            failures += 1
+            failing_since = failing_since or started
+            delay = policy.retry_delay(
+                e, failures, time.monotonic() - failing_since
+            )
+            if delay is None:
+                raise
+            # Carry on from the bytes already received
+            logger.debug(
+                "resuming %s at byte %s in %.2fs after %r", url, downloaded, delay, e
+            )
+            time.sleep(delay)
+            continue
+        range_sizer.succeeded(downloaded - start, time.monotonic() - started)
+        failures = 0
+        failing_since = None
+        if downloaded == start:
+            # Nothing left to read past the end of the file.
+            break
     return  # pylint: disable=R1711
 
 
+def _total_size(response, start, stop):
+    """Work out the size of the whole file from a ranged response.
+
+    Uses the total in a ``Content-Range`` header when the server sends one.
+    Otherwise, a body shorter than the requested range means the range ran
+    past the end of the file.
+
+    :rtype: Optional[int]
+    """
+    headers = response.info()
+    try:
+        content_range = headers.get("Content-Range")
+        if content_range:
+            total = content_range.rpartition("/")[2]
+            if total != "*":
+                return int(total)
+        content_length = headers.get("Content-Length")
+        if content_length is not None:
+            content_length = int(content_length)
+            if content_length < stop - start + 1:
+                return start + content_length
+    except (AttributeError, TypeError, ValueError) as e:
+        logger.debug("unable to read file size from response: %s", e)
+    return None
+
+
+def stream_range(
+    url,
+    start,
+    stop,
+    timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
+    max_retries=0,
+    chunk_size=None,
+    reuse_buffer=False,
+    flow=None,
+    retry_policy=None,
+    range_sizer=None
+):
+    """Read a single byte range of the response in chunks.
+
+    If the range is interrupted, the rest of it is requested again as
+    :func:`stream` does.
+
+    :param str url: The URL to perform the GET request for.
+    :param int start: Position of the first byte to read.
+    :param int stop: Position of the last byte to read (inclusive).
+    :param int chunk_size:
+        (Optional) Size of the chunks read, at most. Defaults to
+        ``default_chunk_size``.
+    :param bool reuse_buffer:
+        (Optional) Yield views of a single reused buffer instead of bytes,
+        as in :func:`stream`.
+    :param flow:
+        (Optional) The :class:`pytube.bandwidth.Flow` the download takes its
+        bandwidth from. Defaults to a new flow of the default scheduler.
+    :param RetryPolicy retry_policy:
+        (Optional) How to retry failed requests. Defaults to
+        :data:`pytube.retry.default_policy`, with ``max_retries`` retries.
+    :param RangeSizer range_sizer:
+        (Optional) Told how each request for the range went, e.g. to size
+        the next ranges of the same stream.
+    :rtype: Iterable[bytes]
+    """
+    flow = flow or bandwidth.default_scheduler.flow()
+    policy = retry.get_policy(retry_policy, max_retries)
+    buffer = bytearray(min(chunk_size or default_chunk_size, stop - start + 1))
+    position = start
+    failures = 0
+    started = time.monotonic()
+    while True:
+        request_start = position
+        request_started = time.monotonic()
+        response = _execute_range_request(
+            url, position, stop, timeout=timeout, retry_policy=policy
+        )
+        try:
+            for chunk in _read_chunks(response, buffer, reuse_buffer, flow):
+                position += len(chunk)
+                yield chunk
+        except _range_errors as e:
+            response.close()
+            if range_sizer is not None:
+                range_sizer.failed(
+                    position - request_start,
+                    time.monotonic() - request_started,
+                    requested=stop - request_start + 1,
+                )
+            failures += 1
+            delay = policy.retry_delay(e, failures, time.monotonic() - started)
+            if delay is None:
+                raise
+            logger.debug(
+                "resuming %s at byte %s in %.2fs after %r", url, position, delay, e
+            )
+            time.sleep(delay)
+            continue
+        if range_sizer is not None:
+            range_sizer.succeeded(
+                position - request_start,
+                time.monotonic() - request_started,
+                requested=stop - request_start + 1,
+            )
+        return
+
+
+def _read_chunks(response, buffer, reuse_buffer, flow):
+    """Read the body of a response into a buffer, one chunk at a time.
+
+    :param bytearray buffer:
+        The buffer chunks are read into, which also sets their size.
+    :param bool reuse_buffer:
+        Whether to yield views of the buffer, rather than copies.
+    :param flow:
+        The :class:`pytube.bandwidth.Flow` to take the bandwidth from.
+    :rtype: Iterable[bytes]
+    """
+    view = memoryview(buffer)
+    while True:
+        size = response.readinto(buffer)
+        if not size:
+            break
+        flow.acquire(size)
+        yield view[:size] if reuse_buffer else bytes(view[:size])
+
+
+def _execute_range_request(url, start, stop, timeout, retry_policy):
+    """Request the bytes between start and stop, retrying as the policy allows.
+
+    :raises MaxRetriesExceeded:
+        If the request still times out, or its connection drops, once out
+        of retries. Error statuses are raised as they are.
+    """
+    try:
+        return retry_policy.call(
+            _execute_request,
+            url + f"&range={start}-{stop}",
+            method="GET",
+            timeout=timeout
+        )
+    except Exception as e:
+        if isinstance(e, HTTPError) or not retry_policy.is_retryable(e):
+            raise
+        raise MaxRetriesExceeded() from e
+
+
 @lru_cache()
-def filesize(url):
+def filesize(url, retry_policy=None):
     """Fetch size in bytes of file at given URL
 
     :param str url: The URL to get the size of
+    :param RetryPolicy retry_policy:
+        (Optional) How to retry failed requests. Defaults to
+        :data:`pytube.retry.default_policy`.
     :returns: int: size in bytes of remote file
     """
-    return int(head(url)["content-length"])
+    return int(head(url, retry_policy=retry_policy)["content-length"])
 
 
 @lru_cache()
-def seq_filesize(url):
+def seq_filesize(url, estimate=False, sample_size=10, retry_policy=None):
     """Fetch size in bytes of file at given URL from sequential requests
 
     :param str url: The URL to get the size of
+    :param bool estimate:
+        (Optional) Extrapolate the size from a sample of the segments instead
+        of requesting every one of them. Good enough for progress bars.
+    :param int sample_size:
+        (Optional) Number of segments to sample when estimating.
+    :param RetryPolicy retry_policy:
+        (Optional) How to retry failed requests. Defaults to
+        :data:`pytube.retry.default_policy`.
     :returns: int: size in bytes of remote file
     """
-    total_filesize = 0
-    # YouTube expects a request sequence number as part of the parameters.
-    split_url = parse.urlsplit(url)
-    base_url = '%s://%s/%s?' % (split_url.scheme, split_url.netloc, split_url.path)
-    querys = dict(parse.parse_qsl(split_url.query))
-
     # The 0th sequential request provides the file headers, which tell us
     #  information about how the file is segmented.
-    querys['sq'] = 0
-    url = base_url + parse.urlencode(querys)
-    response = _execute_request(
-        url, method="GET"
+    response_value = _fetch(
+        _sequence_url(url, 0), method="GET", retry_policy=retry_policy
     )
-
-    response_value = response.read()
     # The file header must be added to the total filesize
-    total_filesize += len(response_value)
+    total_filesize = len(response_value)
 
     # We can then parse the header to find the number of segments
-    segment_count = 0
-    stream_info = response_value.split(b'\r\n')
-    segment_regex = b'Segment-Count: (\\d+)'
-    for line in stream_info:
-        # One of the lines should contain the segment count, but we don't know
-        #  which, so we need to iterate through the lines to find it
-        try:
-            segment_count = int(regex_search(segment_regex, line, 1))
-        except RegexMatchError:
-            pass
-
+    segment_count = _segment_count(response_value)
     if segment_count == 0:
-        raise RegexMatchError('seq_filesize', segment_regex)
+        raise RegexMatchError('seq_filesize', _segment_count_pattern.pattern)
+
+    segments = _probed_segments(segment_count, estimate, sample_size)
+
+    def segment_size(seq_num):
+        return int(head(
+            _sequence_url(url, seq_num), retry_policy=retry_policy
+        )['content-length'])
+
+    # We make HEAD requests to the segments concurrently to find the total
+    #  filesize.
+    window = max(1, default_segment_window)
+    with ThreadPoolExecutor(max_workers=window) as executor:
+        sizes = dict(zip(segments, executor.map(segment_size, segments)))
+    return total_filesize + _total_segment_size(sizes, segment_count)
+
+
+def _sequence_url(url, seq_num):
+    """Return the url of an OTF stream's segment.
+
+    YouTube expects a request sequence number as part of the parameters.
+    """
+    split_url = parse.urlsplit(url)
+    base_url = '%s://%s%s?' % (split_url.scheme, split_url.netloc, split_url.path)
+    querys = dict(parse.parse_qsl(split_url.query))
+    querys['sq'] = seq_num
+    return base_url + parse.urlencode(querys)
+
+
+_segment_count_pattern = re.compile(b'Segment-Count: (\\d+)')
 
-    # We make HEAD requests to the segments sequentially to find the total filesize.
-    seq_num = 1
-    while seq_num <= segment_count:
-        # Create sequential request URL
-        querys['sq'] = seq_num
-        url = base_url + parse.urlencode(querys)
 
-        total_filesize += int(head(url)['content-length'])
-        seq_num += 1
-    return total_filesize
+def _segment_count(header):
+    """Read the number of segments from an OTF stream's header segment.
+
+    :param bytes header: The contents of segment 0.
+    :rtype: int
+    :returns: The number of segments, or 0 if the header doesn't say.
+    """
+    match = _segment_count_pattern.search(header)
+    return int(match.group(1)) if match else 0
+
+
+def _probed_segments(segment_count, estimate, sample_size):
+    """List the segments whose size is needed to work out the file size.
+
+    When estimating, only evenly spaced segments are probed, always including
+    the last one since it is usually shorter than the rest.
+
+    :rtype: List[int]
+    """
+    sample_size = max(2, sample_size)
+    if not estimate or segment_count <= sample_size:
+        return list(range(1, segment_count + 1))
+    step = (segment_count - 1) / (sample_size - 1)
+    return sorted({1 + round(i * step) for i in range(sample_size)})
+
+
+def _total_segment_size(sizes, segment_count):
+    """Add up (or extrapolate, if only a sample is known) the segment sizes.
+
+    :param dict sizes: Maps segment numbers to their size in bytes.
+    :param int segment_count: The number of segments in the file.
+    :rtype: int
+    """
+    if len(sizes) == segment_count:
+        return sum(sizes.values())
+
+    sizes = dict(sizes)
+    last_size = sizes.pop(segment_count)
+    average_size = sum(sizes.values()) / len(sizes)
+    return round(average_size * (segment_count - 1)) + last_size
 
 
-def head(url):
+def head(url, retry_policy=None):
     """Fetch headers returned http GET request.
 
     :param str url:
         The URL to perform the GET request for.
+    :param RetryPolicy retry_policy:
+        (Optional) How to retry failed requests. Defaults to
+        :data:`pytube.retry.default_policy`.
     :rtype: dict
     :returns:
         dictionary of lowercase headers
     """
-    response_headers = _execute_request(url, method="HEAD").info()
+    def fetch():
+        response = _execute_request(url, method="HEAD")
+        response_headers = response.info()
+        # Closing the response returns its connection to the pool.
+        response.close()
+        return response_headers
+    response_headers = retry.get_policy(retry_policy).call(fetch)
     return {k.lower(): v for k, v in response_headers.items()}
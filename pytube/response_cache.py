@@ -0,0 +1,249 @@
+"""Caches of innertube API responses.
+
+Set :data:`default_cache` to a :class:`ResponseCache` to have
+:class:`pytube.innertube.InnerTube` reuse the responses of the ``player``,
+``search`` and ``browse`` endpoints. Two backends are available:
+:class:`MemoryResponseCache`, a bounded LRU cache for one process, and
+:class:`SQLiteResponseCache`, which keeps responses in a file that several
+processes can share.
+
+Responses are kept for :attr:`ResponseCache.ttl` seconds, but player
+responses are never kept past the ``expire`` time of their stream urls.
+"""
+import abc
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+logger = logging.getLogger(__name__)
+
+default_ttl = 300  # 5 minutes
+# Time left to use the stream urls of a cached player response
+expiry_margin = 60
+
+# Endpoints whose responses are cached
+cached_endpoints = ('player', 'search', 'browse')
+
+
+class ResponseCache(abc.ABC):
+    """Interface of the innertube response caches, with hit and miss counters."""
+
+    def __init__(self, ttl: float = default_ttl):
+        """Construct a :class:`ResponseCache <ResponseCache>`.
+
+        :param float ttl:
+            Seconds a response is kept for, at most.
+        """
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response body for a key, if it hasn't expired.
+
+        :param str key:
+            Key returned by :func:`cache_key`.
+        :rtype: str
+        """
+        body = self._get(key, time.time())
+        with self._counter_lock:
+            if body is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return body
+
+    def set(self, key: str, body: str, ttl: float) -> None:
+        """Cache a response body.
+
+        :param str key:
+            Key returned by :func:`cache_key`.
+        :param str body:
+            The response body.
+        :param float ttl:
+            Seconds to keep the response for.
+        """
+        if ttl > 0:
+            self._set(key, body, time.time() + ttl)
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """Remove every cached response."""
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Number of cache hits and misses so far.
+
+        :rtype: dict
+        """
+        return {"hits": self.hits, "misses": self.misses}
+
+    @abc.abstractmethod
+    def _get(self, key: str, now: float) -> Optional[str]:
+        """Return the response body for a key, unless it expired before now."""
+
+    @abc.abstractmethod
+    def _set(self, key: str, body: str, expires: float) -> None:
+        """Store a response body until the given time."""
+
+
+class MemoryResponseCache(ResponseCache):
+    """LRU cache of responses, in memory."""
+
+    def __init__(self, maxsize: int = 256, ttl: float = default_ttl):
+        """Construct a :class:`MemoryResponseCache <MemoryResponseCache>`.
+
+        :param int maxsize:
+            Number of responses kept, at most.
+        :param float ttl:
+            Seconds a response is kept for, at most.
+        """
+        super().__init__(ttl=ttl)
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: str, now: float) -> Optional[str]:
+        with self._lock:
+            entry: Optional[Tuple[str, float]] = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def _set(self, key: str, body: str, expires: float) -> None:
+        with self._lock:
+            self._entries[key] = (body, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+class SQLiteResponseCache(ResponseCache):
+    """Cache of responses in an SQLite database, shareable between processes."""
+
+    def __init__(self, path: str, ttl: float = default_ttl):
+        """Construct a :class:`SQLiteResponseCache <SQLiteResponseCache>`.
+
+        :param str path:
+            Path of the database file, created if needed.
+        :param float ttl:
+            Seconds a response is kept for, at most.
+        """
+        super().__init__(ttl=ttl)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, body TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+    def purge(self) -> None:
+        """Remove the expired responses from the database."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM responses WHERE expires <= ?", (time.time(),)
+            )
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._connection.close()
+
+    def _get(self, key: str, now: float) -> Optional[str]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body FROM responses WHERE key = ? AND expires > ?",
+                (key, now)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, body: str, expires: float) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, body, expires) "
+                "VALUES (?, ?, ?)",
+                (key, body, expires)
+            )
+
+
+def cache_key(endpoint: str, query: Dict, data: Dict) -> str:
+    """Build the cache key of an innertube request.
+
+    The request data includes the client context, so the key covers the
+    client, the endpoint and the payload.
+
+    :param str endpoint:
+        Url of the endpoint.
+    :param dict query:
+        Query parameters of the request.
+    :param dict data:
+        Body of the request.
+    :rtype: str
+    """
+    request = json.dumps([endpoint, query, data], sort_keys=True)
+    return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+
+def response_ttl(response: Dict, ttl: float) -> float:
+    """Return how long a response can be cached for.
+
+    Player responses are only kept while their stream urls remain usable for
+    at least :data:`expiry_margin` seconds.
+
+    :param dict response:
+        The decoded response.
+    :param float ttl:
+        Seconds to keep the response for, at most.
+    :rtype: float
+    """
+    streaming_data = response.get("streamingData")
+    if not streaming_data:
+        return ttl
+
+    expires_in = streaming_data.get("expiresInSeconds")
+    if expires_in:
+        ttl = min(ttl, int(expires_in) - expiry_margin)
+
+    now = time.time()
+    formats = (
+        streaming_data.get("formats", [])
+        + streaming_data.get("adaptiveFormats", [])
+    )
+    for fmt in formats:
+        url = fmt.get("url")
+        if url is None and "signatureCipher" in fmt:
+            url = parse_qs(fmt["signatureCipher"]).get("url", [""])[0]
+        expire = parse_qs(urlparse(url or "").query).get("expire")
+        if expire:
+            try:
+                ttl = min(ttl, int(expire[0]) - now - expiry_margin)
+            except ValueError:
+                continue
+    return ttl
+
+
+default_cache: Optional[ResponseCache] = None
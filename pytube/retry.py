@@ -0,0 +1,207 @@
+"""Deciding whether, and when, failed requests are retried.
+
+A :class:`RetryPolicy` classifies errors into transient ones (timeouts,
+dropped connections, and statuses such as 429 or 503) and the rest, and
+spaces out the retries with exponential backoff and random jitter, so that
+many clients failing at once don't all come back at the same moment.
+``Retry-After`` headers are honoured.
+
+Every request made by :mod:`pytube.request`, :mod:`pytube.aio.request` and
+the innertube clients follows :data:`default_policy`, unless given another
+policy. Replace it to change how pytube retries::
+
+    from pytube import retry
+    retry.default_policy = retry.RetryPolicy(max_retries=5, max_elapsed=300)
+"""
+import asyncio
+import copy
+import email.utils
+import http.client
+import logging
+import random
+import socket
+import time
+from typing import Awaitable, Callable, FrozenSet, Optional, TypeVar
+from urllib.error import HTTPError, URLError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Statuses meaning the server is overloaded or briefly unavailable
+retryable_statuses = frozenset({408, 429, 500, 502, 503, 504})
+
+# Errors of a connection rather than of the request itself
+_transient_errors = (
+    http.client.HTTPException,
+    ConnectionError,
+    socket.timeout,
+    asyncio.TimeoutError,
+)
+
+
+class RetryPolicy:
+    """How many times, and after how long, failed requests are retried."""
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        max_elapsed: Optional[float] = 120.0,
+        retry_statuses: FrozenSet[int] = retryable_statuses,
+        jitter: bool = True,
+    ):
+        """Construct a :class:`RetryPolicy <RetryPolicy>`.
+
+        :param int max_retries:
+            (Optional) Number of retries after the first attempt.
+        :param float backoff:
+            (Optional) Seconds to wait before the first retry, doubled for
+            each retry after that.
+        :param float max_backoff:
+            (Optional) Longest wait between two attempts, in seconds, unless
+            the server asks for longer with ``Retry-After``.
+        :param float max_elapsed:
+            (Optional) Seconds after the first failure past which no more
+            retries are made. None for no limit.
+        :param retry_statuses:
+            (Optional) HTTP statuses worth retrying.
+        :param bool jitter:
+            (Optional) Wait a random time up to the backoff ("full jitter"),
+            rather than exactly the backoff.
+        """
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_elapsed = max_elapsed
+        self.retry_statuses = frozenset(retry_statuses)
+        self.jitter = jitter
+
+    def replace(self, **changes) -> "RetryPolicy":
+        """Return a copy of the policy with some settings changed.
+
+        :rtype: RetryPolicy
+        """
+        policy = copy.copy(self)
+        for name, value in changes.items():
+            if not hasattr(policy, name):
+                raise TypeError(f"unknown retry setting: {name}")
+            setattr(policy, name, value)
+        return policy
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """Whether an error is transient, and the request worth retrying.
+
+        :rtype: bool
+        """
+        if isinstance(error, HTTPError):
+            return error.code in self.retry_statuses
+        if isinstance(error, URLError):
+            return isinstance(error.reason, _transient_errors)
+        return isinstance(error, _transient_errors)
+
+    def retry_delay(
+        self, error: BaseException, attempt: int, elapsed: float = 0
+    ) -> Optional[float]:
+        """Work out how long to wait before retrying after an error.
+
+        :param error:
+            The error of the failed attempt.
+        :param int attempt:
+            Number of the retry about to be made, from 1.
+        :param float elapsed:
+            Seconds since the first failure.
+        :rtype: float
+        :returns:
+            Seconds to wait, or None if the error should be raised instead.
+        """
+        if attempt > self.max_retries or not self.is_retryable(error):
+            return None
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)  # nosec
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if self.max_elapsed is not None and elapsed + delay > self.max_elapsed:
+            return None
+        return delay
+
+    def call(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Call a function, retrying as the policy allows when it fails.
+
+        :rtype: The return type of ``func``.
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                attempt += 1
+                delay = self.retry_delay(e, attempt, time.monotonic() - started)
+                if delay is None:
+                    raise
+                logger.debug("retry %s in %.2fs after %r", attempt, delay, e)
+                time.sleep(delay)
+
+    async def call_async(self, func: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        """Await a coroutine function, retrying as the policy allows.
+
+        :rtype: The return type of ``func``.
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                attempt += 1
+                delay = self.retry_delay(e, attempt, time.monotonic() - started)
+                if delay is None:
+                    raise
+                logger.debug("retry %s in %.2fs after %r", attempt, delay, e)
+                await asyncio.sleep(delay)
+
+
+def get_policy(
+    retry_policy: Optional[RetryPolicy] = None, max_retries: Optional[int] = None
+) -> RetryPolicy:
+    """Pick the policy of a request.
+
+    :param RetryPolicy retry_policy:
+        (Optional) The policy given by the caller, used as is.
+    :param int max_retries:
+        (Optional) Number of retries given by the caller, which overrides
+        the one of :data:`default_policy`.
+    :rtype: RetryPolicy
+    """
+    if retry_policy is not None:
+        return retry_policy
+    if max_retries is None:
+        return default_policy
+    return default_policy.replace(max_retries=max_retries)
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Read the seconds to wait from the ``Retry-After`` header of an error.
+
+    :rtype: float
+    """
+    headers = getattr(error, "headers", None)
+    value = headers.get("Retry-After") if headers is not None else None
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        logger.debug("ignoring invalid Retry-After: %s", value)
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+default_policy = RetryPolicy()
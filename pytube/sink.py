@@ -0,0 +1,202 @@
+"""Writing downloaded media to disk without holding up the network.
+
+:class:`WriteBehindSink` copies each chunk it is given into one of a ring
+of buffers, and a background thread writes the buffers to the file at their
+offsets. Reading from the network only waits for the disk once every buffer
+of the ring is waiting to be written. Buffers are only allocated when all
+the existing ones are in use, so a disk that keeps up costs a buffer or two.
+"""
+import logging
+import os
+import queue
+import threading
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+default_buffer_size = 64 * 1024  # 64KB
+default_buffer_count = 32
+
+
+def preallocate(fd: int, size: int) -> None:
+    """Reserve the disk space of a file, and set its size.
+
+    Uses ``posix_fallocate`` where the platform and file system support it,
+    so that the file is laid out in one piece and running out of space fails
+    early. Otherwise, the file is only extended.
+
+    :param int fd:
+        File descriptor of the file.
+    :param int size:
+        Size of the file in bytes.
+    """
+    if size <= 0:
+        return
+    fallocate = getattr(os, "posix_fallocate", None)
+    if fallocate is not None:
+        try:
+            fallocate(fd, 0, size)
+        except OSError as e:
+            logger.debug("could not preallocate %s bytes: %r", size, e)
+    if os.fstat(fd).st_size != size:
+        os.ftruncate(fd, size)
+
+
+def pwrite(fd: int, data: bytes, offset: int) -> None:
+    """Write all of ``data`` to the file descriptor at the given offset."""
+    view = memoryview(data)
+    while view:
+        written = _pwrite_some(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+if hasattr(os, "pwrite"):
+    _pwrite_some = os.pwrite
+else:  # pragma: no cover
+    # Windows has no positional write, so seek and write under a lock instead
+    _seek_lock = threading.Lock()
+
+    def _pwrite_some(fd: int, data: bytes, offset: int) -> int:
+        with _seek_lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            return os.write(fd, data)
+
+
+class WriteBehindSink:
+    """Writes data to a file at given offsets from a background thread.
+
+    Use as a context manager: leaving it waits for every write to complete,
+    and raises the error of the first write that failed, if any.
+    """
+
+    def __init__(
+        self,
+        fd: int,
+        buffer_size: int = default_buffer_size,
+        buffer_count: int = default_buffer_count
+    ):
+        """Construct a :class:`WriteBehindSink <WriteBehindSink>`.
+
+        :param int fd:
+            File descriptor of the file written to.
+        :param int buffer_size:
+            Size of each buffer of the ring, in bytes.
+        :param int buffer_count:
+            Number of buffers in the ring.
+        """
+        self.fd = fd
+        self.buffer_size = buffer_size
+        self._free: queue.Queue = queue.Queue()
+        # Buffers that may still be allocated
+        self._unallocated = buffer_count
+        self._allocate_lock = threading.Lock()
+        self._pending: queue.Queue = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(
+            target=self._write_pending, name="pytube-sink", daemon=True
+        )
+        self._thread.start()
+        self._closed = False
+
+    def __enter__(self) -> "WriteBehindSink":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        # Don't hide the error that stopped the download, if any
+        self.close(raise_error=exc_type is None)
+
+    def write(
+        self,
+        data: bytes,
+        offset: int,
+        on_written: Optional[Callable[[int, int], None]] = None
+    ) -> None:
+        """Queue data to be written at the given offset.
+
+        The data is copied, so the caller may reuse it as soon as this
+        returns. Blocks while every buffer is waiting to be written.
+
+        :param bytes data:
+            The data to write.
+        :param int offset:
+            Position in the file of the first byte of ``data``.
+        :param func on_written:
+            (Optional) Called from the writer thread with the positions of
+            the first and last bytes (inclusive) of each piece of ``data``
+            once it is written, e.g. :meth:`DownloadJournal.record`.
+        """
+        view = memoryview(data)
+        position = 0
+        while position < len(view):
+            self._raise_error()
+            buffer = self._free_buffer()
+            length = min(len(buffer), len(view) - position)
+            buffer[:length] = view[position:position + length]
+            self._pending.put((buffer, length, offset + position, on_written))
+            position += length
+
+    def would_block(self, size: int) -> bool:
+        """Whether queuing ``size`` bytes now would wait for a free buffer.
+
+        Buffers are only taken by the thread queuing writes, so the answer
+        holds until that thread queues more.
+
+        :param int size:
+            Number of bytes to write.
+        :rtype: bool
+        """
+        needed = -(-size // self.buffer_size)
+        return needed > self._free.qsize() + self._unallocated
+
+    def flush(self) -> None:
+        """Wait for every queued write to complete."""
+        self._pending.join()
+        self._raise_error()
+
+    def close(self, raise_error: bool = True) -> None:
+        """Complete the queued writes and stop the writer thread.
+
+        :param bool raise_error:
+            Whether to raise the error of a failed write, if any.
+        """
+        if not self._closed:
+            self._closed = True
+            self._pending.put(None)
+            self._thread.join()
+        if raise_error:
+            self._raise_error()
+
+    def _free_buffer(self) -> bytearray:
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            pass
+        with self._allocate_lock:
+            if self._unallocated:
+                self._unallocated -= 1
+                return bytearray(self.buffer_size)
+        return self._free.get()
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _write_pending(self) -> None:
+        while True:
+            item = self._pending.get()
+            if item is None:
+                self._pending.task_done()
+                return
+            buffer, length, offset, on_written = item
+            try:
+                # After a failure, the remaining writes are dropped
+                if self._error is None:
+                    pwrite(self.fd, memoryview(buffer)[:length], offset)
+                    if on_written is not None:
+                        on_written(offset, offset + length - 1)
+            except BaseException as e:
+                self._error = e
+            finally:
+                self._free.put(buffer)
+                self._pending.task_done()
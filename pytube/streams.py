@@ -8,6 +8,9 @@ separately).
 """
 import logging
 import os
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from math import ceil
 
 from datetime import datetime
@@ -15,10 +18,13 @@ from typing import BinaryIO, Dict, Optional, Tuple
 from urllib.error import HTTPError
 from urllib.parse import parse_qs
 
-from pytube import extract, request
+from pytube import bandwidth, extract, request
+from pytube.bandwidth import Flow
 from pytube.helpers import safe_filename, target_directory
 from pytube.itags import get_format_profile
+from pytube.journal import DownloadJournal, fingerprint
 from pytube.monostate import Monostate
+from pytube.sink import WriteBehindSink, preallocate
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +32,9 @@ logger = logging.getLogger(__name__)
 class Stream:
     """Container for stream manifest data."""
 
+    # Seconds before its expiration at which a stream url is refreshed
+    url_refresh_margin = 60
+
     def __init__(
         self, stream: Dict, monostate: Monostate
     ):
@@ -226,7 +235,9 @@ class Stream:
     def filesize_approx(self) -> int:
         """Get approximate filesize of the video
 
-        Falls back to HTTP call if there is not sufficient information to approximate
+        Falls back to HTTP call if there is not sufficient information to
+        approximate. For segmented streams, the size is then extrapolated from
+        a sample of the segments.
 
         :rtype: int
         :returns: size of video in bytes
@@ -237,13 +248,50 @@ class Stream:
                 (self._monostate.duration * self.bitrate) / bits_in_byte
             )
 
-        return self.filesize
+        if self._filesize == 0:
+            try:
+                self._filesize = request.filesize(self.url)
+            except HTTPError as e:
+                if e.code != 404:
+                    raise
+                return request.seq_filesize(self.url, estimate=True)
+        return self._filesize
 
     @property
     def expiration(self) -> datetime:
         expire = parse_qs(self.url.split("?")[1])["expire"][0]
         return datetime.utcfromtimestamp(int(expire))
 
+    def expires_within(self, seconds: float) -> bool:
+        """Whether the stream url expires in less than the given time.
+
+        :param float seconds:
+            Time from now, in seconds.
+        :rtype: bool
+        """
+        expire = parse_qs(self.url.split("?")[-1]).get("expire")
+        if not expire:
+            return False
+        return int(expire[0]) - time.time() < seconds
+
+    def refresh_url(self) -> bool:
+        """Replace the stream url with a newly signed one.
+
+        The video info is fetched again, and only the url of this stream is
+        deciphered.
+
+        :rtype: bool
+        :returns:
+            Whether a new url was obtained.
+        """
+        refresh = self._monostate.refresh_url
+        url = refresh(self.itag) if refresh else None
+        if url is None:
+            return False
+        logger.debug(f'refreshed the url of itag {self.itag}')
+        self.url = url
+        return True
+
     @property
     def default_filename(self) -> str:
         """Generate filename based on the video title.
@@ -262,10 +310,18 @@ class Stream:
         filename_prefix: Optional[str] = None,
         skip_existing: bool = True,
         timeout: Optional[int] = None,
-        max_retries: Optional[int] = 0
+        max_retries: Optional[int] = 0,
+        connections: int = 1,
+        priority: int = 0,
+        weight: float = 1,
+        range_sizer: Optional[request.RangeSizer] = None
     ) -> str:
         """Write the media stream to disk.
 
+        The stream is first written to a ``.part`` file, which is renamed once
+        the download is complete. If a download is interrupted, downloading
+        the same stream to the same path again resumes where it stopped.
+
         :param output_path:
             (optional) Output path for writing media file. If one is not
             specified, defaults to the current working directory.
@@ -290,6 +346,24 @@ class Stream:
         :param max_retries:
             (optional) Number of retries to attempt after socket timeout. Defaults to 0.
         :type max_retries: int
+        :param connections:
+            (optional) Number of byte ranges to download concurrently, each
+            over its own connection. Defaults to 1.
+        :type connections: int
+        :param priority:
+            (optional) Priority of the download in the bandwidth shared with
+            other downloads, see :mod:`pytube.bandwidth`. Defaults to 0.
+        :type priority: int
+        :param weight:
+            (optional) Share of the bandwidth relative to the other downloads
+            of the same priority. Defaults to 1.
+        :type weight: float
+        :param range_sizer:
+            (optional) Sizes the byte ranges requested, adapting them to the
+            connection. Pass a :class:`pytube.request.RangeSizer` to set its
+            bounds, or to read the sizes chosen from its ``history``.
+            Defaults to one with the default bounds.
+        :type range_sizer: pytube.request.RangeSizer
         :returns:
             Path to the saved video
         :rtype: str
@@ -306,35 +380,276 @@ class Stream:
             self.on_complete(file_path)
             return file_path
 
-        bytes_remaining = self.filesize
+        if self.expires_within(self.url_refresh_margin):
+            self.refresh_url()
+
         logger.debug(f'downloading ({self.filesize} total bytes) file to {file_path}')
 
-        with open(file_path, "wb") as fh:
+        # Data is written to a .part file, alongside a journal of what has
+        # been written so far, so that an interrupted download can resume.
+        part_path = f"{file_path}.part"
+        journal = DownloadJournal.load(
+            f"{part_path}.json",
+            fingerprint=fingerprint(self.url),
+            itag=self.itag,
+            filesize=self.filesize,
+        )
+        if not os.path.isfile(part_path):
+            journal.reset()
+        if journal.ranges:
+            logger.debug(
+                f'resuming download with {journal.bytes_completed} bytes complete'
+            )
+
+        flow = bandwidth.default_scheduler.flow(weight=weight, priority=priority)
+        range_sizer = range_sizer or request.RangeSizer()
+        with open(part_path, "r+b" if journal.ranges else "wb") as fh:
             try:
-                for chunk in request.stream(
-                    self.url,
-                    timeout=timeout,
-                    max_retries=max_retries
-                ):
-                    # reduce the (bytes) remainder by the length of the chunk.
-                    bytes_remaining -= len(chunk)
-                    # send to the on_progress callback.
-                    self.on_progress(chunk, fh, bytes_remaining)
+                try:
+                    self._download_missing(
+                        fh,
+                        journal,
+                        connections=connections,
+                        timeout=timeout,
+                        max_retries=max_retries,
+                        flow=flow,
+                        range_sizer=range_sizer
+                    )
+                except HTTPError as e:
+                    # The url expired during the download: carry on from
+                    # where it stopped with a new one
+                    if e.code != 403 or not self.refresh_url():
+                        raise
+                    self._download_missing(
+                        fh,
+                        journal,
+                        connections=connections,
+                        timeout=timeout,
+                        max_retries=max_retries,
+                        flow=flow,
+                        range_sizer=range_sizer
+                    )
+            except BaseException:
+                journal.save(flush=fh.flush)
+                raise
+
+        os.replace(part_path, file_path)
+        journal.remove()
+        self.on_complete(file_path)
+        return file_path
+
+    def _download_missing(
+        self,
+        file_handler: BinaryIO,
+        journal: DownloadJournal,
+        connections: int,
+        timeout: Optional[int],
+        max_retries: Optional[int],
+        flow: Flow,
+        range_sizer: request.RangeSizer
+    ) -> None:
+        """Download the parts of the stream the journal has not recorded.
+
+        :param file_handler:
+            The file handle of the .part file being written to.
+        :param journal:
+            The journal of the .part file.
+        :param range_sizer:
+            Sizes the byte ranges requested.
+        """
+        if journal.segment is None:
+            try:
+                if connections > 1 or journal.ranges:
+                    self._download_ranges(
+                        file_handler,
+                        journal,
+                        connections=connections,
+                        timeout=timeout,
+                        max_retries=max_retries,
+                        flow=flow,
+                        range_sizer=range_sizer
+                    )
+                else:
+                    self._download_sequentially(
+                        file_handler,
+                        journal,
+                        timeout=timeout,
+                        max_retries=max_retries,
+                        flow=flow,
+                        range_sizer=range_sizer
+                    )
+                return
             except HTTPError as e:
                 if e.code != 404:
                     raise
-                # Some adaptive streams need to be requested with sequence numbers
-                for chunk in request.seq_stream(
+                # Discard anything written by the failed attempt
+                file_handler.seek(0)
+                file_handler.truncate()
+                journal.reset()
+
+        # Some adaptive streams need to be requested with sequence numbers
+        self._download_segments(
+            file_handler,
+            journal,
+            timeout=timeout,
+            max_retries=max_retries,
+            flow=flow
+        )
+
+    def _download_sequentially(
+        self,
+        file_handler: BinaryIO,
+        journal: DownloadJournal,
+        timeout: Optional[int],
+        max_retries: Optional[int],
+        flow: Flow,
+        range_sizer: request.RangeSizer
+    ) -> None:
+        """Download the whole stream in order over a single connection."""
+        bytes_remaining = self.filesize
+        offset = 0
+        fd = file_handler.fileno()
+        preallocate(fd, bytes_remaining)
+        with WriteBehindSink(fd) as sink:
+            for chunk in request.stream(
+                self.url,
+                timeout=timeout,
+                max_retries=max_retries,
+                filesize=self._filesize,
+                reuse_buffer=True,
+                flow=flow,
+                range_sizer=range_sizer
+            ):
+                sink.write(chunk, offset, on_written=journal.record)
+                offset += len(chunk)
+                # reduce the (bytes) remainder by the length of the chunk.
+                bytes_remaining -= len(chunk)
+                self._notify_progress(chunk, bytes_remaining)
+        # Drop any preallocated space the stream turned out not to need
+        os.ftruncate(fd, offset)
+
+    def _download_segments(
+        self,
+        file_handler: BinaryIO,
+        journal: DownloadJournal,
+        timeout: Optional[int],
+        max_retries: Optional[int],
+        flow: Flow
+    ) -> None:
+        """Download a segmented (OTF) stream, after its last completed segment."""
+        offset = journal.contiguous_bytes
+        # Drop any partially written segment
+        file_handler.seek(offset)
+        file_handler.truncate()
+        bytes_remaining = self.filesize - offset
+
+        segment = 0 if journal.segment is None else journal.segment + 1
+        with WriteBehindSink(file_handler.fileno()) as sink:
+            for seq_num, chunk in request.seq_stream_segments(
+                self.url,
+                timeout=timeout,
+                max_retries=max_retries,
+                start_segment=segment,
+                flow=flow
+            ):
+                if seq_num != segment:
+                    # Everything up to the previous segment is now on disk
+                    sink.flush()
+                    journal.record_segment(segment, offset)
+                    segment = seq_num
+                sink.write(chunk, offset)
+                offset += len(chunk)
+                # reduce the (bytes) remainder by the length of the chunk.
+                bytes_remaining -= len(chunk)
+                self._notify_progress(chunk, bytes_remaining)
+
+    def _download_ranges(
+        self,
+        file_handler: BinaryIO,
+        journal: DownloadJournal,
+        connections: int,
+        timeout: Optional[int],
+        max_retries: Optional[int],
+        flow: Flow,
+        range_sizer: request.RangeSizer
+    ) -> None:
+        """Download the missing byte ranges of the stream concurrently.
+
+        The file is extended to the full size of the stream up front, and
+        each range is written at its own offset as soon as it arrives, so
+        ranges may complete in any order. Each range is cut from what is
+        left to download once a connection is free for it, at the size the
+        ranges completed so far call for.
+
+        :param file_handler:
+            The file handle of the .part file being written to.
+        :param journal:
+            The journal of the .part file.
+        :param int connections:
+            Number of ranges to download at the same time.
+        :param range_sizer:
+            Sizes the byte ranges requested, shared by the connections.
+        """
+        filesize = self.filesize
+        fd = file_handler.fileno()
+        preallocate(fd, filesize)
+        progress_lock = threading.Lock()
+        bytes_remaining = filesize - journal.bytes_completed
+        missing = journal.missing_ranges()
+        missing_lock = threading.Lock()
+        # Set to stop taking ranges after an error or an interruption
+        stopped = threading.Event()
+
+        def next_range() -> Optional[Tuple[int, int]]:
+            with missing_lock:
+                if stopped.is_set() or not missing:
+                    return None
+                start, stop = missing[0]
+                range_stop = min(start + range_sizer.size - 1, stop)
+                if range_stop == stop:
+                    missing.pop(0)
+                else:
+                    missing[0] = (range_stop + 1, stop)
+                return start, range_stop
+
+        def download_ranges() -> None:
+            nonlocal bytes_remaining
+            while True:
+                byte_range = next_range()
+                if byte_range is None:
+                    return
+                start, stop = byte_range
+                offset = start
+                for chunk in request.stream_range(
                     self.url,
+                    start,
+                    stop,
                     timeout=timeout,
-                    max_retries=max_retries
+                    max_retries=max_retries,
+                    reuse_buffer=True,
+                    flow=flow,
+                    range_sizer=range_sizer
                 ):
-                    # reduce the (bytes) remainder by the length of the chunk.
-                    bytes_remaining -= len(chunk)
-                    # send to the on_progress callback.
-                    self.on_progress(chunk, fh, bytes_remaining)
-        self.on_complete(file_path)
-        return file_path
+                    sink.write(chunk, offset, on_written=journal.record)
+                    offset += len(chunk)
+                    # Callbacks may run on any worker thread, but never
+                    #  concurrently
+                    with progress_lock:
+                        bytes_remaining -= len(chunk)
+                        self._notify_progress(chunk, bytes_remaining)
+
+        with WriteBehindSink(fd) as sink, \
+                ThreadPoolExecutor(max_workers=connections) as executor:
+            futures = [executor.submit(download_ranges) for _ in range(connections)]
+            try:
+                done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            finally:
+                # Don't start more ranges after an error or an interruption,
+                #  e.g. KeyboardInterrupt
+                stopped.set()
+            for future in done:
+                # Re-raise the first error encountered, if any
+                future.result()
 
     def get_file_path(
         self,
@@ -364,7 +679,7 @@ class Stream:
             "downloading (%s total bytes) file to buffer", self.filesize,
         )
 
-        for chunk in request.stream(self.url):
+        for chunk in request.stream(self.url, reuse_buffer=True):
             # reduce the (bytes) remainder by the length of the chunk.
             bytes_remaining -= len(chunk)
             # send to the on_progress callback.
@@ -380,8 +695,10 @@ class Stream:
         additional callback is defined in the monostate. This is exposed to
         allow things like displaying a progress bar.
 
-        :param bytes chunk:
-            Segment of media file binary data, not yet written to disk.
+        :param chunk:
+            Segment of media file binary data, not yet written to disk. A
+            view of a buffer that is reused for the next segment.
+        :type chunk: bytes or memoryview
         :param file_handler:
             The file handle where the media is being written to.
         :type file_handler:
@@ -394,6 +711,10 @@ class Stream:
 
         """
         file_handler.write(chunk)
+        self._notify_progress(chunk, bytes_remaining)
+
+    def _notify_progress(self, chunk: bytes, bytes_remaining: int):
+        """Pass download progress on to the user defined callback, if any."""
         logger.debug("download remaining: %s", bytes_remaining)
         if self._monostate.on_progress:
             self._monostate.on_progress(self, chunk, bytes_remaining)
@@ -0,0 +1,284 @@
+"""Index of the data embedded in a watch page.
+
+A watch page embeds several JSON blobs (``ytInitialData``,
+``ytInitialPlayerResponse``, ``ytcfg``, ...) in its scripts. Rather than
+searching the whole page again for each of them, :class:`WatchPage` looks for
+where each of them starts the first time it is needed, with a plain string
+search for a keyword the marker starts with, and decodes each of them at most
+once.
+"""
+import logging
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Match, Optional, Pattern, Tuple
+
+from pytube.exceptions import HTMLParseError, RegexMatchError
+from pytube.parser import parse_for_object_from_startpoint
+
+logger = logging.getLogger(__name__)
+
+# Everything looked for in a watch page, by name: a keyword every match
+#  starts with, which is searched for with str.find, and the pattern the
+#  match has to follow there. For blobs, the match ends where the blob starts.
+_markers: Dict[str, Tuple[str, Pattern]] = {
+    "window_initial_data": (
+        "window[", re.compile(r"window\[['\"]ytInitialData['\"]]\s*=\s*")
+    ),
+    "initial_data": ("ytInitialData", re.compile(r"ytInitialData\s*=\s*")),
+    "window_player_response": (
+        "window[",
+        re.compile(r"window\[['\"]ytInitialPlayerResponse['\"]]\s*=\s*"),
+    ),
+    "player_response": (
+        "ytInitialPlayerResponse", re.compile(r"ytInitialPlayerResponse\s*=\s*")
+    ),
+    "ytplayer_config": ("ytplayer.config", re.compile(r"ytplayer\.config\s*=\s*")),
+    # yt.setConfig() needs to be handled a little differently: the player
+    #  config is an argument of it.
+    "set_config": (
+        "yt.setConfig(", re.compile(r"yt\.setConfig\(.*['\"]PLAYER_CONFIG['\"]:\s*")
+    ),
+    "ytcfg": ("ytcfg", re.compile(r"ytcfg\s=\s")),
+    "ytcfg_set": ("ytcfg.set(", re.compile(r"ytcfg\.set\(")),
+    "js": ("/s/player/", re.compile(r"/s/player/[\w\d]+/[\w\d_/.]+/base\.js")),
+    "publish_date": (
+        'itemprop="datePublished" content="',
+        re.compile(r"itemprop=\"datePublished\" content=\"(\d{4}-\d{2}-\d{2})"),
+    ),
+}
+
+
+def _find(html: str, keyword: str, pattern: Pattern) -> Iterator[Match]:
+    """Find the non-overlapping matches of a marker, in page order.
+
+    Only the places where ``keyword`` is found are tried, which is much
+    faster than searching the page with ``pattern`` alone.
+
+    :rtype: Iterator[Match]
+    """
+    start = html.find(keyword)
+    while start != -1:
+        match = pattern.match(html, start)
+        if match:
+            yield match
+            start = match.end()
+        else:
+            start += 1
+        start = html.find(keyword, start)
+
+
+class WatchPage:
+    """The html of a watch page, and the data embedded in it."""
+
+    def __init__(self, html: str):
+        """Construct a :class:`WatchPage <WatchPage>`.
+
+        :param str html:
+            The html contents of the watch page.
+        """
+        self.html = html
+        # All the matches, and the first match, of the markers looked for so
+        #  far, by name
+        self._matches: Dict[str, List[Match]] = {}
+        self._first: Dict[str, Optional[Match]] = {}
+        # Decoded blobs, or the exception decoding them raised, by name
+        self._decoded: Dict[str, Any] = {}
+        # Objects parsed so far, or the exception parsing them raised, by
+        #  offset. ytplayer_config and initial_player_response usually are the
+        #  same object.
+        self._objects: Dict[int, Any] = {}
+
+    def matches(self, name: str) -> List[Match]:
+        """Return the matches of the given marker, in page order.
+
+        The page is searched for the marker the first time it is asked for.
+
+        :param str name:
+            The name of the marker in ``_markers``.
+        :rtype: List[Match]
+        """
+        if name not in self._matches:
+            self._matches[name] = list(_find(self.html, *_markers[name]))
+        return self._matches[name]
+
+    def first_match(self, name: str) -> Optional[Match]:
+        """Return the first match of the given marker, if any.
+
+        Unlike :meth:`matches`, the search stops at the first match.
+
+        :param str name:
+            The name of the marker in ``_markers``.
+        :rtype: Match
+        """
+        if name in self._matches:
+            matches = self._matches[name]
+            return matches[0] if matches else None
+        if name not in self._first:
+            self._first[name] = next(_find(self.html, *_markers[name]), None)
+        return self._first[name]
+
+    def offsets(self, name: str) -> List[int]:
+        """Return where the given kind of object starts, in page order.
+
+        :param str name:
+            The name of the marker in ``_markers``.
+        :rtype: List[int]
+        """
+        return [match.end() for match in self.matches(name)]
+
+    @property
+    def initial_data(self) -> Dict:
+        """The ytInitialData json, mostly used to render the page on-load.
+
+        :rtype: dict
+        """
+        return self._decode("initial_data", self._initial_data)
+
+    @property
+    def initial_player_response(self) -> Dict:
+        """The ytInitialPlayerResponse json.
+
+        :rtype: dict
+        """
+        return self._decode("initial_player_response", self._initial_player_response)
+
+    @property
+    def ytplayer_config(self) -> Dict:
+        """The YouTube player configuration data.
+
+        :rtype: dict
+        """
+        return self._decode("ytplayer_config", self._ytplayer_config)
+
+    @property
+    def ytcfg(self) -> Dict:
+        """The entirety of the ytcfg object, merged from all its pieces.
+
+        :rtype: dict
+        """
+        return self._decode("ytcfg", self._ytcfg)
+
+    @property
+    def age_restricted(self) -> bool:
+        """Whether the content is age restricted.
+
+        :rtype: bool
+        """
+        return "og:restrictions:age" in self.html
+
+    @property
+    def ytplayer_js(self) -> str:
+        """The path of the YouTube player base JavaScript.
+
+        :rtype: str
+        """
+        match = self.first_match("js")
+        if match is None:
+            raise RegexMatchError(
+                caller="get_ytplayer_js", pattern="js_url_patterns"
+            )
+        return match.group()
+
+    @property
+    def publish_date(self) -> Optional[datetime]:
+        """The publish date of the video, if the page has it.
+
+        :rtype: datetime
+        """
+        match = self.first_match("publish_date")
+        if match is None:
+            return None
+        return datetime.strptime(match.group(1), '%Y-%m-%d')
+
+    def _decode(self, name: str, decode) -> Any:
+        if name not in self._decoded:
+            try:
+                self._decoded[name] = decode()
+            except (HTMLParseError, RegexMatchError) as e:
+                self._decoded[name] = e
+        result = self._decoded[name]
+        if isinstance(result, Exception):
+            raise result.with_traceback(None)
+        return result
+
+    def _object_at(self, offset: int) -> Any:
+        """Parse the object starting at the given offset, at most once."""
+        if offset not in self._objects:
+            try:
+                self._objects[offset] = parse_for_object_from_startpoint(
+                    self.html, offset
+                )
+            except HTMLParseError as e:
+                self._objects[offset] = e
+        result = self._objects[offset]
+        if isinstance(result, HTMLParseError):
+            raise result.with_traceback(None)
+        return result
+
+    def _first_object(self, *names: str) -> Any:
+        """Parse the first object after the first marker of each name in turn."""
+        for name in names:
+            match = self.first_match(name)
+            if match is None:
+                continue
+            try:
+                return self._object_at(match.end())
+            except HTMLParseError as e:
+                logger.debug(f'Pattern failed: {name}')
+                logger.debug(e)
+        raise HTMLParseError(f'No matches for {names}')
+
+    def _initial_data(self) -> Dict:
+        try:
+            return self._first_object("window_initial_data", "initial_data")
+        except HTMLParseError:
+            raise RegexMatchError(
+                caller='initial_data', pattern='initial_data_pattern'
+            )
+
+    def _initial_player_response(self) -> Dict:
+        try:
+            return self._first_object("window_player_response", "player_response")
+        except HTMLParseError:
+            raise RegexMatchError(
+                caller='initial_player_response',
+                pattern='initial_player_response_pattern'
+            )
+
+    def _ytplayer_config(self) -> Dict:
+        try:
+            return self._first_object("ytplayer_config", "player_response")
+        except HTMLParseError:
+            pass
+
+        match = self.first_match("set_config")
+        if match is not None:
+            try:
+                return self._object_at(match.end())
+            except HTMLParseError:
+                # Like a failed regex search, don't try further matches
+                pass
+
+        raise RegexMatchError(
+            caller="get_ytplayer_config",
+            pattern="config_patterns, setconfig_patterns"
+        )
+
+    def _ytcfg(self) -> Dict:
+        ytcfg = {}
+        for name in ("ytcfg", "ytcfg_set"):
+            for offset in self.offsets(name):
+                try:
+                    ytcfg.update(self._object_at(offset))
+                except HTMLParseError:
+                    # Some of the instances might fail because set is
+                    # technically a method of the ytcfg object. We'll skip
+                    # these since they don't seem relevant at the moment.
+                    continue
+
+        if len(ytcfg) > 0:
+            return ytcfg
+
+        raise RegexMatchError(
+            caller="get_ytcfg", pattern="ytcfg_pattenrs"
+        )
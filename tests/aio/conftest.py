@@ -0,0 +1,13 @@
+"""Reusable components for the pytube.aio tests."""
+import pytest
+from unittest import mock
+
+from pytube.aio import StreamsTransport, request
+
+
+@pytest.fixture(autouse=True)
+def fresh_transport():
+    """Give every test its own transport and connections."""
+    transport = StreamsTransport()
+    with mock.patch.object(request, "default_transport", transport):
+        yield transport
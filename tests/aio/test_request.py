@@ -0,0 +1,165 @@
+import asyncio
+import http.client
+import os
+from unittest import mock
+from urllib.error import HTTPError
+
+import pytest
+
+from pytube import request as sync_request
+from pytube import retry
+from pytube.aio import Transport, request
+from tests.server import StandInServer
+
+
+def _collect(chunks):
+    async def collect():
+        return [chunk async for chunk in chunks]
+    return asyncio.run(collect())
+
+
+def _otf_files(segment_count):
+    files = {"/otf?sq=0": b"Raw_data\r\nSegment-Count: %d\r\n" % segment_count}
+    for seq_num in range(1, segment_count + 1):
+        files[f"/otf?sq={seq_num}"] = os.urandom(1024)
+    return files
+
+
+def test_get_reuses_connection(fresh_transport):
+    content = os.urandom(100 * 1024)
+    with StandInServer({"/page": content}) as server:
+        async def fetch():
+            return [
+                await (await request._execute_request(server.url("/page"))).read()
+                for _ in range(3)
+            ]
+        bodies = asyncio.run(fetch())
+    assert bodies == [content] * 3
+    assert server.connections == 1
+    assert fresh_transport.connections_reused == 2
+
+
+def test_transport_must_implement_request():
+    class NoRequest(Transport):
+        pass
+
+    with pytest.raises(TypeError):
+        NoRequest()
+
+
+def test_head():
+    with StandInServer({"/video": b"0" * 1234}) as server:
+        headers = asyncio.run(request.head(server.url("/video")))
+    assert headers["content-length"] == "1234"
+
+
+def test_head_reuses_connection(fresh_transport):
+    with StandInServer({"/video": b"0" * 1234}) as server:
+        async def heads():
+            return [await request.head(server.url("/video")) for _ in range(5)]
+        headers = asyncio.run(heads())
+    assert [h["content-length"] for h in headers] == ["1234"] * 5
+    assert server.connections == 1
+    assert fresh_transport.connections_reused == 4
+
+
+def test_http_error():
+    with StandInServer({}) as server:
+        with pytest.raises(HTTPError) as exc_info:
+            asyncio.run(request.get(server.url("/missing")))
+    assert exc_info.value.code == 404
+
+
+def test_get_non_http():
+    with pytest.raises(ValueError):  # noqa: PT011
+        asyncio.run(request.get("file://bad"))
+
+
+@mock.patch("pytube.request.default_range_size", 16 * 1024)
+@mock.patch("pytube.request.default_max_range_size", 16 * 1024)
+def test_stream_request_count():
+    content = os.urandom(40 * 1024)
+    with StandInServer({"/video": content}) as server:
+        chunks = _collect(request.stream(server.url("/video?itag=18")))
+    assert b"".join(chunks) == content
+    assert len(server.requests) == 3
+    assert server.connections == 1
+
+
+@mock.patch("pytube.request.default_range_size", 16 * 1024)
+@mock.patch("pytube.request.default_max_range_size", 16 * 1024)
+def test_stream_from_offset():
+    content = os.urandom(40 * 1024)
+    with StandInServer({"/video": content}) as server:
+        chunks = _collect(request.stream(
+            server.url("/video?itag=18"), filesize=len(content), start=20000
+        ))
+    assert b"".join(chunks) == content[20000:]
+
+
+def _failing_response(chunk):
+    """Mock response whose body is cut short after a chunk."""
+    async def iter_chunks():
+        yield chunk
+        raise http.client.IncompleteRead(b"")
+    response = mock.Mock()
+    response.info.return_value = {}
+    response.iter_chunks = iter_chunks
+    return response
+
+
+def test_stream_resumes_failed_range():
+    content = os.urandom(48 * 1024)
+    sizer = sync_request.RangeSizer(
+        initial=32 * 1024, minimum=16 * 1024, maximum=64 * 1024
+    )
+    with StandInServer({"/video": content}) as server:
+        real_range_request = request._execute_range_request
+        responses = [_failing_response(content[:1000])]
+
+        async def range_request(*args, **kwargs):
+            if responses:
+                return responses.pop()
+            return await real_range_request(*args, **kwargs)
+
+        with mock.patch("pytube.aio.request._execute_range_request", range_request):
+            chunks = _collect(request.stream(
+                server.url("/video?itag=18"),
+                filesize=len(content),
+                max_retries=1,
+                range_sizer=sizer,
+            ))
+    assert b"".join(chunks) == content
+    # Resumed after the first 1000 bytes, with smaller ranges
+    assert [path.rpartition("range=")[2] for _, path in server.requests] == [
+        "1000-17383", "17384-49151"
+    ]
+    assert [size for size, *_ in sizer.history] == [32768, 16384, 32768]
+
+
+@mock.patch("pytube.request.default_segment_window", 4)
+def test_seq_stream_segments_in_order():
+    files = _otf_files(20)
+    with StandInServer(files) as server:
+        segments = _collect(request.seq_stream_segments(server.url("/otf?itag=18")))
+    assert [seq_num for seq_num, _ in segments] == list(range(21))
+    assert [data for _, data in segments] == list(files.values())
+    assert len(server.requests) == 21
+
+
+def test_seq_filesize():
+    files = _otf_files(30)
+    with StandInServer(files) as server:
+        filesize = asyncio.run(request.seq_filesize(server.url("/otf?itag=18")))
+    assert filesize == sum(len(data) for data in files.values())
+
+
+def test_segment_retries_are_not_multiplied():
+    policy = retry.RetryPolicy(max_retries=2, backoff=0)
+    with StandInServer({"/segment?sq=1": b"data"}) as server:
+        server.failures["/segment"] = [503] * 3
+        with pytest.raises(HTTPError):
+            asyncio.run(request._fetch_segment(
+                server.url("/segment?sq=1"), None, policy
+            ))
+        assert len(server.requests) == 3
@@ -0,0 +1,171 @@
+import asyncio
+import os
+import threading
+from unittest import mock
+
+import pytest
+
+from pytube import request, sink
+from pytube.aio import AsyncStream
+from pytube.exceptions import NotFetchedError
+from pytube.monostate import Monostate
+from pytube.sink import WriteBehindSink
+from tests.server import StandInServer
+
+
+def _stand_in_stream(url, size, on_progress=None):
+    """Build an :class:`AsyncStream` pointing at a stand-in server url."""
+    stream = {
+        "url": url,
+        "itag": 18,
+        "mimeType": 'video/mp4; codecs="avc1.42001E, mp4a.40.2"',
+        "is_otf": False,
+        "bitrate": None,
+        "contentLength": str(size),
+    }
+    return AsyncStream(stream, Monostate(on_progress=on_progress, on_complete=None))
+
+
+class _Interrupt(Exception):
+    pass
+
+
+@mock.patch("pytube.request.default_range_size", 16 * 1024)
+@mock.patch("pytube.request.default_max_range_size", 16 * 1024)
+def test_download(tmp_path):
+    content = os.urandom(40 * 1024)
+    progress = []
+    with StandInServer({"/video": content}) as server:
+        stream = _stand_in_stream(
+            server.url("/video?itag=18"),
+            len(content),
+            on_progress=lambda s, chunk, remaining: progress.append(remaining),
+        )
+        file_path = asyncio.run(
+            stream.download(output_path=str(tmp_path), filename="video.mp4")
+        )
+    with open(file_path, "rb") as fh:
+        assert fh.read() == content
+    assert progress[-1] == 0
+    assert os.listdir(tmp_path) == ["video.mp4"]
+
+
+@mock.patch("pytube.request.default_range_size", 16 * 1024)
+@mock.patch("pytube.request.default_max_range_size", 16 * 1024)
+@pytest.mark.parametrize("disk_stalled", [False, True])
+def test_download_writes_outside_event_loop(tmp_path, disk_stalled):
+    content = os.urandom(40 * 1024)
+    write_threads = []
+    pwrite_threads = []
+    write = WriteBehindSink.write
+    pwrite = sink.pwrite
+
+    def recording_write(self, *args, **kwargs):
+        write_threads.append(threading.current_thread())
+        return write(self, *args, **kwargs)
+
+    def recording_pwrite(*args):
+        pwrite_threads.append(threading.current_thread())
+        return pwrite(*args)
+
+    with StandInServer({"/video": content}) as server, \
+            mock.patch.object(WriteBehindSink, "write", recording_write), \
+            mock.patch.object(WriteBehindSink, "would_block", return_value=disk_stalled), \
+            mock.patch("pytube.sink.pwrite", recording_pwrite):
+        stream = _stand_in_stream(server.url("/video?itag=18"), len(content))
+        file_path = asyncio.run(
+            stream.download(output_path=str(tmp_path), filename="video.mp4")
+        )
+    with open(file_path, "rb") as fh:
+        assert fh.read() == content
+    assert pwrite_threads
+    assert threading.current_thread() not in pwrite_threads
+    # Chunks are only queued from the executor when that would wait for the disk
+    assert write_threads
+    loop_thread = [thread is threading.current_thread() for thread in write_threads]
+    assert loop_thread == [not disk_stalled] * len(write_threads)
+
+
+@mock.patch("pytube.request.default_range_size", 16 * 1024)
+@mock.patch("pytube.request.default_max_range_size", 16 * 1024)
+def test_download_resumes(tmp_path):
+    content = os.urandom(64 * 1024)
+
+    def interrupt(stream, chunk, bytes_remaining):
+        if bytes_remaining < len(content) - 16 * 1024:
+            raise _Interrupt()
+
+    with StandInServer({"/video": content}) as server:
+        url = server.url("/video?itag=18")
+        with pytest.raises(_Interrupt):
+            asyncio.run(_stand_in_stream(url, len(content), interrupt).download(
+                output_path=str(tmp_path), filename="video.mp4"
+            ))
+        server.requests.clear()
+        file_path = asyncio.run(_stand_in_stream(url, len(content)).download(
+            output_path=str(tmp_path), filename="video.mp4"
+        ))
+
+    with open(file_path, "rb") as fh:
+        assert fh.read() == content
+    assert "range=0-" not in server.requests[0][1]
+
+
+def test_download_with_range_sizer(tmp_path):
+    content = os.urandom(112 * 1024)
+    sizer = request.RangeSizer(
+        initial=16 * 1024, minimum=16 * 1024, maximum=64 * 1024
+    )
+    with StandInServer({"/video": content}) as server:
+        stream = _stand_in_stream(server.url("/video?itag=18"), len(content))
+        file_path = asyncio.run(stream.download(
+            output_path=str(tmp_path), filename="video.mp4", range_sizer=sizer
+        ))
+    with open(file_path, "rb") as fh:
+        assert fh.read() == content
+    assert [path.rpartition("range=")[2] for _, path in server.requests] == [
+        "0-16383", "16384-49151", "49152-114687"
+    ]
+    assert [size for size, *_ in sizer.history] == [16384, 32768, 65536]
+
+
+def test_download_segmented(tmp_path):
+    segments = [b"Segment-Count: 3\r\n", b"a" * 100, b"b" * 100, b"c" * 100]
+    files = {f"/otf?sq={i}": segment for i, segment in enumerate(segments)}
+    with StandInServer(files) as server:
+        stream = _stand_in_stream(server.url("/otf?itag=18"), 0)
+        with pytest.raises(NotFetchedError):
+            stream.filesize
+        file_path = asyncio.run(
+            stream.download(output_path=str(tmp_path), filename="video.mp4")
+        )
+    with open(file_path, "rb") as fh:
+        assert fh.read() == b"".join(segments)
+    assert stream.filesize == len(b"".join(segments))
+
+
+@mock.patch("pytube.request.default_range_size", 16 * 1024)
+@mock.patch("pytube.request.default_max_range_size", 16 * 1024)
+def test_download_refreshes_rejected_url(tmp_path):
+    content = os.urandom(64 * 1024)
+    with StandInServer({"/old": content, "/new": content}) as server:
+        def on_progress(stream, chunk, bytes_remaining):
+            # The url stops working after the first range
+            server.failures["/old"] = [403]
+
+        async def refresh_url(itag):
+            return server.url("/new?itag=18")
+
+        stream = _stand_in_stream(server.url("/old?itag=18"), len(content), on_progress)
+        stream._monostate.refresh_url = refresh_url
+        file_path = asyncio.run(
+            stream.download(output_path=str(tmp_path), filename="video.mp4")
+        )
+
+    with open(file_path, "rb") as fh:
+        assert fh.read() == content
+    new_ranges = [
+        path.split("range=")[1] for _, path in server.requests
+        if path.startswith("/new")
+    ]
+    assert new_ranges == ["16384-32767", "32768-49151", "49152-65535"]
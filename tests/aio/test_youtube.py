@@ -0,0 +1,190 @@
+import asyncio
+import http.client
+import io
+import json
+import threading
+import time
+
+import pytest
+
+from pytube import Playlist
+from pytube.cipher import Cipher
+from pytube.aio import (
+    AsyncInnerTube,
+    AsyncPlaylist,
+    AsyncSearch,
+    AsyncYouTube,
+    Response,
+    Transport,
+)
+from pytube.exceptions import NotFetchedError
+from pytube.response_cache import MemoryResponseCache
+from tests.conftest import load_playback_file
+
+
+class FakeTransport(Transport):
+    """Transport that serves canned bodies, looked up by url prefix."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.requests = []
+
+    async def request(self, method, url, headers=None, data=None, timeout=None):
+        self.requests.append((method, url))
+        for prefix, body in self.routes.items():
+            if url.startswith(prefix):
+                return _response(url, body)
+        raise AssertionError(f"unexpected request for {url}")
+
+
+def _response(url, body):
+    if not isinstance(body, bytes):
+        body = body.encode("utf-8")
+
+    async def chunks():
+        yield body
+
+    headers = http.client.parse_headers(
+        io.BytesIO(f"Content-Length: {len(body)}\r\n\r\n".encode())
+    )
+    return Response(url, 200, "OK", headers, chunks())
+
+
+@pytest.fixture
+def playback():
+    return load_playback_file("yt-video-2lAe1cqCOXo-html.json.gz")
+
+
+def test_prefetch(playback, monkeypatch):
+    transport = FakeTransport({
+        "https://youtube.com/watch": playback["watch_html"],
+        "https://www.youtube.com/youtubei/v1/player": json.dumps(playback["vid_info"]),
+    })
+    monkeypatch.setattr("pytube.aio.request.default_transport", transport)
+
+    yt = AsyncYouTube(playback["url"])
+    with pytest.raises(NotFetchedError):
+        yt.title
+    asyncio.run(yt.prefetch())
+
+    assert yt.title == playback["vid_info"]["videoDetails"]["title"]
+    assert yt.length == int(playback["vid_info"]["videoDetails"]["lengthSeconds"])
+    assert [method for method, _ in transport.requests] == ["GET", "POST"]
+    with pytest.raises(NotFetchedError):
+        yt.js
+
+
+def test_fetch_streams_builds_cipher_outside_event_loop(playback, base_js, monkeypatch):
+    transport = FakeTransport({
+        "https://youtube.com/watch": playback["watch_html"],
+        "https://www.youtube.com/youtubei/v1/player": json.dumps(playback["vid_info"]),
+        "https://youtube.com/s/player/": base_js[0],
+    })
+    monkeypatch.setattr("pytube.aio.request.default_transport", transport)
+    threads = []
+
+    def build_cipher(js):
+        threads.append(threading.current_thread())
+        return Cipher(js=js)
+
+    monkeypatch.setattr("pytube.cipher_registry.Cipher", build_cipher)
+
+    yt = AsyncYouTube(playback["url"])
+    with pytest.raises(NotFetchedError):
+        yt.cipher
+    streams = asyncio.run(yt.fetch_streams())
+
+    assert len(streams) > 0
+    assert len(threads) == 1
+    assert threads[0] is not threading.current_thread()
+
+
+def test_playlist_video_urls(playlist_html, monkeypatch):
+    transport = FakeTransport({"https://www.youtube.com/playlist": playlist_html})
+    monkeypatch.setattr("pytube.aio.request.default_transport", transport)
+    monkeypatch.setattr("pytube.request.get", lambda url: playlist_html)
+    url = "https://www.youtube.com/playlist?list=whatever"
+
+    playlist = AsyncPlaylist(url)
+    with pytest.raises(NotFetchedError):
+        len(playlist)
+    video_urls = asyncio.run(playlist.fetch_video_urls())
+
+    assert video_urls == list(Playlist(url).video_urls)
+    assert len(playlist) == len(video_urls)
+    assert playlist.title == Playlist(url).title
+
+
+def test_search(monkeypatch):
+    raw_results = {
+        "contents": {"twoColumnSearchResultsRenderer": {"primaryContents": {
+            "sectionListRenderer": {"contents": [{"itemSectionRenderer": {
+                "contents": [{"videoRenderer": {
+                    "videoId": "2lAe1cqCOXo",
+                    "title": {"runs": [{"text": "A video"}]},
+                    "ownerText": {"runs": [{
+                        "text": "A channel",
+                        "navigationEndpoint": {"commandMetadata": {
+                            "webCommandMetadata": {"url": "/c/channel"}
+                        }},
+                    }]},
+                }}]
+            }}]}
+        }}},
+        "refinements": ["a video"],
+    }
+    transport = FakeTransport({
+        "https://www.youtube.com/youtubei/v1/search": json.dumps(raw_results)
+    })
+    monkeypatch.setattr("pytube.aio.request.default_transport", transport)
+
+    search = AsyncSearch("a video")
+    results = asyncio.run(search.fetch_results())
+
+    assert [type(video) for video in results] == [AsyncYouTube]
+    assert results[0].title == "A video"
+    assert search.completion_suggestions == ["a video"]
+    with pytest.raises(IndexError):
+        asyncio.run(search.get_next_results())
+
+
+def test_search_response_cached(monkeypatch):
+    transport = FakeTransport({
+        "https://www.youtube.com/youtubei/v1/search": json.dumps({"contents": {}})
+    })
+    monkeypatch.setattr("pytube.aio.request.default_transport", transport)
+    cache = MemoryResponseCache()
+    monkeypatch.setattr("pytube.response_cache.default_cache", cache)
+
+    async def search_twice():
+        first = await AsyncInnerTube(client='WEB').search("a video")
+        second = await AsyncInnerTube(client='WEB').search("a video")
+        return first, second
+
+    assert asyncio.run(search_twice()) == ({"contents": {}}, {"contents": {}})
+    assert len(transport.requests) == 1
+    assert cache.stats == {"hits": 1, "misses": 1}
+
+
+def test_refresh_stream_url_bypasses_cache(monkeypatch):
+    expire = int(time.time()) + 3600
+    url = f"https://r1.googlevideo.com/videoplayback?expire={expire}&itag=18&sig=x"
+    player = {"streamingData": {"formats": [{"itag": 18, "url": url}]}}
+    transport = FakeTransport({
+        "https://www.youtube.com/youtubei/v1/player": json.dumps(player)
+    })
+    monkeypatch.setattr("pytube.aio.request.default_transport", transport)
+    cache = MemoryResponseCache()
+    monkeypatch.setattr("pytube.response_cache.default_cache", cache)
+    monkeypatch.setattr("pytube.extract.apply_signature", lambda *args, **kwargs: None)
+
+    async def refresh():
+        youtube = AsyncYouTube("https://youtu.be/2lAe1cqCOXo", lightweight=True)
+        await youtube.prefetch()
+        youtube._cipher = object()
+        return await youtube._refresh_stream_url(18)
+
+    assert asyncio.run(refresh()) == url
+    # The cached response may hold the url that was just rejected
+    assert len(transport.requests) == 2
+    assert cache.stats == {"hits": 0, "misses": 1}
@@ -5,7 +5,43 @@ import os
 import pytest
 from unittest import mock
 
-from pytube import YouTube
+from pytube import YouTube, cipher_registry, coalesce, player_cache, request
+from pytube.cipher_registry import CipherRegistry
+from pytube.coalesce import Coalescer
+from pytube.player_cache import PlayerCache
+from pytube.pool import ConnectionPool
+
+
+@pytest.fixture(autouse=True)
+def fresh_connection_pool():
+    """Give every test its own connection pool, so proxies installed by one
+    test don't leak into the next."""
+    with mock.patch.object(request, "default_pool", ConnectionPool()):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def fresh_player_cache(tmp_path_factory):
+    """Give every test an empty player cache, outside the package."""
+    cache = PlayerCache(str(tmp_path_factory.mktemp("players")))
+    with mock.patch.object(player_cache, "default_cache", cache):
+        yield cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_cipher_registry():
+    """Give every test an empty registry of players."""
+    registry = CipherRegistry()
+    with mock.patch.object(cipher_registry, "default_registry", registry):
+        yield registry
+
+
+@pytest.fixture(autouse=True)
+def fresh_coalescer():
+    """Give every test its own coalescer, with counters starting at zero."""
+    coalescer = Coalescer()
+    with mock.patch.object(coalesce, "default_coalescer", coalescer):
+        yield coalescer
 
 
 def load_playback_file(filename):
@@ -37,6 +73,8 @@ def load_and_init_from_playback_file(filename, mock_urlopen):
     #  and descramble(), but this functionality has since been
     #  deferred
     v = YouTube(pb["url"])
+    # The recorded stream urls expired long ago, don't refresh them
+    v.stream_monostate.refresh_url = None
     v.watch_html
     v._vid_info = pb['vid_info']
     v.js
@@ -1,6 +1,7 @@
+import json
 from unittest import mock
 
-from pytube import Channel
+from pytube import Channel, extract
 
 
 @mock.patch('pytube.request.get')
@@ -70,6 +71,26 @@ def test_channel_video_list(request_get, channel_videos_html):
     assert c.video_urls[:10] == first_ten
 
 
+@mock.patch('pytube.request.get')
+@mock.patch('pytube.request.post')
+def test_channel_video_list_prefetched(request_post, request_get, channel_videos_html):
+    request_get.return_value = channel_videos_html
+    request_post.return_value = '{}'
+
+    url = 'https://www.youtube.com/c/ProgrammingKnowledge/videos'
+    expected = list(Channel(url).video_urls)
+    assert len(expected) == 30
+    assert list(Channel(url, prefetch_pages=1).video_urls) == expected
+
+
+def test_extract_videos_from_decoded_json(channel_videos_html):
+    initial_data = extract.initial_data(channel_videos_html)
+    expected = Channel._extract_videos(json.dumps(initial_data))
+    assert len(expected[0]) == 30
+    assert Channel._extract_videos(initial_data) == expected
+    assert Channel._extract_videos(json.dumps(initial_data).encode('utf-8')) == expected
+
+
 @mock.patch('pytube.request.get')
 def test_videos_html(request_get, channel_videos_html):
     request_get.return_value = channel_videos_html
@@ -1,7 +1,10 @@
 import datetime
+import json
+import threading
+import time
 from unittest import mock
 
-from pytube import Playlist
+from pytube import extract, Playlist
 
 
 @mock.patch("pytube.request.get")
@@ -320,3 +323,81 @@ def test_playlist_owner_url(request_get, playlist_long_html):
     request_get.return_value = playlist_long_html
     p = Playlist(url)
     assert p.owner_url == 'https://www.youtube.com/channel/UCs6nmQViDpUw0nuIx9c_WvA'
+
+
+def test_extract_videos_from_decoded_json(playlist_long_html):
+    initial_data = extract.initial_data(playlist_long_html)
+    expected = Playlist._extract_videos(json.dumps(initial_data))
+    assert len(expected[0]) == 100
+    assert expected[1]
+    assert Playlist._extract_videos(initial_data) == expected
+    assert Playlist._extract_videos(json.dumps(initial_data).encode("utf-8")) == expected
+
+
+def _continuation_page(video_ids, token=None):
+    """Body of a continuation response listing the given videos."""
+    items = [{"playlistVideoRenderer": {"videoId": video_id}} for video_id in video_ids]
+    if token:
+        items.append({"continuationItemRenderer": {"continuationEndpoint": {
+            "continuationCommand": {"token": token}
+        }}})
+    return json.dumps({"onResponseReceivedActions": [
+        {"appendContinuationItemsAction": {"continuationItems": items}}
+    ]})
+
+
+_continuation_pages = [
+    _continuation_page(["page2a", "page2b"], "token3"),
+    _continuation_page(["page3a", "page3b"], "token4"),
+    _continuation_page(["page4a"]),
+]
+
+
+@mock.patch("pytube.request.get")
+@mock.patch("pytube.request.post")
+def test_prefetched_pagination(request_post, request_get, playlist_long_html):
+    url = "https://www.fakeurl.com/playlist?list=whatever"
+    request_get.return_value = playlist_long_html
+    request_post.side_effect = list(_continuation_pages)
+    expected = list(Playlist(url).url_generator())
+    assert len(expected) == 105
+
+    request_post.reset_mock(side_effect=True)
+    request_post.side_effect = list(_continuation_pages)
+    urls = Playlist(url, prefetch_pages=1).url_generator()
+    assert next(urls) == expected[0]
+    # The next page is requested while the first one is consumed, no further
+    deadline = time.monotonic() + 5
+    while not request_post.call_count and time.monotonic() < deadline:
+        time.sleep(0.001)
+    time.sleep(0.05)
+    assert request_post.call_count == 1
+    assert [next(urls) for _ in range(99)] == expected[1:100]
+    assert list(urls) == expected[100:]
+    assert request_post.call_count == 3
+
+
+@mock.patch("pytube.request.get")
+@mock.patch("pytube.request.post")
+def test_prefetched_video_urls(request_post, request_get, playlist_long_html):
+    url = "https://www.fakeurl.com/playlist?list=whatever"
+    request_get.return_value = playlist_long_html
+    request_post.side_effect = list(_continuation_pages)
+    playlist = Playlist(url, prefetch_pages=2)
+    assert len(playlist.video_urls) == 105
+    assert playlist.video_urls[-1] == "https://www.youtube.com/watch?v=page4a"
+
+
+@mock.patch("pytube.request.get")
+@mock.patch("pytube.request.post")
+def test_prefetched_trimmed(request_post, request_get, playlist_long_html):
+    url = "https://www.fakeurl.com/playlist?list=whatever"
+    request_get.return_value = playlist_long_html
+    request_post.side_effect = list(_continuation_pages)
+    trimmed = list(Playlist(url, prefetch_pages=1).trimmed("page2b"))
+    assert len(trimmed) == 101
+    assert trimmed[-1] == "https://www.youtube.com/watch?v=page2a"
+    time.sleep(0.05)
+    # Stopped after the page being requested when trimmed, at most
+    assert request_post.call_count <= 2
+    assert not any(t.name == "pytube-read-ahead" for t in threading.enumerate())
@@ -0,0 +1,175 @@
+"""Local stand-in for the YouTube media servers used by tests and benchmarks."""
+import os
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib import parse
+
+
+class StandInServer:
+    """Serve in-memory files over HTTP/1.1 keep-alive connections.
+
+    Files are looked up by path. Requests carrying an ``sq`` query parameter
+    are looked up as ``<path>?sq=<n>``, like OTF segments. A ``range=a-b``
+    query parameter (as used by googlevideo) or a ``Range`` header returns the
+    requested slice. The server records every request and every accepted
+    connection so tests can assert on request and handshake counts.
+    """
+
+    def __init__(
+        self,
+        files: Dict[str, bytes],
+        tls: bool = False,
+        idle_timeout: Optional[float] = None,
+    ):
+        self.files = files
+        self.tls = tls
+        self.idle_timeout = idle_timeout
+        self.requests: List[Tuple[str, str]] = []
+        self.connections = 0
+        # path -> list of status codes to return before serving the file
+        self.failures: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._cert_dir: Optional[str] = None
+        self.client_context: Optional[ssl.SSLContext] = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def base_url(self) -> str:
+        scheme = "https" if self.tls else "http"
+        host, port = self._httpd.server_address[:2]
+        return f"{scheme}://{host}:{port}"
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def start(self) -> None:
+        server = self
+
+        class Handler(_StandInHandler):
+            stand_in = server
+            # Idle keep-alive connections are closed after this many seconds
+            timeout = server.idle_timeout
+
+        self._httpd = _QuietHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        if self.tls:
+            self._wrap_tls()
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._cert_dir:
+            shutil.rmtree(self._cert_dir, ignore_errors=True)
+
+    def _wrap_tls(self) -> None:
+        """Serve HTTPS with a throwaway self-signed certificate (needs openssl)."""
+        self._cert_dir = tempfile.mkdtemp()
+        cert = os.path.join(self._cert_dir, "cert.pem")
+        key = os.path.join(self._cert_dir, "key.pem")
+        subprocess.run(
+            [
+                "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+                "-keyout", key, "-out", cert, "-days", "1",
+                "-subj", "/CN=127.0.0.1",
+                "-addext", "subjectAltName=IP:127.0.0.1",
+            ],
+            check=True,
+            capture_output=True,
+        )
+        server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        server_context.load_cert_chain(cert, key)
+        self._httpd.socket = server_context.wrap_socket(
+            self._httpd.socket, server_side=True
+        )
+        self.client_context = ssl.create_default_context(cafile=cert)
+
+    def _record_connection(self) -> None:
+        with self._lock:
+            self.connections += 1
+
+    def _record_request(self, method: str, path: str) -> Optional[int]:
+        with self._lock:
+            self.requests.append((method, path))
+            failures = self.failures.get(parse.urlsplit(path).path)
+            if failures:
+                return failures.pop(0)
+        return None
+
+
+class _QuietHTTPServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # Clients abandoning a response mid-body is expected, not an error.
+        pass
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    stand_in: StandInServer
+
+    def setup(self):
+        super().setup()
+        self.stand_in._record_connection()
+
+    def log_message(self, *args):  # pragma: no cover
+        pass
+
+    def do_HEAD(self):  # noqa: N802
+        self._respond(send_body=False)
+
+    def do_GET(self):  # noqa: N802
+        self._respond(send_body=True)
+
+    def _respond(self, send_body: bool):
+        failure = self.stand_in._record_request(self.command, self.path)
+        if failure:
+            self._send_status(failure)
+            return
+
+        split = parse.urlsplit(self.path)
+        query = dict(parse.parse_qsl(split.query))
+        key = split.path
+        if "sq" in query:
+            key = f"{key}?sq={query['sq']}"
+        body = self.stand_in.files.get(key)
+        if body is None:
+            self._send_status(404)
+            return
+
+        status = 200
+        content_range = None
+        if "range" in query:
+            start, stop = (int(x) for x in query["range"].split("-"))
+            body = body[start:stop + 1]
+        elif self.headers.get("Range"):
+            start, _, stop = self.headers["Range"].split("=")[1].partition("-")
+            start = int(start)
+            stop = min(int(stop), len(body) - 1) if stop else len(body) - 1
+            content_range = f"bytes {start}-{stop}/{len(body)}"
+            body = body[start:stop + 1]
+            status = 206
+
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        if content_range:
+            self.send_header("Content-Range", content_range)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_status(self, status: int):
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
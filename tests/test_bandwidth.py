@@ -0,0 +1,136 @@
+import asyncio
+import os
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from pytube import Stream
+from pytube.bandwidth import BandwidthScheduler
+from pytube.monostate import Monostate
+from tests.server import StandInServer
+
+
+def test_unlimited_does_not_wait():
+    flow = BandwidthScheduler().flow()
+    start = time.monotonic()
+    for _ in range(1000):
+        flow.acquire(1024 * 1024)
+    assert time.monotonic() - start < 0.5
+
+
+def test_rate_is_capped():
+    scheduler = BandwidthScheduler(rate=1000 * 1000, burst=10 * 1000)
+    flow = scheduler.flow()
+    start = time.monotonic()
+    for _ in range(10):
+        flow.acquire(10 * 1000)
+    # The burst is free, the other 90KB take 90ms at 1MB/s
+    assert time.monotonic() - start >= 0.08
+
+
+def test_rate_is_shared_between_threads():
+    scheduler = BandwidthScheduler(rate=1000 * 1000, burst=10 * 1000)
+
+    def download():
+        flow = scheduler.flow()
+        for _ in range(5):
+            flow.acquire(10 * 1000)
+
+    threads = [threading.Thread(target=download) for _ in range(2)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - start >= 0.08
+
+
+def _grant_order(scheduler, flows, chunks):
+    """Acquire ``chunks`` chunks of 100 bytes on each flow concurrently."""
+    order = []
+
+    async def download(name, flow):
+        for _ in range(chunks):
+            await flow.acquire_async(100)
+            order.append(name)
+
+    async def main():
+        await asyncio.gather(
+            *(download(name, flow) for name, flow in flows.items())
+        )
+
+    with mock.patch("pytube.bandwidth._poll_interval", 0.001):
+        asyncio.run(main())
+    return order
+
+
+def test_priority_is_served_first():
+    scheduler = BandwidthScheduler(rate=1000 * 1000, burst=100)
+    flows = {
+        "high": scheduler.flow(priority=1),
+        "low": scheduler.flow(),
+    }
+    assert _grant_order(scheduler, flows, 5) == ["high"] * 5 + ["low"] * 5
+
+
+def test_bandwidth_is_shared_by_weight():
+    scheduler = BandwidthScheduler(rate=1000 * 1000, burst=100)
+    flows = {
+        "light": scheduler.flow(weight=1),
+        "heavy": scheduler.flow(weight=3),
+    }
+    order = _grant_order(scheduler, flows, 20)
+    # While both are downloading, the heavy flow gets three times the bytes
+    assert 3 <= order[:20].count("light") <= 7
+    assert not scheduler._waiters
+
+
+def test_configure_releases_waiting_downloads():
+    scheduler = BandwidthScheduler(rate=1, burst=1)
+    flow = scheduler.flow()
+    flow.acquire(1)
+    thread = threading.Thread(target=flow.acquire, args=(1000,))
+    thread.start()
+    time.sleep(0.05)
+    assert thread.is_alive()
+    scheduler.configure(rate=None)
+    thread.join(timeout=1)
+    assert not thread.is_alive()
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        BandwidthScheduler(rate=0)
+    with pytest.raises(ValueError):
+        BandwidthScheduler().flow(weight=0)
+
+
+@mock.patch("pytube.request.default_range_size", 16 * 1024)
+@mock.patch("pytube.request.default_max_range_size", 16 * 1024)
+def test_download_is_throttled(tmp_path):
+    content = os.urandom(64 * 1024)
+    scheduler = BandwidthScheduler(rate=256 * 1024, burst=16 * 1024)
+    with StandInServer({"/video": content}) as server, \
+            mock.patch("pytube.bandwidth.default_scheduler", scheduler):
+        stream = Stream(
+            {
+                "url": server.url("/video?itag=18"),
+                "itag": 18,
+                "mimeType": 'video/mp4; codecs="avc1.42001E, mp4a.40.2"',
+                "is_otf": False,
+                "bitrate": None,
+                "contentLength": str(len(content)),
+            },
+            Monostate(on_progress=None, on_complete=None),
+        )
+        start = time.monotonic()
+        file_path = stream.download(
+            output_path=str(tmp_path), filename="video.mp4", priority=1, weight=2
+        )
+        elapsed = time.monotonic() - start
+    with open(file_path, "rb") as fh:
+        assert fh.read() == content
+    # Two of the four 16KB ranges are paid for at 256KB/s
+    assert elapsed >= 0.1
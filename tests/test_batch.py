@@ -0,0 +1,123 @@
+import gzip
+import os
+import threading
+from unittest import mock
+
+import pytest
+
+from pytube import batch, cipher_registry
+from pytube.exceptions import VideoPrivate
+from tests.conftest import load_playback_file
+
+MOCKS = os.path.join(os.path.dirname(__file__), "mocks")
+
+
+@pytest.fixture
+def playback():
+    pb = load_playback_file("yt-video-2lAe1cqCOXo-html.json.gz")
+    with gzip.open(os.path.join(MOCKS, "base.js-2022-02-04.gz"), "rb") as fh:
+        pb["js"] = fh.read().decode("utf-8")
+    return pb
+
+
+def fake_get(pb, pages=None):
+    def get(url):
+        if url.endswith("base.js"):
+            return pb["js"]
+        for video_id, html in (pages or {}).items():
+            if url.endswith(video_id):
+                return html
+        return pb["watch_html"]
+    return get
+
+
+def js_requests(get):
+    urls = [(c.args or [c.kwargs["url"]])[0] for c in get.call_args_list]
+    return [url for url in urls if url.endswith("base.js")]
+
+
+def test_resolve_shares_cipher(playback):
+    ids = [f"2lAe1cqCOX{c}" for c in "abcdef"]
+    with mock.patch("pytube.request.get", side_effect=fake_get(playback)) as get, \
+            mock.patch("pytube.innertube.InnerTube.player",
+                       return_value=playback["vid_info"]), \
+            mock.patch("pytube.cipher_registry.Cipher",
+                       wraps=cipher_registry.Cipher) as cipher:
+        results = dict(batch.resolve(ids, workers=3))
+
+    assert sorted(results) == sorted(ids)
+    for video_id, yt in results.items():
+        assert yt.video_id == video_id
+        assert len(yt.streams) > 0
+    # The player js is fetched and parsed once for all the videos
+    assert cipher.call_count == 1
+    assert len(js_requests(get)) == 1
+    first = [yt for yt in results.values()][0]
+    assert all(yt._cipher is first._cipher for yt in results.values())
+
+
+def test_resolve_yields_errors(playback):
+    private = load_playback_file("yt-video-m8uHb5jIGN8-html.json.gz")
+    get = fake_get(playback, pages={"m8uHb5jIGN8": private["watch_html"]})
+    with mock.patch("pytube.request.get", side_effect=get), \
+            mock.patch("pytube.innertube.InnerTube.player",
+                       return_value=playback["vid_info"]):
+        results = dict(batch.resolve(["2lAe1cqCOXo", "m8uHb5jIGN8"], workers=2))
+
+    assert isinstance(results["m8uHb5jIGN8"], VideoPrivate)
+    assert len(results["2lAe1cqCOXo"].streams) > 0
+
+
+def test_resolve_metadata_only(playback):
+    with mock.patch("pytube.request.get", side_effect=fake_get(playback)) as get, \
+            mock.patch("pytube.innertube.InnerTube.player",
+                       return_value=playback["vid_info"]):
+        results = list(batch.resolve(["2lAe1cqCOXo"], streams=False))
+
+    (video_id, yt), = results
+    assert yt.title
+    assert js_requests(get) == []
+
+
+def test_resolve_reads_ids_lazily(playback):
+    consumed = []
+
+    def ids():
+        for n in range(10):
+            consumed.append(n)
+            yield f"2lAe1cqCO{n:02d}"
+
+    with mock.patch("pytube.request.get", side_effect=fake_get(playback)), \
+            mock.patch("pytube.innertube.InnerTube.player",
+                       return_value=playback["vid_info"]):
+        results = batch.resolve(ids(), workers=2, streams=False)
+        next(results)
+        assert len(consumed) <= 5
+        assert len(list(results)) == 9
+
+
+def test_resolve_cancels_queued_videos_when_closed(playback):
+    release = threading.Event()
+    calls = []
+
+    def player(video_id):
+        calls.append(video_id)
+        if len(calls) > 1:
+            release.wait(5)
+        return playback["vid_info"]
+
+    with mock.patch("pytube.request.get", side_effect=fake_get(playback)), \
+            mock.patch("pytube.innertube.InnerTube.player", side_effect=player):
+        results = batch.resolve(
+            (f"2lAe1cqCO{n:02d}" for n in range(10)), workers=1, streams=False
+        )
+        next(results)
+        # One video is being resolved, another is queued behind it
+        threading.Timer(0.1, release.set).start()
+        results.close()
+    assert len(calls) == 2
+
+
+def test_resolve_invalid_workers():
+    with pytest.raises(ValueError):
+        list(batch.resolve(["2lAe1cqCOXo"], workers=0))
@@ -1,3 +1,7 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
 import pytest
 
 from pytube import cipher
@@ -101,3 +105,75 @@ def test_get_throttling_function_name(base_js):
         assert code_fragment['raw_code'] in base_js_file
         func_name = cipher.get_throttling_function_name(base_js_file)
         assert func_name == code_fragment['nfunc_name']
+
+
+def test_cipher_description_round_trip(base_js):
+    original = cipher.Cipher(js=base_js[0])
+    description = json.loads(json.dumps(original.to_dict()))
+    rebuilt = cipher.Cipher.from_dict(description)
+
+    signature = "".join(chr(65 + i % 50) for i in range(105))
+    assert rebuilt.get_signature(signature) == original.get_signature(signature)
+    for n in ("abcdefghijklmnop", "5qrst20vwyzx1u34"):
+        assert rebuilt.calculate_n(list(n)) == original.calculate_n(list(n))
+
+
+def test_cipher_from_dict_rejects_unknown_functions(base_js):
+    description = cipher.Cipher(js=base_js[0]).to_dict()
+    description["transform_map"] = {"AJ": "exec"}
+    with pytest.raises(ValueError):
+        cipher.Cipher.from_dict(description)
+
+
+def test_calculate_n_depends_only_on_n(base_js):
+    shared = cipher.Cipher(js=base_js[0])
+    values = ["abcdefghijklmnop", "5qrst20vwyzx1u34", "abcdefghijklmnop"]
+    results = [shared.calculate_n(list(n)) for n in values]
+    assert results == [cipher.Cipher(js=base_js[0]).calculate_n(list(n)) for n in values]
+    assert results[0] == "pabcdmkfgijhleno"
+
+
+def test_calculate_n_cache(base_js):
+    c = cipher.Cipher(js=base_js[0])
+    c.n_cache_size = 2
+    expected = c.calculate_n(list("abcdefghijklmnop"))
+    with mock.patch.object(c, "throttling_plan", []):
+        # Cached values are returned without running the plan again
+        assert c.calculate_n(list("abcdefghijklmnop")) == expected
+    c.calculate_n(list("bcdefghijklmnopq"))
+    c.calculate_n(list("cdefghijklmnopqr"))
+    assert list(c._n_cache) == ["bcdefghijklmnopq", "cdefghijklmnopqr"]
+
+
+def test_calculate_n_threads(base_js):
+    shared = cipher.Cipher(js=base_js[0])
+    values = ["".join(chr(97 + (i + j) % 26) for j in range(16)) for i in range(26)]
+    reference = cipher.Cipher(js=base_js[0])
+    expected = [reference.calculate_n(list(n)) for n in values]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda n: shared.calculate_n(list(n)), values * 4))
+    assert results == expected * 4
+
+
+def _walk_transform_plan(c, ciphered_signature):
+    """Decipher by applying each transform function in turn."""
+    signature = list(ciphered_signature)
+    for js_func in c.transform_plan:
+        name, argument = c.parse_function(js_func)
+        signature = c.transform_map[name](signature, argument)
+    return "".join(signature)
+
+
+def test_get_signature_matches_transform_plan(base_js):
+    c = cipher.Cipher(js=base_js[0])
+    for length in (100, 104, 105, 108):
+        s = "".join(chr(33 + (i * 7) % 90) for i in range(length))
+        assert c.get_signature(s) == _walk_transform_plan(c, s)
+    assert sorted(c._permutations) == [100, 104, 105, 108]
+
+
+def test_get_signatures(base_js):
+    c = cipher.Cipher(js=base_js[0])
+    ciphered = ["".join(chr(65 + (i + j) % 50) for j in range(105)) for i in range(5)]
+    assert c.get_signatures(ciphered) == [c.get_signature(s) for s in ciphered]
+    assert c.get_signatures([]) == []
@@ -0,0 +1,170 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from pytube import cipher_registry, player_cache
+from pytube.cipher import Cipher
+from pytube.cipher_registry import CipherRegistry
+
+JS_URL = "https://youtube.com/s/player/4a1799bd/player_ias.vflset/en_US/base.js"
+OTHER_JS_URL = "https://youtube.com/s/player/e06dea74/player_ias.vflset/en_US/base.js"
+
+
+def _slow_get(js_by_url):
+    """Mock ``request.get`` serving the given js slowly, to overlap threads."""
+    def get(url):
+        time.sleep(0.05)
+        return js_by_url[url]
+    return mock.Mock(side_effect=get)
+
+
+def test_js_is_fetched_once_by_concurrent_threads(base_js):
+    registry = CipherRegistry()
+    get = _slow_get({JS_URL: base_js[0]})
+    with mock.patch("pytube.request.get", get), ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda _: registry.js(JS_URL), range(8)))
+    assert results == [base_js[0]] * 8
+    get.assert_called_once_with(JS_URL)
+    # Also stored for other processes
+    assert player_cache.default_cache.js(JS_URL) == base_js[0]
+
+
+def test_cipher_is_built_once_by_concurrent_threads(base_js):
+    registry = CipherRegistry()
+    get = _slow_get({JS_URL: base_js[0]})
+    with mock.patch("pytube.request.get", get), \
+            mock.patch("pytube.cipher_registry.Cipher", wraps=Cipher) as cipher, \
+            ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda _: registry.cipher(JS_URL), range(8)))
+    assert all(result is results[0] for result in results)
+    assert cipher.call_count == 1
+    assert get.call_count == 1
+
+
+def test_player_versions_are_kept_side_by_side(base_js):
+    registry = CipherRegistry()
+    get = _slow_get({JS_URL: base_js[0], OTHER_JS_URL: base_js[1]})
+    with mock.patch("pytube.request.get", get):
+        for _ in range(3):
+            assert registry.js(JS_URL) == base_js[0]
+            assert registry.js(OTHER_JS_URL) == base_js[1]
+    assert get.call_count == 2
+    assert len(registry) == 2
+
+
+def test_least_recently_used_player_is_evicted():
+    registry = CipherRegistry(maxsize=2)
+    with mock.patch("pytube.request.get", side_effect=lambda url: url):
+        registry.js("a")
+        registry.js("b")
+        registry.js("a")
+        registry.js("c")
+    assert "a" in registry
+    assert "b" not in registry
+    assert "c" in registry
+
+
+def test_last_used():
+    registry = CipherRegistry()
+    assert registry.last_used() is None
+    with mock.patch("pytube.request.get", side_effect=lambda url: url + ".js"):
+        registry.js("a")
+        registry.js("b")
+        registry.js("a")
+    assert registry.last_used() == ("a", "a.js")
+
+
+def test_cipher_from_player_cache(base_js):
+    player_cache.default_cache.store(JS_URL, base_js[0], Cipher(js=base_js[0]))
+    registry = CipherRegistry()
+    with mock.patch("pytube.request.get") as get:
+        assert registry.cipher(JS_URL).transform_plan
+    get.assert_not_called()
+
+
+def test_cipher_with_given_js(base_js):
+    registry = CipherRegistry()
+    with mock.patch("pytube.request.get") as get:
+        assert registry.cipher(JS_URL, get_js=lambda: base_js[0]).transform_plan
+    get.assert_not_called()
+
+
+def test_remove(base_js):
+    registry = CipherRegistry()
+    with mock.patch("pytube.request.get", return_value=base_js[0]) as get:
+        registry.cipher(JS_URL)
+        registry.remove(JS_URL)
+        assert JS_URL not in registry
+        assert player_cache.default_cache.js(JS_URL) is None
+        registry.js(JS_URL)
+    assert get.call_count == 2
+
+
+def test_async_player_work_is_outside_event_loop(base_js):
+    registry = CipherRegistry()
+    cache = player_cache.default_cache
+    threads = []
+
+    def recording(func):
+        def record(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return func(*args, **kwargs)
+        return record
+
+    async def fetch(url):
+        return base_js[0]
+
+    async def main():
+        js = await registry.js_async(JS_URL, fetch)
+        return await registry.cipher_async(JS_URL, get_js=lambda: js)
+
+    with mock.patch.object(cache, "js", recording(cache.js)), \
+            mock.patch.object(cache, "store", recording(cache.store)), \
+            mock.patch.object(cache, "cipher", recording(cache.cipher)), \
+            mock.patch("pytube.cipher_registry.Cipher", side_effect=recording(Cipher)):
+        assert asyncio.run(main()).transform_plan
+    # Reading the cache, storing the js, reading and building the cipher and
+    #  storing it
+    assert len(threads) == 5
+    assert threading.current_thread() not in threads
+
+
+def test_js_async_is_fetched_once(base_js):
+    registry = CipherRegistry()
+    calls = []
+
+    async def fetch(url):
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        return base_js[0]
+
+    async def main():
+        return await asyncio.gather(
+            *(registry.js_async(JS_URL, fetch) for _ in range(5))
+        )
+
+    assert asyncio.run(main()) == [base_js[0]] * 5
+    assert calls == [JS_URL]
+    # Threads find it too
+    with mock.patch("pytube.request.get") as get:
+        assert registry.js(JS_URL) == base_js[0]
+    get.assert_not_called()
+
+
+def test_youtube_objects_share_the_registry(base_js):
+    from pytube import YouTube
+    get = _slow_get({JS_URL: base_js[0]})
+    videos = [YouTube(f"https://www.youtube.com/watch?v=2lAe1cqCOX{c}") for c in "ab"]
+    for yt in videos:
+        yt._js_url = JS_URL
+    with mock.patch("pytube.request.get", get):
+        threads = [threading.Thread(target=lambda yt=yt: yt.cipher) for yt in videos]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert videos[0].cipher is videos[1].cipher
+    assert get.call_count == 1
+    assert JS_URL in cipher_registry.default_registry
@@ -0,0 +1,276 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from urllib.error import HTTPError
+
+import pytest
+
+from pytube import coalesce, request, retry
+from pytube.aio import request as aio_request
+from pytube.coalesce import Coalescer
+from pytube.innertube import InnerTube
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def _response(body):
+    response = mock.Mock()
+    response.read.return_value = body
+    return response
+
+
+def _execute_request(coalescer, waiters, body=b"body"):
+    """Mock ``_execute_request`` answering once ``waiters`` calls wait for it."""
+    def execute(*args, **kwargs):
+        _wait_for(lambda: coalescer.coalesced >= waiters)
+        if isinstance(body, Exception):
+            raise body
+        return _response(body)
+    return mock.Mock(side_effect=execute)
+
+
+def test_call_shares_result():
+    coalescer = Coalescer()
+    release = threading.Event()
+    func = mock.Mock(side_effect=lambda: release.wait() and "result")
+    with ThreadPoolExecutor(5) as executor:
+        futures = [executor.submit(coalescer.call, "key", func) for _ in range(5)]
+        _wait_for(lambda: coalescer.coalesced == 4)
+        release.set()
+    assert [future.result() for future in futures] == ["result"] * 5
+    assert func.call_count == 1
+    assert coalescer.stats == {"calls": 1, "coalesced": 4}
+
+
+def test_call_shares_error():
+    coalescer = Coalescer()
+    release = threading.Event()
+
+    def func():
+        release.wait()
+        raise ValueError("failed")
+
+    with ThreadPoolExecutor(3) as executor:
+        futures = [executor.submit(coalescer.call, "key", func) for _ in range(3)]
+        _wait_for(lambda: coalescer.coalesced == 2)
+        release.set()
+    for future in futures:
+        with pytest.raises(ValueError, match="failed"):
+            future.result()
+    # Nothing is kept once the call is over
+    assert coalescer.call("key", lambda: "again") == "again"
+    assert coalescer.stats == {"calls": 2, "coalesced": 2}
+
+
+def test_calls_after_completion_are_made_again():
+    coalescer = Coalescer()
+    func = mock.Mock(return_value="result")
+    assert coalescer.call("key", func) == "result"
+    assert coalescer.call("key", func) == "result"
+    assert coalescer.call("other", func) == "result"
+    assert func.call_count == 3
+    assert coalescer.stats == {"calls": 3, "coalesced": 0}
+
+
+def test_call_async_shares_result():
+    coalescer = Coalescer()
+    calls = []
+
+    async def func():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def main():
+        return await asyncio.gather(
+            *(coalescer.call_async("key", func) for _ in range(4))
+        )
+
+    assert asyncio.run(main()) == ["result"] * 4
+    assert calls == [1]
+    assert coalescer.stats == {"calls": 1, "coalesced": 3}
+
+
+def test_call_async_shares_error():
+    coalescer = Coalescer()
+
+    async def func():
+        await asyncio.sleep(0.01)
+        raise ValueError("failed")
+
+    async def main():
+        return await asyncio.gather(
+            *(coalescer.call_async("key", func) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    errors = asyncio.run(main())
+    assert all(isinstance(error, ValueError) for error in errors)
+    assert coalescer.stats == {"calls": 1, "coalesced": 2}
+
+
+def test_call_async_survives_leader_cancellation():
+    coalescer = Coalescer()
+    calls = []
+
+    async def func():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def main():
+        leader = asyncio.ensure_future(coalescer.call_async("key", func))
+        await asyncio.sleep(0)
+        followers = [
+            asyncio.ensure_future(coalescer.call_async("key", func)) for _ in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*followers)
+
+    assert asyncio.run(main()) == ["result"] * 3
+    # A follower made the call again, the others waited for it
+    assert len(calls) == 2
+    assert coalescer.stats == {"calls": 2, "coalesced": 3}
+
+
+@pytest.mark.parametrize("first,second,same", [
+    (("http://a",), ("http://a", "GET"), True),
+    (("http://a", None, None, {"b": 1, "a": 2}),
+     ("http://a", "POST", None, {"a": 2, "b": 1}), True),
+    (("http://a", None, None, {"a": 1}), ("http://a", None, None, {"a": 2}), False),
+    (("http://a", None, {"x": "1"}), ("http://a", None, {"x": "2"}), False),
+    (("http://a",), ("http://b",), False),
+])
+def test_request_key(first, second, same):
+    assert (coalesce.request_key(*first) == coalesce.request_key(*second)) is same
+
+
+def test_request_key_methods():
+    assert coalesce.request_key("http://a", "HEAD") is None
+    assert coalesce.request_key("http://a", "post", data=b"x") is not None
+
+
+def test_concurrent_gets_share_one_request(fresh_coalescer):
+    execute = _execute_request(fresh_coalescer, 7)
+    with mock.patch("pytube.request._execute_request", execute), \
+            ThreadPoolExecutor(8) as executor:
+        bodies = list(executor.map(lambda _: request.get("http://fake"), range(8)))
+    assert bodies == ["body"] * 8
+    assert execute.call_count == 1
+    assert fresh_coalescer.stats == {"calls": 1, "coalesced": 7}
+
+
+def test_concurrent_gets_share_errors(fresh_coalescer):
+    error = HTTPError("http://fake", 404, "", {}, None)
+    execute = _execute_request(fresh_coalescer, 3, body=error)
+    with mock.patch("pytube.request._execute_request", execute), \
+            ThreadPoolExecutor(4) as executor:
+        futures = [executor.submit(request.get, "http://fake") for _ in range(4)]
+        for future in futures:
+            with pytest.raises(HTTPError):
+                future.result()
+    assert execute.call_count == 1
+
+
+def test_retries_are_shared(fresh_coalescer):
+    failures = [HTTPError("http://fake", 503, "", {}, None)]
+
+    def execute(*args, **kwargs):
+        _wait_for(lambda: fresh_coalescer.coalesced >= 3)
+        if failures:
+            raise failures.pop()
+        return _response(b"body")
+
+    policy = retry.RetryPolicy(backoff=0)
+    with mock.patch("pytube.request._execute_request", side_effect=execute) as mocked, \
+            ThreadPoolExecutor(4) as executor:
+        bodies = list(executor.map(
+            lambda _: request.get("http://fake", retry_policy=policy), range(4)
+        ))
+    assert bodies == ["body"] * 4
+    assert mocked.call_count == 2
+
+
+def test_different_posts_are_not_coalesced(fresh_coalescer):
+    with mock.patch(
+        "pytube.request._execute_request", return_value=_response(b"{}")
+    ) as execute:
+        request.post("http://fake", data={"a": 1})
+        request.post("http://fake", data={"a": 2})
+    assert execute.call_count == 2
+    assert fresh_coalescer.stats == {"calls": 2, "coalesced": 0}
+
+
+def test_coalescing_disabled():
+    release = threading.Event()
+
+    def execute(*args, **kwargs):
+        release.wait(5)
+        return _response(b"body")
+
+    with mock.patch.object(coalesce, "default_coalescer", None), \
+            mock.patch("pytube.request._execute_request", side_effect=execute) as mocked, \
+            ThreadPoolExecutor(3) as executor:
+        futures = [executor.submit(request.get, "http://fake") for _ in range(3)]
+        _wait_for(lambda: mocked.call_count == 3)
+        release.set()
+        assert [future.result() for future in futures] == ["body"] * 3
+    assert mocked.call_count == 3
+
+
+def test_aio_concurrent_gets_share_one_request(fresh_coalescer):
+    calls = []
+
+    async def execute(*args, **kwargs):
+        calls.append(args)
+        await asyncio.sleep(0.01)
+        response = mock.Mock()
+
+        async def read():
+            return b"body"
+        response.read = read
+        return response
+
+    async def main():
+        return await asyncio.gather(
+            *(aio_request.get("http://fake") for _ in range(5))
+        )
+
+    with mock.patch("pytube.aio.request._execute_request", execute):
+        assert asyncio.run(main()) == ["body"] * 5
+    assert len(calls) == 1
+    assert fresh_coalescer.stats == {"calls": 1, "coalesced": 4}
+
+
+def test_concurrent_innertube_players_share_one_request(fresh_coalescer):
+    body = json.dumps({"videoDetails": {"videoId": "2lAe1cqCOXo"}}).encode("utf-8")
+    execute = _execute_request(fresh_coalescer, 3, body=body)
+    with mock.patch("pytube.request._execute_request", execute), \
+            ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(
+            lambda _: InnerTube().player("2lAe1cqCOXo"), range(4)
+        ))
+    assert execute.call_count == 1
+    assert all(result == {"videoDetails": {"videoId": "2lAe1cqCOXo"}} for result in results)
+    # Every caller gets its own copy
+    assert len({id(result) for result in results}) == 4
+
+
+def test_fresh_innertube_calls_are_not_coalesced(fresh_coalescer):
+    body = json.dumps({"videoDetails": {"videoId": "2lAe1cqCOXo"}}).encode("utf-8")
+    with mock.patch(
+        "pytube.request._execute_request", return_value=_response(body)
+    ) as execute:
+        InnerTube(fresh=True).player("2lAe1cqCOXo")
+    assert execute.call_count == 1
+    assert fresh_coalescer.stats == {"calls": 0, "coalesced": 0}
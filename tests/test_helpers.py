@@ -2,13 +2,15 @@ import gzip
 import io
 import json
 import os
+import threading
+import time
 import pytest
 from unittest import mock
 
 from pytube import helpers
 from pytube.exceptions import RegexMatchError
 from pytube.helpers import cache, create_mock_html_json, deprecated, setup_logger
-from pytube.helpers import target_directory, uniqueify
+from pytube.helpers import read_ahead, target_directory, uniqueify
 
 
 def test_regex_search_no_match():
@@ -164,3 +166,51 @@ def test_uniqueify():
     expected = [1, 2, 3, 4, 5]
     result = uniqueify(non_unique_list)
     assert result == expected
+
+
+def test_read_ahead():
+    assert list(read_ahead(iter(range(10)), 3)) == list(range(10))
+    assert list(read_ahead(iter(range(10)), 0)) == list(range(10))
+
+
+def test_read_ahead_is_bounded():
+    produced = []
+
+    def items():
+        for i in range(10):
+            produced.append(i)
+            yield i
+
+    items_ahead = read_ahead(items(), 2)
+    assert next(items_ahead) == 0
+    time.sleep(0.05)
+    # Item 0 is consumed, items 1 and 2 wait for the consumer
+    assert produced == [0, 1, 2]
+    items_ahead.close()
+    time.sleep(0.05)
+    assert produced == [0, 1, 2]
+
+
+def test_read_ahead_produces_in_background():
+    consumed = threading.Event()
+
+    def items():
+        yield threading.current_thread()
+        assert consumed.wait(5)
+        yield "second"
+
+    items_ahead = read_ahead(items(), 1)
+    assert next(items_ahead) is not threading.current_thread()
+    consumed.set()
+    assert next(items_ahead) == "second"
+
+
+def test_read_ahead_raises_errors_in_order():
+    def items():
+        yield 1
+        raise ValueError("failed")
+
+    items_ahead = read_ahead(items(), 2)
+    assert next(items_ahead) == 1
+    with pytest.raises(ValueError, match="failed"):
+        next(items_ahead)
@@ -0,0 +1,60 @@
+import json
+
+from pytube.journal import DownloadJournal, fingerprint
+
+
+def test_fingerprint_ignores_session_parameters():
+    first = fingerprint(
+        "https://rr1---sn-a.googlevideo.com/videoplayback?expire=1&id=o-A"
+        "&itag=18&clen=100&lmt=5&sig=abc&n=xyz"
+    )
+    second = fingerprint(
+        "https://rr5---sn-b.googlevideo.com/videoplayback?expire=2&id=o-A"
+        "&itag=18&clen=100&lmt=5&sig=def&n=uvw"
+    )
+    other_itag = fingerprint(
+        "https://rr1---sn-a.googlevideo.com/videoplayback?expire=1&id=o-A"
+        "&itag=22&clen=100&lmt=5&sig=abc&n=xyz"
+    )
+    assert first == second
+    assert first != other_itag
+
+
+def test_record_merges_ranges(tmp_path):
+    journal = DownloadJournal(str(tmp_path / "j.json"), "fp", 18, 100)
+    journal.record(50, 59)
+    journal.record(0, 9)
+    journal.record(10, 19)
+    assert journal.ranges == [[0, 19], [50, 59]]
+    assert journal.bytes_completed == 30
+    assert journal.contiguous_bytes == 20
+    assert journal.missing_ranges() == [(20, 49), (60, 99)]
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / "j.json")
+    journal = DownloadJournal(path, "fp", 18, 100)
+    journal.record_segment(3, 40)
+    journal.save()
+
+    loaded = DownloadJournal.load(path, "fp", 18, 100)
+    assert loaded.ranges == [[0, 39]]
+    assert loaded.segment == 3
+
+    journal.remove()
+    assert DownloadJournal.load(path, "fp", 18, 100).ranges == []
+
+
+def test_load_ignores_other_files(tmp_path):
+    path = tmp_path / "j.json"
+    path.write_text(json.dumps({
+        "fingerprint": "other", "itag": 18, "filesize": 100,
+        "ranges": [[0, 9]], "segment": None,
+    }))
+    assert DownloadJournal.load(str(path), "fp", 18, 100).ranges == []
+
+
+def test_load_ignores_corrupt_journal(tmp_path):
+    path = tmp_path / "j.json"
+    path.write_text("{not json")
+    assert DownloadJournal.load(str(path), "fp", 18, 100).ranges == []
@@ -1,10 +1,12 @@
+import json
 from unittest import mock
 
 import pytest
 
 import pytube
 from pytube import YouTube
-from pytube.exceptions import RegexMatchError
+from pytube.exceptions import RegexMatchError, VideoPrivate
+from tests.conftest import load_playback_file
 
 
 @mock.patch("urllib.request.install_opener")
@@ -45,11 +47,26 @@ def test_video_keywords(cipher_signature):
     assert cipher_signature.keywords == expected
 
 
-def test_js_caching(cipher_signature):
-    assert pytube.__js__ is not None
-    assert pytube.__js_url__ is not None
-    assert pytube.__js__ == cipher_signature.js
-    assert pytube.__js_url__ == cipher_signature.js_url
+def test_js_caching(cipher_signature, fresh_cipher_registry):
+    assert cipher_signature.js_url in fresh_cipher_registry
+    assert fresh_cipher_registry.js(cipher_signature.js_url) == cipher_signature.js
+    assert fresh_cipher_registry.cipher(cipher_signature.js_url) is cipher_signature.cipher
+
+
+def test_deprecated_js_globals(cipher_signature):
+    with pytest.deprecated_call():
+        assert pytube.__js__ == cipher_signature.js
+    with pytest.deprecated_call():
+        assert pytube.__js_url__ == cipher_signature.js_url
+
+
+def test_deprecated_js_globals_before_any_player(fresh_cipher_registry):
+    with pytest.deprecated_call():
+        assert pytube.__js__ is None
+    with pytest.deprecated_call():
+        assert pytube.__js_url__ is None
+    with pytest.raises(AttributeError):
+        pytube.__no_such_global__
 
 
 def test_channel_id(cipher_signature):
@@ -58,3 +75,40 @@ def test_channel_id(cipher_signature):
 
 def test_channel_url(cipher_signature):
     assert cipher_signature.channel_url == 'https://www.youtube.com/channel/UCBR8-60-B28hp2BmDPdntcQ'  # noqa:E501
+
+
+@mock.patch("pytube.request.urlopen")
+def test_lightweight_metadata_single_request(urlopen):
+    pb = load_playback_file("yt-video-2lAe1cqCOXo-html.json.gz")
+    response = mock.Mock()
+    response.read.return_value = json.dumps(pb["vid_info"]).encode("utf-8")
+    urlopen.return_value = response
+
+    yt = YouTube("https://www.youtube.com/watch?v=2lAe1cqCOXo", lightweight=True)
+    yt.check_availability()
+    assert yt.title == "YouTube Rewind 2019: For the Record | #YouTubeRewind"
+    assert yt.length > 0
+    assert yt.views > 0
+    assert yt.author == "YouTube"
+    assert "Rewind" in yt.keywords
+    assert yt.thumbnail_url.startswith("https://")
+    assert isinstance(yt.caption_tracks, list)
+
+    # Only the innertube player endpoint was called
+    assert urlopen.call_count == 1
+    assert "/youtubei/v1/player" in urlopen.call_args[0][0].full_url
+
+
+@mock.patch("pytube.request.get")
+def test_lightweight_availability_from_player_response(get):
+    yt = YouTube("https://www.youtube.com/watch?v=m8uHb5jIGN8", lightweight=True)
+    yt._vid_info = {
+        "playabilityStatus": {
+            "status": "LOGIN_REQUIRED",
+            "reason": "This is a private video. "
+                      "Please sign in to verify that you may see it.",
+        }
+    }
+    with pytest.raises(VideoPrivate):
+        yt.check_availability()
+    get.assert_not_called()
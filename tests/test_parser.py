@@ -2,7 +2,7 @@ import json
 import pytest
 
 from pytube.exceptions import HTMLParseError
-from pytube.parser import parse_for_object
+from pytube.parser import find_object_from_startpoint, parse_for_object
 
 
 def test_invalid_start():
@@ -56,3 +56,32 @@ def test_parse_object_requiring_ast():
     assert result == {
         'foo': 'bar'
     }
+
+
+def test_find_object_from_startpoint_offset():
+    html = 'var a = {"b": [1, "}", {"c": "\\"]"}]}; var d = {};'
+    start = html.index('{')
+    assert find_object_from_startpoint(html, start) == '{"b": [1, "}", {"c": "\\"]"}]}'
+
+
+def test_find_object_from_startpoint_javascript_regex():
+    js = 'x=function(a){a=a.replace(/[}\\/]/g,"");return a/2}//trailing'
+    start = js.index('{')
+    assert find_object_from_startpoint(js, start) == (
+        '{a=a.replace(/[}\\/]/g,"");return a/2}'
+    )
+
+
+def test_find_object_from_startpoint_division():
+    # A slash after a value is a division, not the start of a regex
+    js = 'f(){return b[0] / c}; /*'
+    assert find_object_from_startpoint(js, 3) == '{return b[0] / c}'
+
+
+def test_find_object_from_startpoint_unterminated():
+    assert find_object_from_startpoint('ab{"c": [1, 2', 2) == '{"c": [1, 2'
+
+
+def test_find_object_from_startpoint_invalid_start():
+    with pytest.raises(HTMLParseError):
+        find_object_from_startpoint('test = {}', 0)
@@ -0,0 +1,72 @@
+import os
+from unittest import mock
+
+from pytube import YouTube, player_cache
+from pytube.cipher import Cipher
+from pytube.player_cache import PlayerCache
+
+JS_URL = "https://youtube.com/s/player/4a1799bd/player_ias.vflset/en_US/base.js"
+
+
+def test_store_and_load(tmp_path, base_js):
+    cache = PlayerCache(str(tmp_path))
+    assert cache.js(JS_URL) is None
+    assert cache.cipher(JS_URL) is None
+
+    original = Cipher(js=base_js[0])
+    cache.store(JS_URL, base_js[0], original)
+
+    # A new cache on the same directory, as in another process
+    cache = PlayerCache(str(tmp_path))
+    assert cache.js(JS_URL) == base_js[0]
+    with mock.patch("pytube.cipher.get_transform_plan") as parse:
+        loaded = cache.cipher(JS_URL)
+    parse.assert_not_called()
+    assert loaded.to_dict() == original.to_dict()
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_remove(tmp_path, base_js):
+    cache = PlayerCache(str(tmp_path))
+    cache.store(JS_URL, base_js[0], Cipher(js=base_js[0]))
+    cache.remove(JS_URL)
+    assert cache.js(JS_URL) is None
+    assert cache.cipher(JS_URL) is None
+
+
+def test_unreadable_entry_is_a_miss(tmp_path, base_js):
+    cache = PlayerCache(str(tmp_path))
+    cache.store(JS_URL, base_js[0], Cipher(js=base_js[0]))
+    with open(cache._path(JS_URL, ".json"), "w") as fh:
+        fh.write('{"version": 1, "js_url": "')
+    assert cache.cipher(JS_URL) is None
+
+
+def test_disabled_cache(base_js):
+    cache = PlayerCache(None)
+    cache.store(JS_URL, base_js[0], Cipher(js=base_js[0]))
+    assert cache.js(JS_URL) is None
+    assert cache.cipher(JS_URL) is None
+
+
+@mock.patch("pytube.request.get")
+def test_youtube_uses_cached_cipher(request_get, base_js):
+    player_cache.default_cache.store(JS_URL, base_js[0], Cipher(js=base_js[0]))
+    yt = YouTube("https://www.youtube.com/watch?v=2lAe1cqCOXo")
+    yt._js_url = JS_URL
+    with mock.patch("pytube.__main__.Cipher") as cipher_class:
+        cipher = yt.cipher
+    cipher_class.assert_not_called()
+    request_get.assert_not_called()
+    assert cipher.transform_plan
+
+
+@mock.patch("pytube.request.get")
+def test_youtube_stores_cipher(request_get, base_js):
+    request_get.return_value = base_js[0]
+    yt = YouTube("https://www.youtube.com/watch?v=2lAe1cqCOXo")
+    yt._js_url = JS_URL
+    yt.cipher
+    request_get.assert_called_once_with(JS_URL)
+    assert player_cache.default_cache.js(JS_URL) == base_js[0]
+    assert player_cache.default_cache.cipher(JS_URL) is not None
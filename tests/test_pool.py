@@ -0,0 +1,69 @@
+import os
+import time
+from urllib.error import HTTPError
+from urllib.request import Request
+
+import pytest
+
+from pytube.pool import ConnectionPool
+from tests.server import StandInServer
+
+
+@pytest.fixture
+def server():
+    with StandInServer({"/video": os.urandom(64 * 1024)}) as s:
+        yield s
+
+
+def test_connection_reused_across_requests(server):
+    pool = ConnectionPool()
+    for _ in range(5):
+        response = pool.urlopen(Request(server.url("/video")))
+        assert len(response.read()) == 64 * 1024
+    assert server.connections == 1
+    assert pool.connections_created == 1
+    assert pool.connections_reused == 4
+
+
+def test_head_releases_connection(server):
+    pool = ConnectionPool()
+    for _ in range(3):
+        response = pool.urlopen(Request(server.url("/video"), method="HEAD"))
+        assert response.info()["Content-Length"] == str(64 * 1024)
+        response.close()
+    assert server.connections == 1
+
+
+def test_unread_response_is_not_reused(server):
+    pool = ConnectionPool()
+    response = pool.urlopen(Request(server.url("/video")))
+    response.read(10)
+    response.close()
+    pool.urlopen(Request(server.url("/video"))).read()
+    assert server.connections == 2
+
+
+def test_http_error_raised(server):
+    pool = ConnectionPool()
+    with pytest.raises(HTTPError) as exc_info:
+        pool.urlopen(Request(server.url("/missing")))
+    assert exc_info.value.code == 404
+
+
+def test_stale_connection_is_replaced():
+    with StandInServer({"/video": b"0" * 1024}, idle_timeout=0.1) as server:
+        pool = ConnectionPool()
+        pool.urlopen(Request(server.url("/video"))).read()
+        # Wait for the server to drop the idle keep-alive connection
+        time.sleep(0.3)
+        assert len(pool.urlopen(Request(server.url("/video"))).read()) == 1024
+        assert pool.connections_created == 2
+
+
+def test_maxsize_limits_idle_connections(server):
+    pool = ConnectionPool(maxsize=1)
+    first = pool.urlopen(Request(server.url("/video")))
+    second = pool.urlopen(Request(server.url("/video")))
+    first.read()
+    second.read()
+    assert sum(len(idle) for idle in pool._idle.values()) == 1
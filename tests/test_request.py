@@ -1,11 +1,24 @@
+import http.client
 import socket
 import os
 import pytest
 from unittest import mock
 from urllib.error import URLError
 
-from pytube import request
+from pytube import request, retry
 from pytube.exceptions import MaxRetriesExceeded
+from tests.server import StandInServer
+
+
+def _readinto_from(chunks):
+    """Mock ``readinto`` that reads the given chunks one after another."""
+    chunks = iter(chunks)
+
+    def readinto(buffer):
+        chunk = next(chunks)
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+    return readinto
 
 
 @mock.patch("pytube.request.urlopen")
@@ -15,17 +28,242 @@ def test_streaming(mock_urlopen):
         os.urandom(8 * 1024),
         os.urandom(8 * 1024),
         os.urandom(8 * 1024),
-        None,
+        b"",
     ]
     mock_response = mock.Mock()
-    mock_response.read.side_effect = fake_stream_binary
+    mock_response.readinto.side_effect = _readinto_from(fake_stream_binary)
     mock_response.info.return_value = {"Content-Range": "bytes 200-1000/24576"}
     mock_urlopen.return_value = mock_response
     # When
     response = request.stream("http://fakeassurl.gov/streaming_test")
     # Then
     assert len(b''.join(response)) == 3 * 8 * 1024
-    assert mock_response.read.call_count == 4
+    assert mock_response.readinto.call_count == 4
+
+
+@pytest.mark.parametrize("reuse_buffer", [False, True])
+def test_streaming_chunk_size(reuse_buffer):
+    content = os.urandom(40 * 1024)
+    with StandInServer({"/video": content}) as server:
+        chunks = [
+            (type(chunk), bytes(chunk))
+            for chunk in request.stream(
+                server.url("/video?itag=18"),
+                chunk_size=16 * 1024,
+                reuse_buffer=reuse_buffer
+            )
+        ]
+    assert b"".join(data for _, data in chunks) == content
+    assert all(len(data) <= 16 * 1024 for _, data in chunks)
+    assert {kind for kind, _ in chunks} == {memoryview if reuse_buffer else bytes}
+
+
+def test_stream_range_reuses_buffer():
+    content = os.urandom(40 * 1024)
+    with StandInServer({"/video": content}) as server:
+        views = list(request.stream_range(
+            server.url("/video?itag=18"), 1024, 32 * 1024 - 1,
+            chunk_size=8 * 1024, reuse_buffer=True
+        ))
+    # Every chunk was read into the same buffer
+    assert len({id(view.obj) for view in views}) == 1
+    assert sum(len(view) for view in views) == 31 * 1024
+
+
+@pytest.mark.parametrize("size,filesize,expected_requests", [
+    # The short last range marks the end of the file
+    (40 * 1024, None, 3),
+    # An exact multiple needs the size up front to avoid an empty request
+    (48 * 1024, 48 * 1024, 3),
+    (48 * 1024, None, 4),
+])
+@mock.patch("pytube.request.default_range_size", 16 * 1024)
+@mock.patch("pytube.request.default_max_range_size", 16 * 1024)
+def test_streaming_request_count(size, filesize, expected_requests):
+    content = os.urandom(size)
+    with StandInServer({"/video": content}) as server:
+        chunks = request.stream(server.url("/video?itag=18"), filesize=filesize)
+        assert b"".join(chunks) == content
+    assert len(server.requests) == expected_requests
+    assert all("range=" in path for _, path in server.requests)
+
+
+def test_range_sizer_grows_and_shrinks():
+    sizer = request.RangeSizer(initial=1024, minimum=512, maximum=4096)
+    sizer.succeeded(1024, 0.001)
+    assert sizer.size == 2048
+    sizer.succeeded(2048, 0.001)
+    sizer.succeeded(4096, 0.001)
+    assert sizer.size == 4096
+    sizer.failed(100, 0.5)
+    assert sizer.size == 2048
+    sizer.failed(0, 0.5)
+    sizer.failed(0, 0.5)
+    assert sizer.size == 512
+    assert [size for size, *_ in sizer.history] == [1024, 2048, 4096, 4096, 2048, 1024]
+    assert [failed for *_, failed in sizer.history] == [False] * 3 + [True] * 3
+
+
+def test_range_sizer_keeps_slow_ranges():
+    sizer = request.RangeSizer(initial=1024, minimum=512, maximum=4096)
+    # At 100B/s, a 1KB range already takes longer than the target
+    sizer.succeeded(1024, 10)
+    # A short range at the end of the file
+    sizer.succeeded(10, 0.001)
+    assert sizer.size == 1024
+
+
+def test_range_sizer_bounds():
+    with pytest.raises(ValueError):
+        request.RangeSizer(minimum=4096, maximum=1024)
+    assert request.RangeSizer(initial=10, minimum=512, maximum=4096).size == 512
+
+
+def test_streaming_grows_ranges():
+    content = os.urandom(112 * 1024)
+    sizer = request.RangeSizer(
+        initial=16 * 1024, minimum=16 * 1024, maximum=64 * 1024
+    )
+    with StandInServer({"/video": content}) as server:
+        chunks = request.stream(
+            server.url("/video?itag=18"), filesize=len(content), range_sizer=sizer
+        )
+        assert b"".join(chunks) == content
+    assert [path.rpartition("range=")[2] for _, path in server.requests] == [
+        "0-16383", "16384-49151", "49152-114687"
+    ]
+    assert [size for size, *_ in sizer.history] == [16384, 32768, 65536]
+
+
+def test_stream_range_reports_to_range_sizer():
+    content = os.urandom(40 * 1024)
+    sizer = request.RangeSizer(
+        initial=8 * 1024, minimum=8 * 1024, maximum=64 * 1024
+    )
+    with StandInServer({"/video": content}) as server:
+        data = b"".join(request.stream_range(
+            server.url("/video?itag=18"), 0, 32 * 1024 - 1, range_sizer=sizer
+        ))
+    assert data == content[:32 * 1024]
+    # The range is reported at the size requested, not the sizer's size
+    assert [entry[:2] for entry in sizer.history] == [(32 * 1024, 32 * 1024)]
+    assert not sizer.history[0][3]
+    assert sizer.size == 64 * 1024
+
+
+def _failing_response(chunk, error):
+    """Mock response that reads a chunk, then fails with the given error."""
+    response = mock.Mock()
+    response.info.return_value = {}
+    read = _readinto_from([chunk])
+
+    def readinto(buffer):
+        try:
+            return read(buffer)
+        except StopIteration:
+            raise error
+    response.readinto.side_effect = readinto
+    return response
+
+
+@pytest.mark.parametrize("error", [
+    http.client.IncompleteRead(b""), socket.timeout(), ConnectionResetError()
+])
+@mock.patch("pytube.request._execute_range_request")
+def test_streaming_resumes_failed_range(mock_range_request, error):
+    content = os.urandom(3000)
+    rest = mock.Mock()
+    rest.info.return_value = {}
+    rest.readinto.side_effect = _readinto_from([content[1000:], b""])
+    mock_range_request.side_effect = [
+        _failing_response(content[:1000], error), rest
+    ]
+    sizer = request.RangeSizer(initial=4096, minimum=1024)
+    chunks = request.stream(
+        "http://fake", filesize=len(content), max_retries=1, range_sizer=sizer
+    )
+    assert b"".join(chunks) == content
+    # The second request carries on after the bytes already received
+    assert [c.args[1:3] for c in mock_range_request.call_args_list] == [
+        (0, 2999), (1000, 2999)
+    ]
+    received, _, failed = sizer.history[0][1:]
+    assert (received, failed) == (1000, True)
+    assert sizer.size == 2048
+
+
+@mock.patch("pytube.request._execute_range_request")
+def test_streaming_raises_failed_range_without_retries(mock_range_request):
+    mock_range_request.return_value = _failing_response(
+        b"x" * 1000, socket.timeout()
+    )
+    with pytest.raises(socket.timeout):
+        b"".join(request.stream("http://fake", filesize=3000))
+
+
+def _otf_files(segment_count):
+    files = {"/otf?sq=0": b"Raw_data\r\nSegment-Count: %d\r\n" % segment_count}
+    for seq_num in range(1, segment_count + 1):
+        files[f"/otf?sq={seq_num}"] = os.urandom(1024)
+    return files
+
+
+@mock.patch("pytube.request.default_segment_window", 4)
+def test_seq_stream_yields_segments_in_order():
+    files = _otf_files(20)
+    with StandInServer(files) as server:
+        segments = list(request.seq_stream_segments(server.url("/otf?itag=18")))
+    assert [seq_num for seq_num, _ in segments] == list(range(21))
+    assert [data for _, data in segments] == list(files.values())
+    # One request per segment, with several connections in use at once
+    assert len(server.requests) == 21
+    assert server.connections > 1
+
+
+def test_seq_stream_starts_from_segment():
+    files = _otf_files(5)
+    with StandInServer(files) as server:
+        segments = list(request.seq_stream_segments(
+            server.url("/otf?itag=18"), start_segment=3
+        ))
+    assert [seq_num for seq_num, _ in segments] == [3, 4, 5]
+    assert not any("sq=1" in path or "sq=2" in path for _, path in server.requests)
+
+
+def test_seq_stream_retries_failed_segment():
+    files = _otf_files(3)
+    with StandInServer(files) as server:
+        server.failures["/otf"] = [503]
+        chunks = list(request.seq_stream(
+            server.url("/otf?itag=18"),
+            retry_policy=retry.RetryPolicy(max_retries=1, backoff=0),
+        ))
+    assert b"".join(chunks) == b"".join(files.values())
+    # One failed request, and one per segment
+    assert len(server.requests) == 5
+
+
+def test_seq_filesize():
+    files = _otf_files(30)
+    with StandInServer(files) as server:
+        filesize = request.seq_filesize(server.url("/otf?itag=18"))
+    assert filesize == sum(len(data) for data in files.values())
+    heads = [path for method, path in server.requests if method == "HEAD"]
+    assert len(heads) == 30
+    assert server.connections > 1
+
+
+def test_seq_filesize_estimate():
+    files = _otf_files(100)
+    files["/otf?sq=100"] = b"x" * 100
+    with StandInServer(files) as server:
+        filesize = request.seq_filesize(
+            server.url("/otf?itag=18"), estimate=True, sample_size=5
+        )
+    assert filesize == sum(len(data) for data in files.values())
+    heads = [path for method, path in server.requests if method == "HEAD"]
+    assert len(heads) == 5
+    assert any(path.endswith("sq=100") for path in heads)
 
 
 @mock.patch('pytube.request.urlopen')
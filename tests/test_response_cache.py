@@ -0,0 +1,193 @@
+import json
+import time
+from unittest import mock
+
+import pytest
+
+from pytube import YouTube, response_cache
+from pytube.innertube import InnerTube
+from pytube.response_cache import (
+    MemoryResponseCache,
+    ResponseCache,
+    SQLiteResponseCache,
+    cache_key,
+    response_ttl,
+)
+
+
+def player_response(expire):
+    url = f"https://r1.googlevideo.com/videoplayback?expire={expire}&itag=18"
+    return {
+        "streamingData": {
+            "expiresInSeconds": "21540",
+            "formats": [{"itag": 18, "url": url}],
+            "adaptiveFormats": [{
+                "itag": 137,
+                "signatureCipher": "s=abc&sp=sig&url=" + url.replace("&", "%26"),
+            }],
+        }
+    }
+
+
+@pytest.fixture
+def cache():
+    cache = MemoryResponseCache()
+    with mock.patch.object(response_cache, "default_cache", cache):
+        yield cache
+
+
+@pytest.fixture
+def urlopen():
+    with mock.patch("pytube.request.urlopen") as urlopen:
+        yield urlopen
+
+
+def respond(urlopen, result):
+    response = mock.Mock()
+    response.read.return_value = json.dumps(result).encode("utf-8")
+    urlopen.return_value = response
+
+
+def test_backend_must_implement_storage():
+    class NoSet(ResponseCache):
+        def clear(self):
+            pass
+
+        def _get(self, key, now):
+            return None
+
+    with pytest.raises(TypeError):
+        NoSet()
+
+
+def test_memory_cache_lru():
+    cache = MemoryResponseCache(maxsize=2)
+    cache.set("a", "1", 60)
+    cache.set("b", "2", 60)
+    assert cache.get("a") == "1"
+    cache.set("c", "3", 60)
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert len(cache) == 2
+    assert cache.stats == {"hits": 3, "misses": 1}
+
+
+@pytest.mark.parametrize("make_cache", [
+    lambda tmp_path: MemoryResponseCache(),
+    lambda tmp_path: SQLiteResponseCache(str(tmp_path / "responses.sqlite")),
+])
+def test_expiry(make_cache, tmp_path):
+    cache = make_cache(tmp_path)
+    now = time.time()
+    cache.set("a", "1", 10)
+    cache.set("b", "2", 0)
+    with mock.patch("pytube.response_cache.time.time", return_value=now + 5):
+        assert cache.get("a") == "1"
+    with mock.patch("pytube.response_cache.time.time", return_value=now + 11):
+        assert cache.get("a") is None
+    assert cache.get("b") is None
+    cache.clear()
+    assert cache.get("a") is None
+
+
+def test_sqlite_cache_persists(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    cache = SQLiteResponseCache(path)
+    cache.set("a", '{"x": 1}', 60)
+    cache.set("b", '{"x": 2}', 60)
+    cache.set("b", '{"x": 3}', 60)
+    cache.close()
+
+    cache = SQLiteResponseCache(path)
+    assert cache.get("a") == '{"x": 1}'
+    assert cache.get("b") == '{"x": 3}'
+    with mock.patch("pytube.response_cache.time.time", return_value=time.time() + 120):
+        cache.purge()
+    assert cache.get("a") is None
+    assert cache.stats == {"hits": 2, "misses": 1}
+
+
+def test_cache_key():
+    data = {"context": {"client": {"clientName": "ANDROID"}}, "videoId": "x"}
+    key = cache_key("https://www.youtube.com/youtubei/v1/player", {"key": "k"}, data)
+    assert key == cache_key(
+        "https://www.youtube.com/youtubei/v1/player",
+        {"key": "k"},
+        {"videoId": "x", "context": {"client": {"clientName": "ANDROID"}}},
+    )
+    assert key != cache_key("https://www.youtube.com/youtubei/v1/search", {"key": "k"}, data)
+    other_client = {"context": {"client": {"clientName": "WEB"}}, "videoId": "x"}
+    assert key != cache_key(
+        "https://www.youtube.com/youtubei/v1/player", {"key": "k"}, other_client
+    )
+
+
+def test_response_ttl():
+    assert response_ttl({"contents": {}}, 300) == 300
+    now = time.time()
+    with mock.patch("pytube.response_cache.time.time", return_value=now):
+        ttl = response_ttl(player_response(int(now) + 200), 300)
+    assert ttl == pytest.approx(200 - response_cache.expiry_margin, abs=1)
+    # Stream urls already expired
+    assert response_ttl(player_response(int(now) - 10), 300) < 0
+
+
+def test_player_response_cached(cache, urlopen):
+    result = player_response(int(time.time()) + 3600)
+    respond(urlopen, result)
+
+    first = InnerTube(client='ANDROID').player("2lAe1cqCOXo")
+    # Callers modify the responses they get
+    first["streamingData"]["formats"][0]["url"] += "&sig=deciphered"
+    second = InnerTube(client='ANDROID').player("2lAe1cqCOXo")
+
+    assert urlopen.call_count == 1
+    assert second == result
+    assert cache.stats == {"hits": 1, "misses": 1}
+
+    # Another client or video isn't served from the cache
+    InnerTube(client='WEB').player("2lAe1cqCOXo")
+    InnerTube(client='ANDROID').player("9bZkp7q19f0")
+    assert urlopen.call_count == 3
+
+
+def test_expired_player_response_not_cached(cache, urlopen):
+    respond(urlopen, player_response(int(time.time()) + 30))
+    InnerTube(client='ANDROID').player("2lAe1cqCOXo")
+    InnerTube(client='ANDROID').player("2lAe1cqCOXo")
+    assert urlopen.call_count == 2
+    assert len(cache) == 0
+
+
+def test_uncached_calls(cache, urlopen):
+    respond(urlopen, {"playabilityStatus": {"status": "OK"}})
+    innertube = InnerTube(client='ANDROID')
+    innertube.verify_age("2lAe1cqCOXo")
+    innertube.verify_age("2lAe1cqCOXo")
+    assert urlopen.call_count == 2
+    assert cache.stats == {"hits": 0, "misses": 0}
+
+
+def test_refresh_bypasses_cache(cache, urlopen):
+    expire = int(time.time()) + 3600
+    respond(urlopen, player_response(expire))
+    youtube = YouTube("https://www.youtube.com/watch?v=2lAe1cqCOXo")
+    assert "expire=%d" % expire in youtube.vid_info["streamingData"]["formats"][0]["url"]
+
+    # The url was rejected before it expired, the cached response still holds it
+    respond(urlopen, player_response(expire + 1))
+    youtube._cipher = mock.Mock()
+    with mock.patch("pytube.extract.apply_signature"):
+        url = youtube._refresh_stream_url(18)
+    assert "expire=%d" % (expire + 1) in url
+    assert urlopen.call_count == 2
+    assert cache.stats == {"hits": 0, "misses": 1}
+
+
+def test_disabled_by_default(urlopen):
+    assert response_cache.default_cache is None
+    respond(urlopen, {"contents": {}})
+    InnerTube(client='WEB').search("rewind")
+    InnerTube(client='WEB').search("rewind")
+    assert urlopen.call_count == 2
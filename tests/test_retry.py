@@ -0,0 +1,195 @@
+import asyncio
+import email.utils
+import http.client
+import json
+import socket
+import time
+from unittest import mock
+from urllib.error import HTTPError, URLError
+
+import pytest
+
+from pytube import request, retry
+from pytube.innertube import InnerTube
+from tests.server import StandInServer
+
+
+def _http_error(code, headers=None):
+    return HTTPError("http://fake", code, "", headers or {}, None)
+
+
+@pytest.mark.parametrize("error,retryable", [
+    (_http_error(503), True),
+    (_http_error(429), True),
+    (_http_error(404), False),
+    (_http_error(403), False),
+    (URLError(socket.timeout()), True),
+    (URLError(ConnectionRefusedError()), True),
+    (URLError("unknown url type"), False),
+    (http.client.IncompleteRead(b""), True),
+    (ConnectionResetError(), True),
+    (socket.timeout(), True),
+    (asyncio.TimeoutError(), True),
+    (ValueError(), False),
+])
+def test_is_retryable(error, retryable):
+    assert retry.RetryPolicy().is_retryable(error) is retryable
+
+
+def test_retry_statuses():
+    policy = retry.RetryPolicy(retry_statuses={404})
+    assert policy.is_retryable(_http_error(404))
+    assert not policy.is_retryable(_http_error(503))
+
+
+def test_exponential_backoff():
+    policy = retry.RetryPolicy(
+        max_retries=5, backoff=1, max_backoff=5, max_elapsed=None, jitter=False
+    )
+    error = socket.timeout()
+    assert [policy.retry_delay(error, attempt) for attempt in range(1, 7)] == [
+        1, 2, 4, 5, 5, None
+    ]
+    assert policy.retry_delay(ValueError(), 1) is None
+
+
+def test_jitter():
+    policy = retry.RetryPolicy(max_retries=3, backoff=1)
+    delays = {policy.retry_delay(socket.timeout(), 3) for _ in range(50)}
+    assert all(0 <= delay <= 4 for delay in delays)
+    assert len(delays) > 1
+
+
+def test_retry_after():
+    policy = retry.RetryPolicy(backoff=0.1, jitter=False)
+    assert policy.retry_delay(_http_error(429, {"Retry-After": "7"}), 1) == 7
+    retry_at = email.utils.formatdate(time.time() + 30, usegmt=True)
+    delay = policy.retry_delay(_http_error(503, {"Retry-After": retry_at}), 1)
+    assert 28 <= delay <= 30
+    # Unreadable values fall back on the backoff
+    assert policy.retry_delay(_http_error(503, {"Retry-After": "soon"}), 1) == 0.1
+
+
+def test_max_elapsed():
+    policy = retry.RetryPolicy(max_elapsed=10, jitter=False)
+    assert policy.retry_delay(_http_error(503), 1, elapsed=5) == 0.5
+    assert policy.retry_delay(_http_error(503), 1, elapsed=9.9) is None
+    # Waiting as long as the server asks would take too long
+    assert policy.retry_delay(_http_error(429, {"Retry-After": "60"}), 1) is None
+
+
+def test_call_retries():
+    policy = retry.RetryPolicy(max_retries=2, backoff=0)
+    func = mock.Mock(side_effect=[socket.timeout(), _http_error(503), "ok"])
+    assert policy.call(func, 1, key="value") == "ok"
+    assert func.call_count == 3
+    func.assert_called_with(1, key="value")
+
+
+def test_call_gives_up():
+    policy = retry.RetryPolicy(max_retries=2, backoff=0)
+    func = mock.Mock(side_effect=socket.timeout())
+    with pytest.raises(socket.timeout):
+        policy.call(func)
+    assert func.call_count == 3
+
+    func = mock.Mock(side_effect=_http_error(404))
+    with pytest.raises(HTTPError):
+        policy.call(func)
+    assert func.call_count == 1
+
+
+def test_call_async_retries():
+    policy = retry.RetryPolicy(max_retries=2, backoff=0)
+    results = [ConnectionResetError(), "ok"]
+
+    async def func():
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    assert asyncio.run(policy.call_async(func)) == "ok"
+    assert not results
+
+
+def test_get_policy():
+    assert retry.get_policy() is retry.default_policy
+    policy = retry.RetryPolicy()
+    assert retry.get_policy(policy, max_retries=0) is policy
+    assert retry.get_policy(max_retries=7).max_retries == 7
+    assert retry.default_policy.max_retries == 3
+    with pytest.raises(TypeError):
+        policy.replace(retries=1)
+
+
+def test_get_retries_server_errors():
+    policy = retry.RetryPolicy(backoff=0)
+    with StandInServer({"/page": b"hello"}) as server:
+        server.failures["/page"] = [503, 429]
+        assert request.get(server.url("/page"), retry_policy=policy) == "hello"
+        assert len(server.requests) == 3
+
+        server.failures["/page"] = [404]
+        with pytest.raises(HTTPError):
+            request.get(server.url("/page"), retry_policy=policy)
+
+
+def test_stream_range_resumes_failed_range():
+    content = b"0123456789" * 100
+
+    def response(start, reads):
+        """Mock response reading the given sizes of content, or raising."""
+        def readinto(buffer):
+            nonlocal start
+            size = reads.pop(0)
+            if isinstance(size, Exception):
+                raise size
+            buffer[:size] = content[start:start + size]
+            start += size
+            return size
+        return mock.Mock(readinto=mock.Mock(side_effect=readinto))
+
+    failing = response(0, [100, http.client.IncompleteRead(b"")])
+    rest = response(100, [len(content) - 100, 0])
+    with mock.patch(
+        "pytube.request._execute_range_request", side_effect=[failing, rest]
+    ) as range_request:
+        chunks = request.stream_range(
+            "http://fake", 0, len(content) - 1,
+            chunk_size=len(content),
+            retry_policy=retry.RetryPolicy(backoff=0),
+        )
+        assert b"".join(chunks) == content
+    assert [c.args[1:3] for c in range_request.call_args_list] == [
+        (0, 999), (100, 999)
+    ]
+
+
+def test_segment_retries_are_not_multiplied():
+    policy = retry.RetryPolicy(max_retries=2, backoff=0)
+    with StandInServer({"/segment?sq=1": b"data"}) as server:
+        server.failures["/segment"] = [503] * 3
+        with pytest.raises(HTTPError):
+            request._fetch_segment(server.url("/segment?sq=1"), None, policy)
+        assert len(server.requests) == 3
+
+        server.failures["/segment"] = [503] * 2
+        assert request._fetch_segment(
+            server.url("/segment?sq=1"), None, policy
+        ) == b"data"
+
+
+def test_innertube_call_api_retries():
+    response = mock.Mock()
+    response.read.return_value = json.dumps({"ok": True}).encode("utf-8")
+    with mock.patch(
+        "pytube.request._execute_request",
+        side_effect=[_http_error(503), response],
+    ) as execute_request, \
+            mock.patch("pytube.retry.default_policy", retry.RetryPolicy(backoff=0)):
+        result = InnerTube()._call_api(
+            "https://www.youtube.com/youtubei/v1/next", {}, {}
+        )
+    assert result == {"ok": True}
+    assert execute_request.call_count == 2
@@ -0,0 +1,127 @@
+import os
+import threading
+from unittest import mock
+
+import pytest
+
+from pytube.sink import WriteBehindSink, preallocate
+
+
+def test_preallocate(tmp_path):
+    path = tmp_path / "file"
+    with open(path, "wb") as fh:
+        preallocate(fh.fileno(), 4096)
+        assert os.fstat(fh.fileno()).st_size == 4096
+        fh.write(b"x" * 8192)
+        fh.flush()
+        preallocate(fh.fileno(), 1024)
+        assert os.fstat(fh.fileno()).st_size == 1024
+        preallocate(fh.fileno(), 0)
+        assert os.fstat(fh.fileno()).st_size == 1024
+
+
+def test_preallocate_without_fallocate(tmp_path):
+    path = tmp_path / "file"
+    with open(path, "wb") as fh, \
+            mock.patch("os.posix_fallocate", side_effect=OSError(95, "unsupported"),
+                       create=True):
+        preallocate(fh.fileno(), 4096)
+        assert os.fstat(fh.fileno()).st_size == 4096
+
+
+def test_write_behind(tmp_path):
+    path = tmp_path / "file"
+    written = []
+    with open(path, "wb") as fh:
+        with WriteBehindSink(fh.fileno(), buffer_size=4, buffer_count=2) as sink:
+            data = bytearray(b"0123456789")
+            sink.write(data, 6, on_written=lambda *r: written.append(r))
+            # The data was copied, so it can be reused right away
+            data[:] = b"abcdef"
+            sink.write(data, 0)
+    with open(path, "rb") as fh:
+        assert fh.read() == b"abcdef0123456789"
+    # Written in pieces of the buffer size
+    assert sorted(written) == [(6, 9), (10, 13), (14, 15)]
+
+
+def test_write_behind_flush(tmp_path):
+    path = tmp_path / "file"
+    with open(path, "wb") as fh, WriteBehindSink(fh.fileno()) as sink:
+        sink.write(b"abc", 0)
+        sink.flush()
+        with open(path, "rb") as reader:
+            assert reader.read() == b"abc"
+
+
+def test_write_behind_does_not_block_on_disk(tmp_path):
+    path = tmp_path / "file"
+    release = threading.Event()
+    real_pwrite = os.pwrite
+
+    def slow_pwrite(fd, data, offset):
+        release.wait()
+        return real_pwrite(fd, data, offset)
+
+    with open(path, "wb") as fh, mock.patch("pytube.sink._pwrite_some", slow_pwrite):
+        with WriteBehindSink(fh.fileno(), buffer_size=4, buffer_count=3) as sink:
+            # Queued while the disk is stalled, up to the size of the ring
+            sink.write(b"abcdefghijkl", 0)
+            release.set()
+    with open(path, "rb") as fh:
+        assert fh.read() == b"abcdefghijkl"
+
+
+def test_write_behind_would_block(tmp_path):
+    path = tmp_path / "file"
+    release = threading.Event()
+    real_pwrite = os.pwrite
+
+    def slow_pwrite(fd, data, offset):
+        release.wait()
+        return real_pwrite(fd, data, offset)
+
+    with open(path, "wb") as fh, mock.patch("pytube.sink._pwrite_some", slow_pwrite):
+        with WriteBehindSink(fh.fileno(), buffer_size=4, buffer_count=3) as sink:
+            assert not sink.would_block(12)
+            assert sink.would_block(13)
+            sink.write(b"abcdefgh", 0)
+            assert not sink.would_block(4)
+            assert sink.would_block(5)
+            release.set()
+            sink.flush()
+            assert not sink.would_block(12)
+
+
+def test_write_behind_errors(tmp_path):
+    read_fd, write_fd = os.pipe()
+    os.close(read_fd)
+    os.close(write_fd)
+    sink = WriteBehindSink(write_fd)
+    sink.write(b"abc", 0)
+    with pytest.raises(OSError):
+        sink.flush()
+    with pytest.raises(OSError):
+        sink.write(b"abc", 3)
+    with pytest.raises(OSError):
+        sink.close()
+
+
+def test_write_behind_keeps_original_error(tmp_path):
+    read_fd, write_fd = os.pipe()
+    os.close(read_fd)
+    os.close(write_fd)
+    with pytest.raises(KeyboardInterrupt):
+        with WriteBehindSink(write_fd) as sink:
+            sink.write(b"abc", 0)
+            raise KeyboardInterrupt()
+
+
+def test_write_behind_allocates_buffers_on_demand(tmp_path):
+    path = tmp_path / "file"
+    with open(path, "wb") as fh, WriteBehindSink(fh.fileno(), buffer_count=32) as sink:
+        for i in range(10):
+            sink.write(b"x" * 1024, i * 1024)
+            sink.flush()
+        # The disk kept up, so a single buffer was enough
+        assert sink._unallocated == 31
@@ -1,5 +1,7 @@
+import copy
 import os
-import random
+import time
+
 import pytest
 from datetime import datetime
 from unittest import mock
@@ -7,6 +9,9 @@ from unittest.mock import MagicMock, Mock
 from urllib.error import HTTPError
 
 from pytube import request, Stream
+from pytube.monostate import Monostate
+from tests.conftest import load_playback_file
+from tests.server import StandInServer
 
 
 @mock.patch("pytube.streams.request")
@@ -123,12 +128,12 @@ def test_views(cipher_signature):
 )
 @mock.patch(
     "pytube.request.stream",
-    MagicMock(return_value=iter([str(random.getrandbits(8 * 1024))])),
+    MagicMock(return_value=iter([os.urandom(8 * 1024)])),
 )
-def test_download(cipher_signature):
-    with mock.patch("pytube.streams.open", mock.mock_open(), create=True):
-        stream = cipher_signature.streams[0]
-        stream.download()
+def test_download(cipher_signature, tmp_path):
+    stream = cipher_signature.streams[0]
+    file_path = stream.download(output_path=str(tmp_path))
+    assert os.listdir(tmp_path) == [os.path.basename(file_path)]
 
 
 @mock.patch(
@@ -136,15 +141,14 @@ def test_download(cipher_signature):
 )
 @mock.patch(
     "pytube.request.stream",
-    MagicMock(return_value=iter([str(random.getrandbits(8 * 1024))])),
+    MagicMock(return_value=iter([os.urandom(8 * 1024)])),
 )
-@mock.patch("pytube.streams.target_directory", MagicMock(return_value="/target"))
-def test_download_with_prefix(cipher_signature):
-    with mock.patch("pytube.streams.open", mock.mock_open(), create=True):
+def test_download_with_prefix(cipher_signature, tmp_path):
+    with mock.patch("pytube.streams.target_directory", return_value=str(tmp_path)):
         stream = cipher_signature.streams[0]
         file_path = stream.download(filename_prefix="prefix")
         assert file_path == os.path.join(
-            "/target",
+            str(tmp_path),
             "prefixYouTube Rewind 2019 For the Record  YouTubeRewind.3gpp"
         )
 
@@ -154,15 +158,14 @@ def test_download_with_prefix(cipher_signature):
 )
 @mock.patch(
     "pytube.request.stream",
-    MagicMock(return_value=iter([str(random.getrandbits(8 * 1024))])),
+    MagicMock(return_value=iter([os.urandom(8 * 1024)])),
 )
-@mock.patch("pytube.streams.target_directory", MagicMock(return_value="/target"))
-def test_download_with_filename(cipher_signature):
-    with mock.patch("pytube.streams.open", mock.mock_open(), create=True):
+def test_download_with_filename(cipher_signature, tmp_path):
+    with mock.patch("pytube.streams.target_directory", return_value=str(tmp_path)):
         stream = cipher_signature.streams[0]
         file_path = stream.download(filename="cool name bro")
         assert file_path == os.path.join(
-            "/target",
+            str(tmp_path),
             "cool name bro"
         )
 
@@ -172,17 +175,16 @@ def test_download_with_filename(cipher_signature):
 )
 @mock.patch(
     "pytube.request.stream",
-    MagicMock(return_value=iter([str(random.getrandbits(8 * 1024))])),
+    MagicMock(return_value=iter([os.urandom(8 * 1024)])),
 )
-@mock.patch("pytube.streams.target_directory", MagicMock(return_value="/target"))
 @mock.patch("os.path.isfile", MagicMock(return_value=True))
-def test_download_with_existing(cipher_signature):
-    with mock.patch("pytube.streams.open", mock.mock_open(), create=True):
+def test_download_with_existing(cipher_signature, tmp_path):
+    with mock.patch("pytube.streams.target_directory", return_value=str(tmp_path)):
         stream = cipher_signature.streams[0]
         os.path.getsize = Mock(return_value=stream.filesize)
         file_path = stream.download()
         assert file_path == os.path.join(
-            "/target",
+            str(tmp_path),
             "YouTube Rewind 2019 For the Record  YouTubeRewind.3gpp"
         )
         assert not request.stream.called
@@ -193,17 +195,16 @@ def test_download_with_existing(cipher_signature):
 )
 @mock.patch(
     "pytube.request.stream",
-    MagicMock(return_value=iter([str(random.getrandbits(8 * 1024))])),
+    MagicMock(return_value=iter([os.urandom(8 * 1024)])),
 )
-@mock.patch("pytube.streams.target_directory", MagicMock(return_value="/target"))
 @mock.patch("os.path.isfile", MagicMock(return_value=True))
-def test_download_with_existing_no_skip(cipher_signature):
-    with mock.patch("pytube.streams.open", mock.mock_open(), create=True):
+def test_download_with_existing_no_skip(cipher_signature, tmp_path):
+    with mock.patch("pytube.streams.target_directory", return_value=str(tmp_path)):
         stream = cipher_signature.streams[0]
         os.path.getsize = Mock(return_value=stream.filesize)
         file_path = stream.download(skip_existing=False)
         assert file_path == os.path.join(
-            "/target",
+            str(tmp_path),
             "YouTube Rewind 2019 For the Record  YouTubeRewind.3gpp"
         )
         assert request.stream.called
@@ -224,15 +225,14 @@ def test_progressive_streams_return_includes_video_track(cipher_signature):
 )
 @mock.patch(
     "pytube.request.stream",
-    MagicMock(return_value=iter([str(random.getrandbits(8 * 1024))])),
+    MagicMock(return_value=iter([os.urandom(8 * 1024)])),
 )
-def test_on_progress_hook(cipher_signature):
+def test_on_progress_hook(cipher_signature, tmp_path):
     callback_fn = mock.MagicMock()
     cipher_signature.register_on_progress_callback(callback_fn)
 
-    with mock.patch("pytube.streams.open", mock.mock_open(), create=True):
-        stream = cipher_signature.streams[0]
-        stream.download()
+    stream = cipher_signature.streams[0]
+    stream.download(output_path=str(tmp_path))
     assert callback_fn.called
     args, _ = callback_fn.call_args
     assert len(args) == 3
@@ -245,15 +245,14 @@ def test_on_progress_hook(cipher_signature):
 )
 @mock.patch(
     "pytube.request.stream",
-    MagicMock(return_value=iter([str(random.getrandbits(8 * 1024))])),
+    MagicMock(return_value=iter([os.urandom(8 * 1024)])),
 )
-def test_on_complete_hook(cipher_signature):
+def test_on_complete_hook(cipher_signature, tmp_path):
     callback_fn = mock.MagicMock()
     cipher_signature.register_on_complete_callback(callback_fn)
 
-    with mock.patch("pytube.streams.open", mock.mock_open(), create=True):
-        stream = cipher_signature.streams[0]
-        stream.download()
+    stream = cipher_signature.streams[0]
+    stream.download(output_path=str(tmp_path))
     assert callback_fn.called
 
 
@@ -309,9 +308,11 @@ def test_repr_for_adaptive_streams(cipher_signature):
     assert stream == expected
 
 
-def test_segmented_stream_on_404(cipher_signature):
+def test_segmented_stream_on_404(cipher_signature, tmp_path):
     stream = cipher_signature.streams.filter(adaptive=True)[0]
-    with mock.patch('pytube.request.head') as mock_head:
+    # The mocked responses are served in order, so fetch one segment at a time
+    with mock.patch('pytube.request.default_segment_window', 1), \
+            mock.patch('pytube.request.head') as mock_head:
         with mock.patch('pytube.request.urlopen') as mock_url_open:
             # Mock the responses to YouTube
             mock_url_open_object = mock.Mock()
@@ -358,6 +359,14 @@ def test_segmented_stream_on_404(cipher_signature):
                 responses[3], None,
             ]
 
+            def readinto(buffer):
+                data = mock_url_open_object.read()
+                if not data:
+                    return 0
+                buffer[:len(data)] = data
+                return len(data)
+            mock_url_open_object.readinto.side_effect = readinto
+
             # This handles the HEAD requests to get content-length
             mock_url_open_object.info.side_effect = [
                 HTTPError('', 404, 'Not Found', '', ''),
@@ -366,22 +375,292 @@ def test_segmented_stream_on_404(cipher_signature):
 
             mock_url_open.return_value = mock_url_open_object
 
-            with mock.patch('builtins.open', new_callable=mock.mock_open) as mock_open:
-                file_handle = mock_open.return_value.__enter__.return_value
-                fp = stream.download()
-                full_content = b''
-                for call in file_handle.write.call_args_list:
-                    args, kwargs = call
-                    full_content += b''.join(args)
-
-                assert full_content == joined_responses
-                mock_open.assert_called_once_with(fp, 'wb')
+            fp = stream.download(output_path=str(tmp_path))
+            with open(fp, 'rb') as fh:
+                assert fh.read() == joined_responses
 
 
-def test_segmented_only_catches_404(cipher_signature):
+def test_segmented_only_catches_404(cipher_signature, tmp_path):
     stream = cipher_signature.streams.filter(adaptive=True)[0]
     with mock.patch('pytube.request.stream') as mock_stream:
         mock_stream.side_effect = HTTPError('', 403, 'Forbidden', '', '')
-        with mock.patch("pytube.streams.open", mock.mock_open(), create=True):
-            with pytest.raises(HTTPError):
-                stream.download()
+        with pytest.raises(HTTPError):
+            stream.download(output_path=str(tmp_path))
+
+
+def _stand_in_stream(url, size, on_progress=None):
+    """Build a :class:`Stream` pointing at a stand-in server url."""
+    stream = {
+        "url": url,
+        "itag": 18,
+        "mimeType": 'video/mp4; codecs="avc1.42001E, mp4a.40.2"',
+        "is_otf": False,
+        "bitrate": None,
+        "contentLength": str(size),
+    }
+    return Stream(stream, Monostate(on_progress=on_progress, on_complete=None))
+
+
+@mock.patch("pytube.request.default_range_size", 16 * 1024)
+@mock.patch("pytube.request.default_max_range_size", 16 * 1024)
+def test_download_request_count(tmp_path):
+    content = os.urandom(64 * 1024)
+    with StandInServer({"/video": content}) as server:
+        stream = _stand_in_stream(server.url("/video?itag=18"), len(content))
+        file_path = stream.download(output_path=str(tmp_path), filename="video.mp4")
+    with open(file_path, "rb") as fh:
+        assert fh.read() == content
+    # 64KB in 16KB ranges, and no separate request for the file size
+    assert len(server.requests) == 4
+
+
+@mock.patch("pytube.request.default_range_size", 16 * 1024)
+@mock.patch("pytube.request.default_max_range_size", 16 * 1024)
+def test_download_with_connections(tmp_path):
+    content = os.urandom(100 * 1024)
+    progress = []
+    with StandInServer({"/video": content}) as server:
+        stream = _stand_in_stream(
+            server.url("/video?itag=18"),
+            len(content),
+            on_progress=lambda s, chunk, remaining: progress.append(remaining),
+        )
+        file_path = stream.download(
+            output_path=str(tmp_path), filename="video.mp4", connections=4
+        )
+    with open(file_path, "rb") as fh:
+        assert fh.read() == content
+    # 100KB in 16KB ranges
+    assert len(server.requests) == 7
+    assert sorted(progress, reverse=True) == progress
+    assert progress[-1] == 0
+
+
+@mock.patch("pytube.request.default_range_size", 16 * 1024)
+@mock.patch("pytube.request.default_max_range_size", 16 * 1024)
+def test_download_with_connections_raises_errors(tmp_path):
+    with StandInServer({"/video": os.urandom(64 * 1024)}) as server:
+        server.failures["/video"] = [403]
+        stream = _stand_in_stream(server.url("/video?itag=18"), 64 * 1024)
+        with pytest.raises(HTTPError):
+            stream.download(output_path=str(tmp_path), connections=2)
+
+
+@mock.patch("pytube.request.default_range_size", 16 * 1024)
+@mock.patch("pytube.request.default_max_range_size", 16 * 1024)
+def test_download_with_connections_stops_when_interrupted(tmp_path):
+    content = os.urandom(40 * 16 * 1024)
+    with StandInServer({"/video": content}) as server:
+        stream = _stand_in_stream(server.url("/video?itag=18"), len(content))
+        with mock.patch(
+            "pytube.streams.wait", side_effect=KeyboardInterrupt
+        ), pytest.raises(KeyboardInterrupt):
+            stream.download(output_path=str(tmp_path), connections=2)
+    # The queued ranges were cancelled, only those already started ran
+    assert len(server.requests) <= 4
+
+
+def _requested_sizes(server):
+    """Sizes of the byte ranges requested from the stand-in server."""
+    sizes = []
+    for _, path in server.requests:
+        start, stop = path.rpartition("range=")[2].split("-")
+        sizes.append(int(stop) - int(start) + 1)
+    return sizes
+
+
+def test_download_with_connections_grows_ranges(tmp_path):
+    content = os.urandom(512 * 1024)
+    sizer = request.RangeSizer(
+        initial=16 * 1024, minimum=16 * 1024, maximum=64 * 1024
+    )
+    with StandInServer({"/video": content}) as server:
+        stream = _stand_in_stream(server.url("/video?itag=18"), len(content))
+        file_path = stream.download(
+            output_path=str(tmp_path), connections=2, range_sizer=sizer
+        )
+        sizes = _requested_sizes(server)
+    with open(file_path, "rb") as fh:
+        assert fh.read() == content
+    # The first ranges are cut at the initial size, later ones grow
+    assert sizes[0] == 16 * 1024
+    assert max(sizes) == 64 * 1024
+    assert len(sizes) < len(content) // (16 * 1024)
+    assert sorted(size for size, *_ in sizer.history) == sorted(sizes)
+
+
+class _Interrupt(Exception):
+    pass
+
+
+def _interrupt_after(calls):
+    """Progress callback that aborts the download on its nth call."""
+    count = iter(range(calls, 0, -1))
+
+    def on_progress(stream, chunk, bytes_remaining):
+        if next(count) == 1:
+            raise _Interrupt()
+    return on_progress
+
+
+@mock.patch("pytube.request.default_range_size", 16 * 1024)
+@mock.patch("pytube.request.default_max_range_size", 16 * 1024)
+def test_download_resumes_after_interruption(tmp_path):
+    content = os.urandom(64 * 1024)
+    with StandInServer({"/video": content}) as server:
+        url = server.url("/video?itag=18")
+        stream = _stand_in_stream(url, len(content), _interrupt_after(2))
+        with pytest.raises(_Interrupt):
+            stream.download(output_path=str(tmp_path), filename="video.mp4")
+        assert not os.path.exists(tmp_path / "video.mp4")
+        assert os.path.exists(tmp_path / "video.mp4.part.json")
+
+        server.requests.clear()
+        stream = _stand_in_stream(url, len(content))
+        file_path = stream.download(output_path=str(tmp_path), filename="video.mp4")
+
+    with open(file_path, "rb") as fh:
+        assert fh.read() == content
+    assert os.listdir(tmp_path) == ["video.mp4"]
+    # The two ranges received before the interruption are not fetched again
+    assert [path.split("range=")[1] for _, path in server.requests] == [
+        "32768-49151", "49152-65535"
+    ]
+
+
+def test_download_resume_grows_ranges(tmp_path):
+    content = os.urandom(256 * 1024)
+    with StandInServer({"/video": content}) as server:
+        url = server.url("/video?itag=18")
+        stream = _stand_in_stream(url, len(content), _interrupt_after(1))
+        with pytest.raises(_Interrupt):
+            stream.download(output_path=str(tmp_path), filename="video.mp4")
+
+        server.requests.clear()
+        sizer = request.RangeSizer(
+            initial=16 * 1024, minimum=16 * 1024, maximum=64 * 1024
+        )
+        stream = _stand_in_stream(url, len(content))
+        file_path = stream.download(
+            output_path=str(tmp_path), filename="video.mp4", range_sizer=sizer
+        )
+        sizes = _requested_sizes(server)
+
+    with open(file_path, "rb") as fh:
+        assert fh.read() == content
+    # The resumed download cuts what is missing in ranges that grow
+    assert sizes[:3] == [16 * 1024, 32 * 1024, 64 * 1024]
+
+
+def test_segmented_download_resumes_after_last_segment(tmp_path):
+    segments = [b"Segment-Count: 3\r\n", b"a" * 100, b"b" * 100, b"c" * 100]
+    files = {f"/otf?sq={i}": segment for i, segment in enumerate(segments)}
+    with StandInServer(files) as server:
+        url = server.url("/otf?itag=18")
+        stream = _stand_in_stream(url, 0, _interrupt_after(3))
+        with pytest.raises(_Interrupt):
+            stream.download(output_path=str(tmp_path), filename="video.mp4")
+
+        server.requests.clear()
+        stream = _stand_in_stream(url, 0)
+        file_path = stream.download(output_path=str(tmp_path), filename="video.mp4")
+
+    with open(file_path, "rb") as fh:
+        assert fh.read() == b"".join(segments)
+    requested = [path for _, path in server.requests if "range=" in path]
+    assert not any("sq=1&" in path or path.endswith("sq=1") for path in requested)
+    assert any("sq=2" in path for path in requested)
+
+
+def _refreshable_stream(url, size, new_url, on_progress=None):
+    """Build a :class:`Stream` whose url is refreshed to ``new_url``."""
+    stream = _stand_in_stream(url, size, on_progress)
+    stream._monostate.refresh_url = Mock(return_value=new_url)
+    return stream
+
+
+def test_expires_within():
+    expire = int(time.time()) + 120
+    stream = _stand_in_stream(f"https://example.com/video?expire={expire}", 0)
+    assert stream.expires_within(300)
+    assert not stream.expires_within(60)
+    assert not _stand_in_stream("https://example.com/video?itag=18", 0).expires_within(60)
+
+
+def test_refresh_url_without_callback():
+    stream = _stand_in_stream("https://example.com/video?itag=18", 0)
+    assert not stream.refresh_url()
+    assert stream.url == "https://example.com/video?itag=18"
+
+
+@mock.patch("pytube.request.default_range_size", 16 * 1024)
+@mock.patch("pytube.request.default_max_range_size", 16 * 1024)
+def test_download_refreshes_expiring_url(tmp_path):
+    content = os.urandom(32 * 1024)
+    expire = int(time.time()) + 10
+    with StandInServer({"/old": content, "/new": content}) as server:
+        stream = _refreshable_stream(
+            server.url(f"/old?itag=18&expire={expire}"),
+            len(content),
+            server.url("/new?itag=18"),
+        )
+        file_path = stream.download(output_path=str(tmp_path), filename="video.mp4")
+
+    with open(file_path, "rb") as fh:
+        assert fh.read() == content
+    stream._monostate.refresh_url.assert_called_once_with(18)
+    assert all(path.startswith("/new") for _, path in server.requests)
+
+
+@mock.patch("pytube.request.default_range_size", 16 * 1024)
+@mock.patch("pytube.request.default_max_range_size", 16 * 1024)
+def test_download_refreshes_rejected_url(tmp_path):
+    content = os.urandom(64 * 1024)
+    with StandInServer({"/old": content, "/new": content}) as server:
+        def on_progress(stream, chunk, bytes_remaining):
+            # The url stops working after the first range
+            server.failures["/old"] = [403]
+
+        stream = _refreshable_stream(
+            server.url("/old?itag=18"),
+            len(content),
+            server.url("/new?itag=18"),
+            on_progress,
+        )
+        file_path = stream.download(output_path=str(tmp_path), filename="video.mp4")
+
+    with open(file_path, "rb") as fh:
+        assert fh.read() == content
+    assert os.listdir(tmp_path) == ["video.mp4"]
+    # The download carries on where it stopped, with the new url
+    new_ranges = [
+        path.split("range=")[1] for _, path in server.requests
+        if path.startswith("/new")
+    ]
+    assert new_ranges == ["16384-32767", "32768-49151", "49152-65535"]
+
+
+def test_download_raises_when_refresh_fails(tmp_path):
+    with StandInServer({"/video": os.urandom(1024)}) as server:
+        server.failures["/video"] = [403]
+        stream = _refreshable_stream(server.url("/video?itag=18"), 1024, None)
+        with pytest.raises(HTTPError):
+            stream.download(output_path=str(tmp_path))
+    stream._monostate.refresh_url.assert_called_once_with(18)
+
+
+def test_refresh_url_from_youtube(cipher_signature):
+    monostate = cipher_signature.stream_monostate
+    monostate.refresh_url = cipher_signature._refresh_stream_url
+    stream = cipher_signature.streams.get_by_itag(18)
+    original_url = stream.url
+    stream.url = "https://example.com/expired"
+    vid_info = copy.deepcopy(load_playback_file(
+        "yt-video-2lAe1cqCOXo-html.json.gz"
+    )["vid_info"])
+    with mock.patch(
+        "pytube.innertube.InnerTube.player", return_value=vid_info
+    ) as player:
+        assert stream.refresh_url()
+    player.assert_called_once_with(cipher_signature.video_id)
+    assert stream.url == original_url
@@ -0,0 +1,107 @@
+from unittest import mock
+
+import pytest
+
+from pytube import YouTube, parser, watch_page
+from pytube.exceptions import RegexMatchError
+from pytube.watch_page import WatchPage
+from tests.conftest import load_playback_file
+
+
+@pytest.fixture
+def watch_html():
+    return load_playback_file("yt-video-2lAe1cqCOXo-html.json.gz")["watch_html"]
+
+
+def test_blobs(watch_html):
+    page = WatchPage(watch_html)
+    assert page.initial_player_response["videoDetails"]["videoId"] == "2lAe1cqCOXo"
+    assert "contents" in page.initial_data
+    assert "INNERTUBE_API_KEY" in page.ytcfg
+    assert page.ytplayer_js.endswith("/base.js")
+    assert not page.age_restricted
+
+
+def test_blobs_decoded_once(watch_html):
+    page = WatchPage(watch_html)
+    with mock.patch(
+        "pytube.watch_page.parse_for_object_from_startpoint",
+        wraps=parser.parse_for_object_from_startpoint
+    ) as parse:
+        first = page.initial_player_response
+        page.ytplayer_config
+        calls = parse.call_count
+        assert page.initial_player_response is first
+        page.ytplayer_config
+    assert parse.call_count == calls
+
+
+def test_player_response_parsed_once_for_config(watch_html):
+    page = WatchPage(watch_html)
+    with mock.patch(
+        "pytube.watch_page.parse_for_object_from_startpoint",
+        wraps=parser.parse_for_object_from_startpoint
+    ) as parse:
+        assert page.ytplayer_config is page.initial_player_response
+    offsets = [call.args[1] for call in parse.call_args_list]
+    assert offsets.count(page.offsets("player_response")[0]) == 1
+
+
+def test_offsets():
+    html = 'a ytcfg.set({"A": 1}); b ytcfg.set({"B": 2}); ytInitialData = {"c": 3};'
+    page = WatchPage(html)
+    assert page.offsets("ytcfg_set") == [
+        html.index('{"A"'), html.index('{"B"')
+    ]
+    assert page.offsets("initial_data") == [html.index('{"c"')]
+    assert page.offsets("player_response") == []
+    assert page.ytcfg == {"A": 1, "B": 2}
+    assert page.initial_data == {"c": 3}
+
+
+def test_markers_searched_when_needed(watch_html):
+    with mock.patch("pytube.watch_page._find", wraps=watch_page._find) as find:
+        page = WatchPage(watch_html)
+        assert find.call_count == 0
+        page.ytplayer_js
+        page.ytplayer_js
+        page.publish_date
+    assert [call.args[1] for call in find.call_args_list] == [
+        "/s/player/", 'itemprop="datePublished" content="'
+    ]
+
+
+def test_missing_blob_raises_each_time():
+    page = WatchPage("<html></html>")
+    for _ in range(2):
+        with pytest.raises(RegexMatchError):
+            page.initial_player_response
+    assert page.publish_date is None
+
+
+def test_set_config_player_config():
+    html = 'yt.setConfig({"PLAYER_CONFIG": {"assets": {"js": "/base.js"}}});'
+    assert WatchPage(html).ytplayer_config == {"assets": {"js": "/base.js"}}
+
+
+def test_check_availability_parses_once(watch_html):
+    yt = YouTube("https://www.youtube.com/watch?v=2lAe1cqCOXo")
+    yt._watch_html = watch_html
+    with mock.patch(
+        "pytube.watch_page.parse_for_object_from_startpoint",
+        wraps=parser.parse_for_object_from_startpoint
+    ) as parse:
+        yt.check_availability()
+        yt.check_availability()
+        yt.initial_data
+        yt.initial_data
+    assert parse.call_count == 2
+
+
+def test_watch_page_follows_watch_html(watch_html):
+    yt = YouTube("https://www.youtube.com/watch?v=2lAe1cqCOXo")
+    yt._watch_html = watch_html
+    page = yt.watch_page
+    assert yt.watch_page is page
+    yt._watch_html = "<html></html>"
+    assert yt.watch_page is not page